@@ -4,5 +4,6 @@ import os
 app = create_app()
 
 if __name__ == '__main__':
+    # Development server only; production runs wsgi.py under gunicorn (see gunicorn.conf.py)
     port = int(os.environ.get('PORT', 5000))
-    app.run(debug=True, host='0.0.0.0', port=port)
\ No newline at end of file
+    app.run(debug=app.config['DEBUG'], host='0.0.0.0', port=port)
@@ -3,21 +3,34 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_migrate import Migrate
+from werkzeug.middleware.proxy_fix import ProxyFix
 import os
 
-db = SQLAlchemy()
+from app.config.config import config_by_name, engine_options
+from app.services.read_replicas import RoutingSession
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
 migrate = Migrate()
 
 
-def create_app():
+def create_app(config_name=None, overrides=None):
     app = Flask(__name__)
 
-    # Configuration
-    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
-    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///dev.db')
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
+    # Configuration profile: FLASK_ENV=development (default) or production
+    config_name = config_name or os.environ.get('FLASK_ENV', 'development')
+    if config_name not in config_by_name:
+        raise ValueError(f"Unknown config profile {config_name!r}, expected one of {', '.join(config_by_name)}")
+    config = config_by_name[config_name]
+    app.config.from_object(config)
+    # e.g. per-test settings, applied before anything reads the config
+    app.config.update(overrides or {})
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+    config.init_app(app)
+
+    # Client addresses from X-Forwarded-For, as set by the trusted proxies only
+    if app.config.get('TRUSTED_PROXY_COUNT'):
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_COUNT'])
 
     # Initialize extensions
     db.init_app(app)
@@ -25,15 +38,50 @@ def create_app():
     migrate.init_app(app, db)
     CORS(app)
 
+    from app.services.sql_utils import init_sqlite_pragmas
+    init_sqlite_pragmas(app, db)
+
+    from app.services.read_replicas import read_replicas
+    read_replicas.init_app(app)
+
+    from app.services.query_advisor import init_query_advisor
+    init_query_advisor(app, db)
+
+    from app.services.request_metrics import init_request_metrics
+    init_request_metrics(app, db)
+
+    from app.services.moderation_queue import moderation_queue
+    moderation_queue.init_app(app)
+
+    from app.services.response_cache import response_cache
+    response_cache.init_app(app)
+
+    from app.services.user_cache import user_cache
+    user_cache.init_app(app, jwt)
+
+    from app.services.password_hasher import password_hasher
+    password_hasher.init_app(app)
+
+    from app.services.rate_limiter import login_throttle
+    login_throttle.init_app(app)
+
     # Import and register blueprints
     from app.routes.auth import auth_bp
     from app.routes.claims import claims_bp
     from app.routes.evidence import evidence_bp
     from app.routes.votes import votes_bp
+    from app.routes.comments import comments_bp
+    from app.routes.export import export_bp
 
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(claims_bp, url_prefix='/api/claims')
     app.register_blueprint(evidence_bp, url_prefix='/api/evidence')
     app.register_blueprint(votes_bp, url_prefix='/api/votes')
+    app.register_blueprint(comments_bp, url_prefix='/api/comments')
+    app.register_blueprint(export_bp, url_prefix='/api/export')
+
+    # CLI commands
+    from app.commands import register_commands
+    register_commands(app)
 
     return app
\ No newline at end of file
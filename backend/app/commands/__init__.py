@@ -0,0 +1,21 @@
+# This file makes the commands directory a Python package
+
+
+def register_commands(app):
+    from app.commands.claims import claims_cli
+    from app.commands.export import export_command
+    from app.commands.indexes import indexes_cli
+    from app.commands.moderation import moderation_cli
+    from app.commands.rankings import rankings_cli
+    from app.commands.search import search_cli
+    from app.commands.seed import seed_cli
+    from app.commands.users import users_cli
+
+    app.cli.add_command(claims_cli)
+    app.cli.add_command(export_command)
+    app.cli.add_command(indexes_cli)
+    app.cli.add_command(moderation_cli)
+    app.cli.add_command(rankings_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(seed_cli)
+    app.cli.add_command(users_cli)
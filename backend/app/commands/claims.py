@@ -0,0 +1,31 @@
+import click
+from flask.cli import AppGroup
+
+from app.services.claim_service import ClaimService
+from app.services.comment_service import CommentService
+from app.services.duplicate_service import DuplicateService
+
+claims_cli = AppGroup('claims', help='Claim maintenance commands.')
+
+
+@claims_cli.command('rebuild-counters')
+def rebuild_counters():
+    """Recount votes, evidence and comments for every claim."""
+    updated = ClaimService.rebuild_counters()
+    click.echo(f'Rebuilt counters for {updated} claims')
+
+
+@claims_cli.command('rebuild-comment-paths')
+@click.option('--claim-id', type=int, default=None, help='Only rebuild the comments of this claim.')
+def rebuild_comment_paths(claim_id):
+    """Recompute comment thread paths and depths from parent links."""
+    updated = CommentService.rebuild_paths(claim_id)
+    click.echo(f'Rebuilt paths for {updated} comments')
+
+
+@claims_cli.command('rebuild-signatures')
+@click.option('--batch-size', type=int, default=1000, show_default=True)
+def rebuild_signatures(batch_size):
+    """Recompute the near-duplicate signatures of every claim."""
+    indexed = DuplicateService.rebuild(batch_size=batch_size)
+    click.echo(f'Rebuilt signatures for {indexed} claims')
@@ -0,0 +1,30 @@
+import sys
+from datetime import datetime
+
+import click
+
+from app.services.export_service import EXPORT_BATCH_SIZE, EXPORT_FORMATS, EXPORT_TABLES, ExportService
+
+
+@click.command('export')
+@click.argument('table_name', type=click.Choice(list(EXPORT_TABLES)))
+@click.option('--format', 'export_format', type=click.Choice(list(EXPORT_FORMATS)), default='ndjson',
+              show_default=True)
+@click.option('--updated-since', type=click.DateTime(), default=None,
+              help='Only export rows changed at or after this time (UTC).')
+@click.option('--output', '-o', type=click.Path(dir_okay=False, writable=True), default=None,
+              help='Write to this file instead of stdout.')
+@click.option('--batch-size', type=int, default=EXPORT_BATCH_SIZE, show_default=True)
+def export_command(table_name, export_format, updated_since, output, batch_size):
+    """Stream a table as NDJSON or CSV."""
+    chunks = ExportService.stream(table_name, export_format, updated_since, batch_size=batch_size)
+    out = open(output, 'w', newline='') if output else sys.stdout
+    started = datetime.utcnow()
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if output:
+            out.close()
+    # Pass this as --updated-since next time to export only what changed meanwhile
+    click.echo(f'Export started at {started.isoformat()}', err=True)
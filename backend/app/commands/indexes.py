@@ -0,0 +1,84 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from flask_jwt_extended import create_access_token
+from sqlalchemy import select
+
+from app import db
+from app.models.user import User
+from app.services.query_advisor import QueryPlanAdvisor
+
+indexes_cli = AppGroup('indexes', help='Index maintenance commands.')
+
+# Query string variants worth planning separately for a GET endpoint
+ENDPOINT_VARIANTS = {
+    'claims.get_claims': [
+        '', 'sort_by=credibility', 'sort_by=most_discussed',
+        'category=general', 'status=pending', 'category=general&status=pending',
+        'limit=20', 'limit=20&sort_by=credibility', 'limit=20&sort_by=most_discussed',
+        'limit=20&category=general', 'sort_by=trending', 'limit=20&sort_by=trending',
+    ],
+    'claims.search_claims': ['q=vaccine', 'q=vaccine&limit=5'],
+    # Full exports read every row by design; incremental ones must use the timestamp index
+    'export.export_table': ['updated_since=2000-01-01T00:00:00'],
+}
+# Values tried for path arguments; anything else gets 1
+PATH_ARGUMENTS = {
+    'table_name': ['claims', 'votes', 'evidence'],
+}
+
+
+def get_urls(app):
+    """Yield ``(endpoint, url)`` for every GET rule and variant."""
+    for rule in app.url_map.iter_rules():
+        if 'GET' not in rule.methods or rule.endpoint == 'static':
+            continue
+        urls = [rule.rule]
+        for argument in rule.arguments:
+            urls = [
+                url.replace(f'<int:{argument}>', value).replace(f'<{argument}>', value)
+                for url in urls for value in PATH_ARGUMENTS.get(argument, ['1'])
+            ]
+        for url in urls:
+            for query in ENDPOINT_VARIANTS.get(rule.endpoint, ['']):
+                yield rule.endpoint, f'{url}?{query}' if query else url
+
+
+def explain_get_endpoints(app, advisor, headers=None):
+    """Request every GET URL with ``advisor`` attached; yields ``(endpoint, url, status)``.
+
+    With ``headers`` (e.g. a bearer token) each URL is requested anonymously
+    and again with them, so authenticated endpoints are planned past the 401.
+    """
+    advisor.attach(db.engine)
+    client = app.test_client()
+    try:
+        for endpoint, url in get_urls(app):
+            for request_headers in ({}, headers) if headers else ({},):
+                # Buffered, so streamed responses run their queries too
+                response = client.get(url, headers=request_headers, buffered=True)
+                yield endpoint, url, response.status_code
+    finally:
+        advisor.detach()
+
+
+@indexes_cli.command('check')
+def check():
+    """EXPLAIN the queries behind every GET endpoint and report full table scans."""
+    app = current_app._get_current_object()
+    advisor = QueryPlanAdvisor(mode='warn', allow_tables=app.config.get('SQL_EXPLAIN_ALLOW_TABLES', ()))
+
+    # Authenticated as the first user, when there is one
+    user_id = db.session.execute(select(User.id).order_by(User.id).limit(1)).scalar()
+    headers = {'Authorization': f'Bearer {create_access_token(identity=user_id)}'} if user_id else None
+
+    for endpoint, url, status in explain_get_endpoints(app, advisor, headers):
+        click.echo(f'{status} {endpoint} {url}')
+
+    if not advisor.findings:
+        click.echo('No full table scans found')
+        return
+
+    for finding in advisor.findings:
+        click.echo(f"SCAN {', '.join(finding['tables'])} in {finding['endpoint']}: {finding['statement']}", err=True)
+    raise SystemExit(1)
@@ -0,0 +1,105 @@
+import json
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import bindparam, update
+from werkzeug.serving import run_simple
+from werkzeug.wrappers import Request, Response
+
+from app import db
+from app.models.claim import Claim
+from app.services.moderation_service import FakeModerationBackend, overall_score
+
+moderation_cli = AppGroup('moderation', help='AI moderation commands.')
+
+
+@moderation_cli.command('backfill')
+@click.option('--batch-size', default=500, show_default=True, help='Claims fetched and updated per batch.')
+def backfill(batch_size):
+    """Moderate every claim that has no ai_moderation_score yet."""
+    service = current_app.extensions['moderation_queue'].service
+    if not service.enabled:
+        raise click.ClickException('No moderation backend configured')
+
+    claims = Claim.__table__
+    write_back = (
+        update(claims)
+        .where(claims.c.id == bindparam('target_id'))
+        .values(
+            ai_moderation_score=bindparam('new_score'),
+            moderation_status=bindparam('new_status'),
+            updated_at=claims.c.updated_at
+        )
+    )
+
+    last_id, moderated, failed = 0, 0, 0
+    while True:
+        rows = (db.session.query(Claim.id, Claim.description)
+                .filter(Claim.ai_moderation_score.is_(None), Claim.id > last_id)
+                .order_by(Claim.id)
+                .limit(batch_size)
+                .all())
+        if not rows:
+            break
+
+        results = service.moderate_many([description for _, description in rows])
+        db.session.execute(write_back, [
+            {
+                'target_id': claim_id,
+                'new_score': overall_score(result),
+                'new_status': 'completed' if result.get('moderated') else 'failed'
+            }
+            for (claim_id, _), result in zip(rows, results)
+        ])
+        db.session.commit()
+
+        last_id = rows[-1][0]
+        batch_failed = sum(1 for result in results if not result.get('moderated'))
+        moderated += len(rows) - batch_failed
+        failed += batch_failed
+        click.echo(f'Moderated up to claim {last_id} ({moderated} done, {failed} failed)')
+
+    click.echo(f'Backfill finished: {moderated} moderated, {failed} failed')
+
+
+@moderation_cli.command('stub-server')
+@click.option('--host', default='127.0.0.1', show_default=True)
+@click.option('--port', default=8089, show_default=True)
+@click.option('--delay', default=0.05, show_default=True, help='Seconds added to every request.')
+@click.option('--flag', 'flagged_terms', multiple=True, help='Texts containing this term are flagged.')
+def stub_server(host, port, delay, flagged_terms):
+    """Serve an OpenAI-compatible moderation API locally.
+
+    Point the app at it with OPENAI_API_BASE=http://HOST:PORT/v1 and any OPENAI_API_KEY.
+    """
+    backend = FakeModerationBackend(delay=delay, flagged_terms=flagged_terms)
+    run_simple(host, port, stub_application(backend), threaded=True)
+
+
+def stub_application(backend, log=click.echo):
+    """WSGI app answering the moderation and chat completion endpoints from ``backend``."""
+    @Request.application
+    def application(request):
+        payload = request.get_json(silent=True) or {}
+
+        if request.path.endswith('/moderations'):
+            texts = payload.get('input', [])
+            texts = [texts] if isinstance(texts, str) else texts
+            log(f'moderations: batch of {len(texts)}')
+            body = {'id': 'modr-stub', 'model': 'stub', 'results': backend.moderate_many(texts)}
+        elif request.path.endswith('/chat/completions'):
+            content = backend.analyze(json.dumps(payload.get('messages', [])))
+            body = {
+                'id': 'chatcmpl-stub',
+                'object': 'chat.completion',
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}}]
+            }
+        else:
+            return Response(json.dumps({'error': {'message': 'Not found'}}), status=404,
+                            mimetype='application/json')
+
+        return Response(json.dumps(body), mimetype='application/json')
+
+    return application
+
@@ -0,0 +1,29 @@
+import time
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.services.ranking_service import RankingService
+from app.services.response_cache import response_cache
+
+rankings_cli = AppGroup('rankings', help='Feed ranking commands.')
+
+
+@rankings_cli.command('refresh')
+@click.option('--interval', type=float, default=0,
+              help='Keep running and refresh every INTERVAL seconds (default: refresh once).')
+def refresh(interval):
+    """Recompute trending scores from recent votes; run it from cron or with --interval."""
+    while True:
+        start = time.perf_counter()
+        ranked = RankingService.refresh_trending(
+            half_life_hours=current_app.config['TRENDING_HALF_LIFE_HOURS'],
+            window_hours=current_app.config['TRENDING_WINDOW_HOURS']
+        )
+        response_cache.invalidate('claims')
+        click.echo(f'Refreshed trending scores of {ranked} claims in {time.perf_counter() - start:.2f}s')
+
+        if not interval:
+            return
+        time.sleep(interval)
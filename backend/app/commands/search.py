@@ -0,0 +1,13 @@
+import click
+from flask.cli import AppGroup
+
+from app.services.search_service import SearchService
+
+search_cli = AppGroup('search', help='Full-text search index commands.')
+
+
+@search_cli.command('rebuild')
+def rebuild():
+    """Reindex every claim and its evidence from scratch."""
+    indexed = SearchService.rebuild()
+    click.echo(f'Indexed {indexed} claims')
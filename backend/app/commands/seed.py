@@ -0,0 +1,62 @@
+import time
+
+import click
+from flask.cli import AppGroup
+
+from app.services.seed_service import IMPORT_TABLES, SEED_PASSWORD, SeedService
+
+seed_cli = AppGroup('seed', help='Synthetic data and bulk import commands.')
+
+
+@seed_cli.command('generate')
+@click.option('--users', type=int, default=1000, show_default=True)
+@click.option('--claims', type=int, default=10000, show_default=True)
+@click.option('--votes', type=int, default=100000, show_default=True,
+              help='Total votes, capped per claim at the number of users.')
+@click.option('--evidence', type=int, default=20000, show_default=True)
+@click.option('--comments', type=int, default=50000, show_default=True)
+@click.option('--vote-exponent', type=float, default=1.1, show_default=True,
+              help='Power-law exponent of votes and evidence per claim (0 = uniform).')
+@click.option('--comment-exponent', type=float, default=1.0, show_default=True)
+@click.option('--reply-probability', type=float, default=0.6, show_default=True,
+              help='Chance that a comment replies to an earlier one instead of starting a thread.')
+@click.option('--max-depth', type=int, default=8, show_default=True)
+@click.option('--days', type=int, default=90, show_default=True, help='Spread creation times over this many days.')
+@click.option('--batch-size', type=int, default=2000, show_default=True, help='Claims per transaction.')
+@click.option('--seed', type=int, default=None, help='Random seed for a reproducible dataset.')
+@click.option('--skip-signatures', is_flag=True, help='Do not compute near-duplicate signatures.')
+def generate(users, claims, votes, evidence, comments, vote_exponent, comment_exponent, reply_probability,
+             max_depth, days, batch_size, seed, skip_signatures):
+    """Generate users, claims, votes, evidence and comment threads."""
+    start = time.perf_counter()
+    try:
+        written = SeedService.generate(
+            users=users, claims=claims, votes=votes, evidence=evidence, comments=comments,
+            vote_exponent=vote_exponent, comment_exponent=comment_exponent,
+            reply_probability=reply_probability, max_depth=max_depth, days=days,
+            batch_size=batch_size, seed=seed, log=click.echo
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    SeedService.finalize(signatures=not skip_signatures, log=click.echo)
+
+    total = sum(written.values())
+    click.echo(f"Wrote {total} rows ({', '.join(f'{count} {name}' for name, count in written.items())}) "
+               f'in {time.perf_counter() - start:.1f}s; seeded users log in with "{SEED_PASSWORD}"')
+
+
+@seed_cli.command('import')
+@click.argument('table_name', type=click.Choice(list(IMPORT_TABLES)))
+@click.argument('source', type=click.File('r'))
+@click.option('--batch-size', type=int, default=5000, show_default=True)
+@click.option('--skip-finalize', is_flag=True,
+              help='Skip recounting and reindexing, e.g. when more tables follow.')
+@click.option('--skip-signatures', is_flag=True, help='Do not compute near-duplicate signatures.')
+def import_ndjson(table_name, source, batch_size, skip_finalize, skip_signatures):
+    """Import an NDJSON dump (as written by `flask export`) into a table. Use - for stdin."""
+    start = time.perf_counter()
+    imported = SeedService.import_ndjson(table_name, source, batch_size=batch_size)
+    click.echo(f'Imported {imported} {table_name} rows in {time.perf_counter() - start:.1f}s')
+
+    if not skip_finalize:
+        SeedService.finalize(recount=True, signatures=not skip_signatures, log=click.echo)
@@ -1,7 +1,149 @@
 import os
 
+
+def _env_bool(name, default):
+    return os.environ.get(name, str(default)).lower() == 'true'
+
+
 class Config:
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key'
-    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///dev.db'
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///dev.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key'
\ No newline at end of file
+    JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
+    DEBUG = False
+
+    # Connection pool per process (one per worker); size it to at least the worker's threads
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 30))
+    # Recycle connections before server-side idle timeouts or proxies drop them
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = _env_bool('DB_POOL_PRE_PING', True)
+    # Applied to every new SQLite connection; an empty value keeps SQLite's default.
+    # WAL lets readers run alongside the single writer, and writers wait up to
+    # the busy timeout for the write lock instead of failing with "database is locked".
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 15000))
+    SQLITE_MMAP_SIZE = os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))
+
+    # Development only: EXPLAIN every SELECT and 'warn' or 'raise' on full table scans
+    SQL_EXPLAIN_CHECK = os.environ.get('SQL_EXPLAIN_CHECK')
+    # Opt-in per-request timing: Server-Timing headers, /metrics (Prometheus) and N+1 / slow request logs
+    REQUEST_METRICS = _env_bool('REQUEST_METRICS', False)
+    REQUEST_METRICS_N_PLUS_ONE = int(os.environ.get('REQUEST_METRICS_N_PLUS_ONE', 5))
+    REQUEST_METRICS_SLOW_MS = float(os.environ.get('REQUEST_METRICS_SLOW_MS', 500))
+    # Comma-separated read replica URLs for the GET views of claims, evidence and votes.
+    # After a write, the client reads from the primary for this many seconds.
+    SQLALCHEMY_REPLICA_URIS = [uri for uri in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if uri]
+    REPLICA_READ_YOUR_WRITES_SECONDS = float(os.environ.get('REPLICA_READ_YOUR_WRITES_SECONDS', 10))
+
+    # AI moderation: 'openai' (needs OPENAI_API_KEY) or 'fake' for local testing
+    MODERATION_BACKEND = os.environ.get('MODERATION_BACKEND', 'openai')
+    MODERATION_ASYNC = _env_bool('MODERATION_ASYNC', True)
+    MODERATION_WORKERS = int(os.environ.get('MODERATION_WORKERS', 4))
+    MODERATION_FAKE_DELAY = float(os.environ.get('MODERATION_FAKE_DELAY', 0))
+    # Pooled HTTP client for the OpenAI backend. The read timeout is each call's deadline, and
+    # failed calls are retried here only, not again by the moderation queue
+    OPENAI_API_BASE = os.environ.get('OPENAI_API_BASE', 'https://api.openai.com/v1')
+    MODERATION_CONNECT_TIMEOUT = float(os.environ.get('MODERATION_CONNECT_TIMEOUT', 3.05))
+    MODERATION_READ_TIMEOUT = float(os.environ.get('MODERATION_READ_TIMEOUT', 10))
+    MODERATION_MAX_CONNECTIONS = int(os.environ.get('MODERATION_MAX_CONNECTIONS', 10))
+    MODERATION_MAX_CONCURRENCY = int(os.environ.get('MODERATION_MAX_CONCURRENCY', 8))
+    MODERATION_HTTP_RETRIES = int(os.environ.get('MODERATION_HTTP_RETRIES', 2))
+    MODERATION_RETRY_BACKOFF = float(os.environ.get('MODERATION_RETRY_BACKOFF', 0.5))
+    MODERATION_BREAKER_THRESHOLD = int(os.environ.get('MODERATION_BREAKER_THRESHOLD', 5))
+    MODERATION_BREAKER_RESET = float(os.environ.get('MODERATION_BREAKER_RESET', 30))
+    # Concurrent moderation calls are batched for up to this window (0 disables) or batch size
+    MODERATION_BATCH_WINDOW_MS = float(os.environ.get('MODERATION_BATCH_WINDOW_MS', 5))
+    MODERATION_BATCH_SIZE = int(os.environ.get('MODERATION_BATCH_SIZE', 32))
+    # Results cached by normalized-text hash in-process (LRU) and in the moderation_cache table
+    MODERATION_CACHE_ENABLED = _env_bool('MODERATION_CACHE_ENABLED', True)
+    MODERATION_CACHE_TTL = int(os.environ.get('MODERATION_CACHE_TTL', 7 * 24 * 3600))
+    MODERATION_CACHE_MAX_ENTRIES = int(os.environ.get('MODERATION_CACHE_MAX_ENTRIES', 10000))
+    MODERATION_CACHE_MAX_ROWS = int(os.environ.get('MODERATION_CACHE_MAX_ROWS', 1000000))
+    # Trending feed: votes lose half their weight every half-life and drop out after the window
+    TRENDING_HALF_LIFE_HOURS = float(os.environ.get('TRENDING_HALF_LIFE_HOURS', 6))
+    TRENDING_WINDOW_HOURS = float(os.environ.get('TRENDING_WINDOW_HOURS', 48))
+    # GET response cache: 'memory' (per process), 'redis' (shared) or 'none'.
+    # The TTL bounds how long a reader can see data older than the last write.
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 30))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 2048))
+    RESPONSE_CACHE_REDIS_URL = os.environ.get('RESPONSE_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    # JWT user lookups (and the is_active check) are cached per process; deactivation
+    # takes effect within the TTL
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+    USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', 10000))
+    # werkzeug hash method (algorithm and cost); older hashes are upgraded on the next login
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    # Concurrent hashes per process, and requests allowed to wait for one before a 503
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', 32))
+    # Reverse proxies in front of the app (e.g. 1 behind nginx or a load balancer). request.remote_addr
+    # is then taken from that many X-Forwarded-For entries; 0 trusts none, since clients can set the header
+    TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', 0))
+    # Token buckets per client IP (every attempt) and per email (failed attempts),
+    # checked before a login hashes anything
+    LOGIN_RATE_LIMIT = _env_bool('LOGIN_RATE_LIMIT', True)
+    LOGIN_IP_BURST = int(os.environ.get('LOGIN_IP_BURST', 20))
+    LOGIN_IP_PER_MINUTE = float(os.environ.get('LOGIN_IP_PER_MINUTE', 10))
+    LOGIN_EMAIL_BURST = int(os.environ.get('LOGIN_EMAIL_BURST', 5))
+    LOGIN_EMAIL_PER_MINUTE = float(os.environ.get('LOGIN_EMAIL_PER_MINUTE', 2))
+
+    @staticmethod
+    def init_app(app):
+        pass
+
+
+class DevelopmentConfig(Config):
+    DEBUG = True
+
+
+class ProductionConfig(Config):
+    @staticmethod
+    def init_app(app):
+        if 'change-in-production' in app.config['SECRET_KEY'] + app.config['JWT_SECRET_KEY']:
+            raise RuntimeError('Set SECRET_KEY and JWT_SECRET_KEY before running the production profile')
+
+
+class TestingConfig(Config):
+    # A fresh in-memory database per app; nothing runs in the background or is cached across requests
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_REPLICA_URIS = []
+    MODERATION_BACKEND = 'fake'
+    MODERATION_ASYNC = False
+    RESPONSE_CACHE_BACKEND = 'none'
+    REQUEST_METRICS = False
+    SQL_EXPLAIN_CHECK = None
+    LOGIN_RATE_LIMIT = False
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+
+
+config_by_name = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig,
+    'testing': TestingConfig,
+}
+
+
+def engine_options(config, uri=None):
+    """SQLAlchemy engine options for the configured database, or for ``uri`` (e.g. a replica)."""
+    uri = uri or config['SQLALCHEMY_DATABASE_URI']
+    if uri.startswith('sqlite'):
+        # Waiting for the write lock is handled by the busy timeout; SQLite connections never go stale
+        options = {'connect_args': {'timeout': config['SQLITE_BUSY_TIMEOUT_MS'] / 1000}}
+        if uri in ('sqlite://', 'sqlite:///:memory:'):
+            # In-memory databases use a single connection per thread, not a sized pool
+            return options
+        return dict(options, pool_size=config['DB_POOL_SIZE'], max_overflow=config['DB_MAX_OVERFLOW'],
+                    pool_timeout=config['DB_POOL_TIMEOUT'])
+
+    return {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
@@ -3,5 +3,8 @@ from .claim import Claim
 from .evidence import Evidence
 from .vote import Vote
 from .comment import Comment
+from .moderation_cache import ModerationCacheEntry
+from .claim_signature import ClaimSignature, ClaimSignatureBand
 
-__all__ = ['User', 'Claim', 'Evidence', 'Vote', 'Comment']
\ No newline at end of file
+__all__ = ['User', 'Claim', 'Evidence', 'Vote', 'Comment', 'ModerationCacheEntry', 'ClaimSignature',
+           'ClaimSignatureBand']
\ No newline at end of file
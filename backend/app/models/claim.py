@@ -8,33 +8,68 @@ class Claim(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     credibility_score = db.Column(db.Integer, default=0)
     status = db.Column(db.String(20), default='pending')  # pending, verified, debunked
     category = db.Column(db.String(50))
     ai_moderation_score = db.Column(db.Float)
+    moderation_status = db.Column(db.String(20), default='queued')  # queued, completed, failed, skipped
+    # Denormalized counters, maintained incrementally by ClaimService on every write
+    upvote_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    downvote_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    evidence_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    comment_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    # Precomputed feed rankings: discussion activity is kept current with the counters,
+    # trending (time-decayed vote velocity) is recomputed by `flask rankings refresh`
+    discussion_score = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    trending_score = db.Column(db.Float, default=0, server_default='0', nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Last write of any kind (counters, moderation, rankings), for incremental exports;
+    # updated_at only tracks edits by the author, so every other UPDATE pins it
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # Relationships
     evidence = db.relationship('Evidence', backref='claim', lazy=True, cascade='all, delete-orphan')
     votes = db.relationship('Vote', backref='claim', lazy=True, cascade='all, delete-orphan')
     comments = db.relationship('Comment', backref='claim', lazy=True, cascade='all, delete-orphan')
 
-    def to_dict(self):
+    # Composite (sort key, id) indexes backing keyset pagination of the feed,
+    # plus the category/status filters combined with the default ordering
+    __table_args__ = (
+        db.Index('ix_claims_created_at_id', 'created_at', 'id'),
+        db.Index('ix_claims_credibility_score_id', 'credibility_score', 'id'),
+        db.Index('ix_claims_updated_at_id', 'updated_at', 'id'),
+        db.Index('ix_claims_changed_at_id', 'changed_at', 'id'),
+        db.Index('ix_claims_discussion_score_id', 'discussion_score', 'id'),
+        db.Index('ix_claims_trending_score_id', 'trending_score', 'id'),
+        db.Index('ix_claims_category_created_at_id', 'category', 'created_at', 'id'),
+        db.Index('ix_claims_status_created_at_id', 'status', 'created_at', 'id'),
+    )
+
+    def to_dict(self, author_username=None):
+        # The username comes from ClaimService.with_summary; otherwise fall back to a lazy load
+        if author_username is None:
+            author_username = self.author.username if self.author else None
+
         return {
             'id': self.id,
             'title': self.title,
             'description': self.description,
             'user_id': self.user_id,
-            'author_username': self.author.username if self.author else None,
+            'author_username': author_username,
             'credibility_score': self.credibility_score,
             'status': self.status,
             'category': self.category,
             'ai_moderation_score': self.ai_moderation_score,
+            'moderation_status': self.moderation_status,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
-            'evidence_count': len(self.evidence),
-            'vote_count': len(self.votes),
-            'comment_count': len(self.comments)
+            'evidence_count': self.evidence_count,
+            'vote_count': self.upvote_count + self.downvote_count,
+            'upvote_count': self.upvote_count,
+            'downvote_count': self.downvote_count,
+            'comment_count': self.comment_count,
+            'discussion_score': self.discussion_score,
+            'trending_score': self.trending_score
         }
\ No newline at end of file
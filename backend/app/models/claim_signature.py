@@ -0,0 +1,18 @@
+from app import db
+
+
+class ClaimSignature(db.Model):
+    """MinHash signature of a claim's title and description, for near-duplicate lookup."""
+    __tablename__ = 'claim_signatures'
+
+    claim_id = db.Column(db.Integer, db.ForeignKey('claims.id', ondelete='CASCADE'), primary_key=True)
+    signature = db.Column(db.LargeBinary, nullable=False)  # packed unsigned 64-bit minimums
+
+
+class ClaimSignatureBand(db.Model):
+    """One LSH band of a signature; claims sharing any (band, bucket) are candidates."""
+    __tablename__ = 'claim_signature_bands'
+
+    band = db.Column(db.SmallInteger, primary_key=True)
+    bucket = db.Column(db.BigInteger, primary_key=True)
+    claim_id = db.Column(db.Integer, db.ForeignKey('claims.id', ondelete='CASCADE'), primary_key=True, index=True)
@@ -1,31 +1,61 @@
 from app import db
 from datetime import datetime
+from sqlalchemy.dialects import postgresql
+
+PATH_SEGMENT_WIDTH = 10
+
+
+def path_segment(comment_id):
+    return f'{comment_id:0{PATH_SEGMENT_WIDTH}d}/'
+
+
+def subtree_end(path):
+    """Exclusive upper bound of every path that starts with ``path``."""
+    # Paths end in '/', and '0' is the next character after it
+    return path[:-1] + '0'
 
 
 class Comment(db.Model):
     __tablename__ = 'comments'
 
     id = db.Column(db.Integer, primary_key=True)
-    claim_id = db.Column(db.Integer, db.ForeignKey('claims.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    claim_id = db.Column(db.Integer, db.ForeignKey('claims.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     content = db.Column(db.Text, nullable=False)
-    parent_comment_id = db.Column(db.Integer, db.ForeignKey('comments.id'), nullable=True)
+    parent_comment_id = db.Column(db.Integer, db.ForeignKey('comments.id'), nullable=True, index=True)
+    # Materialized path: zero-padded ids from the top-level comment down to this one,
+    # e.g. '0000000004/0000000009/'. A subtree is the range [path, subtree_end(path)),
+    # which needs byte-wise ordering, hence the C collation on PostgreSQL.
+    path = db.Column(db.Text().with_variant(postgresql.TEXT(collation='C'), 'postgresql'))
+    depth = db.Column(db.Integer, default=0, nullable=False, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_comments_claim_id_path', 'claim_id', 'path'),
+        db.Index('ix_comments_claim_id_depth_path', 'claim_id', 'depth', 'path'),
+    )
+
     # Self-referential relationship for replies
     replies = db.relationship('Comment',
                               backref=db.backref('parent', remote_side=[id]),
                               lazy=True,
                               cascade='all, delete-orphan')
 
-    def to_dict(self):
+    def to_dict(self, author_username=None, replies=None):
+        # CommentService passes preloaded values; otherwise fall back to lazy loads
+        if author_username is None:
+            author_username = self.author.username if self.author else None
+        if replies is None:
+            replies = [reply.to_dict() for reply in self.replies]
+
         return {
             'id': self.id,
             'claim_id': self.claim_id,
             'user_id': self.user_id,
-            'author_username': self.author.username if self.author else None,
+            'author_username': author_username,
             'content': self.content,
             'parent_comment_id': self.parent_comment_id,
+            'depth': self.depth,
             'created_at': self.created_at.isoformat(),
-            'replies': [reply.to_dict() for reply in self.replies]
+            'replies': replies
         }
\ No newline at end of file
@@ -0,0 +1,12 @@
+from app import db
+from datetime import datetime
+
+
+class ModerationCacheEntry(db.Model):
+    __tablename__ = 'moderation_cache'
+
+    # sha256 of the result kind and the normalized text
+    key = db.Column(db.String(64), primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)  # moderation, analysis
+    result = db.Column(db.Text, nullable=False)  # JSON
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
@@ -7,11 +7,16 @@ class Vote(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     claim_id = db.Column(db.Integer, db.ForeignKey('claims.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     vote_type = db.Column(db.String(10))  # upvote, downvote
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    # Bumped when the vote switches sides
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
-    __table_args__ = (db.UniqueConstraint('claim_id', 'user_id', name='unique_user_claim_vote'),)
+    __table_args__ = (
+        db.UniqueConstraint('claim_id', 'user_id', name='unique_user_claim_vote'),
+        db.Index('ix_votes_updated_at_id', 'updated_at', 'id'),
+    )
 
     def to_dict(self):
         return {
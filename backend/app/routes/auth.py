@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_current_user, create_access_token
 from app.services.auth_service import AuthService
-from app.models.user import User
+from app.services.password_hasher import HashingBusyError
+from app.services.rate_limiter import login_throttle
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -13,11 +14,14 @@ def register():
     if not data or not all(k in data for k in ['username', 'email', 'password']):
         return jsonify({'error': 'Missing required fields: username, email, password'}), 400
 
-    result, status_code = AuthService.register_user(
-        username=data['username'],
-        email=data['email'],
-        password=data['password']
-    )
+    try:
+        result, status_code = AuthService.register_user(
+            username=data['username'],
+            email=data['email'],
+            password=data['password']
+        )
+    except HashingBusyError:
+        return _busy()
 
     return jsonify(result), status_code
 
@@ -29,10 +33,23 @@ def login():
     if not data or not all(k in data for k in ['email', 'password']):
         return jsonify({'error': 'Email and password required'}), 400
 
-    result, status_code = AuthService.login_user(
-        email=data['email'],
-        password=data['password']
-    )
+    # Brute force is turned away before the password hash runs
+    retry_after = login_throttle.check(request.remote_addr, str(data['email']))
+    if retry_after:
+        response = jsonify({'error': 'Too many login attempts, try again later'})
+        response.headers['Retry-After'] = str(retry_after)
+        return response, 429
+
+    try:
+        result, status_code = AuthService.login_user(
+            email=data['email'],
+            password=data['password']
+        )
+    except HashingBusyError:
+        return _busy()
+
+    if status_code == 401:
+        login_throttle.failed(str(data['email']))
 
     return jsonify(result), status_code
 
@@ -40,13 +57,8 @@ def login():
 @auth_bp.route('/profile', methods=['GET'])
 @jwt_required()
 def get_profile():
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-
-    return jsonify({'user': user.to_dict()}), 200
+    # Loaded (and checked to be active) by the JWT user lookup, usually from its cache
+    return jsonify({'user': get_current_user()}), 200
 
 
 @auth_bp.route('/refresh', methods=['POST'])
@@ -55,4 +67,10 @@ def refresh():
     current_user_id = get_jwt_identity()
     new_token = create_access_token(identity=current_user_id)
 
-    return jsonify({'access_token': new_token}), 200
\ No newline at end of file
+    return jsonify({'access_token': new_token}), 200
+
+
+def _busy():
+    response = jsonify({'error': 'Server busy, try again shortly'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
@@ -2,25 +2,73 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.claim import Claim
 from app.models.user import User
-from app.services.claim_service import ClaimService
-from app.services.moderation_service import ModerationService
+from app.services.claim_service import ClaimService, DEFAULT_PAGE_SIZE
+from app.services.duplicate_service import DuplicateService, DEFAULT_SIMILAR_LIMIT
+from app.services.moderation_queue import moderation_queue
+from app.services.read_replicas import read_replicas
+from app.services.response_cache import response_cache
+from app.services.search_service import SearchService
+from app.services.sql_utils import row_exists
 from app import db
 
 claims_bp = Blueprint('claims', __name__)
-moderation_service = ModerationService()
 
 
 @claims_bp.route('', methods=['GET'])
+@response_cache.cached('claims')
+@read_replicas.reads
 def get_claims():
     category = request.args.get('category')
     status = request.args.get('status')
     sort_by = request.args.get('sort_by', 'newest')
 
-    claims = ClaimService.get_claims_with_filters(category, status, sort_by)
+    # Cursor pagination is opt-in so existing clients keep the full list
+    if 'cursor' in request.args or 'limit' in request.args:
+        limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+        try:
+            rows, next_cursor = ClaimService.get_claims_page(
+                category, status, sort_by,
+                cursor=request.args.get('cursor'),
+                limit=limit
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        return jsonify({
+            'claims': [ClaimService.serialize(row) for row in rows],
+            'count': len(rows),
+            'next_cursor': next_cursor
+        }), 200
+
+    rows = ClaimService.get_claims_with_filters(category, status, sort_by)
 
     return jsonify({
-        'claims': [claim.to_dict() for claim in claims],
-        'count': len(claims)
+        'claims': [ClaimService.serialize(row) for row in rows],
+        'count': len(rows)
+    }), 200
+
+
+@claims_bp.route('/search', methods=['GET'])
+@response_cache.cached('claims')
+@read_replicas.reads
+def search_claims():
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+
+    try:
+        results, next_cursor = SearchService.search(
+            request.args.get('q', ''),
+            cursor=request.args.get('cursor'),
+            limit=limit
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except NotImplementedError as e:
+        return jsonify({'error': str(e)}), 501
+
+    return jsonify({
+        'claims': results,
+        'count': len(results),
+        'next_cursor': next_cursor
     }), 200
 
 
@@ -33,64 +81,95 @@ def create_claim():
     if not data or not data.get('title') or not data.get('description'):
         return jsonify({'error': 'Title and description are required'}), 400
 
-    # AI moderation
-    moderation_result = moderation_service.moderate_text(data['description'])
-    ai_moderation_score = moderation_result.get('overall_score', 0) if moderation_result.get('moderated') else None
-
     claim = Claim(
         title=data['title'],
         description=data['description'],
         user_id=current_user_id,
         category=data.get('category', 'general'),
-        ai_moderation_score=ai_moderation_score
+        moderation_status=moderation_queue.initial_status()
     )
 
     db.session.add(claim)
+    db.session.flush()
+    SearchService.index_claim(claim.id)
+    signature = DuplicateService.index_claim(claim.id, claim.title, claim.description)
+    # Earlier submissions of (nearly) the same claim, so the client can point there instead
+    similar_claims = DuplicateService.find_similar(claim.id, signature)
     db.session.commit()
+    response_cache.invalidate('claims')
+
+    # AI moderation runs in the background and writes its score back to the claim
+    moderation_queue.enqueue(claim.id, data['description'])
 
     return jsonify({
         'message': 'Claim created successfully',
-        'claim': claim.to_dict(),
-        'moderation': moderation_result
+        'claim': ClaimService.get_claim_summary(claim.id),
+        'moderation': {'status': claim.moderation_status},
+        'similar_claims': similar_claims
     }), 201
 
 
 @claims_bp.route('/<int:claim_id>', methods=['GET'])
+@response_cache.cached('claim:{claim_id}')
+@read_replicas.reads
 def get_claim(claim_id):
-    claim = Claim.query.get(claim_id)
+    claim = ClaimService.get_claim_summary(claim_id)
 
     if not claim:
         return jsonify({'error': 'Claim not found'}), 404
 
-    return jsonify({'claim': claim.to_dict()}), 200
+    return jsonify({'claim': claim}), 200
 
 
-@claims_bp.route('/<int:claim_id>', methods=['PUT'])
-@jwt_required()
-def update_claim(claim_id):
-    current_user_id = get_jwt_identity()
-    claim = Claim.query.get(claim_id)
+@claims_bp.route('/<int:claim_id>/similar', methods=['GET'])
+@response_cache.cached('claims')
+@read_replicas.reads
+def get_similar_claims(claim_id):
+    limit = request.args.get('limit', DEFAULT_SIMILAR_LIMIT, type=int)
+    similar_claims = DuplicateService.find_similar(claim_id, limit=max(1, min(limit, 50)))
 
-    if not claim:
+    if similar_claims is None:
         return jsonify({'error': 'Claim not found'}), 404
 
-    if claim.user_id != current_user_id:
-        return jsonify({'error': 'Not authorized to update this claim'}), 403
+    return jsonify({
+        'similar_claims': similar_claims,
+        'count': len(similar_claims)
+    }), 200
 
-    data = request.get_json()
 
-    if data.get('title'):
-        claim.title = data['title']
-    if data.get('description'):
-        claim.description = data['description']
-    if data.get('category'):
-        claim.category = data['category']
+@claims_bp.route('/<int:claim_id>', methods=['PUT'])
+@jwt_required()
+def update_claim(claim_id):
+    current_user_id = get_jwt_identity()
+    data = request.get_json() or {}
+
+    # Ownership is checked by the UPDATE itself; only a miss needs a second look
+    updated = ClaimService.update_owned(
+        claim_id, current_user_id,
+        title=data.get('title'),
+        description=data.get('description'),
+        category=data.get('category'),
+        moderation_status=moderation_queue.initial_status()
+    )
+    if updated is None:
+        db.session.rollback()
+        if not row_exists(Claim, claim_id):
+            return jsonify({'error': 'Claim not found'}), 404
+        return jsonify({'error': 'Not authorized to update this claim'}), 403
 
+    if data.get('title') or data.get('description'):
+        SearchService.index_claim(claim_id)
+        DuplicateService.index_claim(claim_id, updated.title, updated.description)
     db.session.commit()
+    response_cache.invalidate_claim(claim_id)
+
+    # Edited text is moderated again; unchanged or re-submitted text is a cache hit
+    if data.get('description') and updated.moderation_status == moderation_queue.initial_status():
+        moderation_queue.enqueue(claim_id, updated.description)
 
     return jsonify({
         'message': 'Claim updated successfully',
-        'claim': claim.to_dict()
+        'claim': ClaimService.get_claim_summary(claim_id)
     }), 200
 
 
@@ -98,15 +177,16 @@ def update_claim(claim_id):
 @jwt_required()
 def delete_claim(claim_id):
     current_user_id = get_jwt_identity()
-    claim = Claim.query.get(claim_id)
-
-    if not claim:
-        return jsonify({'error': 'Claim not found'}), 404
 
-    if claim.user_id != current_user_id:
+    if not ClaimService.delete_owned(claim_id, current_user_id):
+        db.session.rollback()
+        if not row_exists(Claim, claim_id):
+            return jsonify({'error': 'Claim not found'}), 404
         return jsonify({'error': 'Not authorized to delete this claim'}), 403
 
-    db.session.delete(claim)
+    SearchService.remove_claim(claim_id)
+    DuplicateService.remove_claim(claim_id)
     db.session.commit()
+    response_cache.invalidate_claim(claim_id)
 
     return jsonify({'message': 'Claim deleted successfully'}), 200
\ No newline at end of file
@@ -0,0 +1,87 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.comment_service import CommentService, DEFAULT_THREAD_PAGE_SIZE
+from app.services.response_cache import response_cache
+
+comments_bp = Blueprint('comments', __name__)
+
+
+def _parse_id(value):
+    """A positive integer id given as a JSON number or a numeric string, else None."""
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        return None
+    return value
+
+
+@comments_bp.route('', methods=['POST'])
+@jwt_required()
+def add_comment():
+    current_user_id = get_jwt_identity()
+    data = request.get_json()
+
+    if not data or not all(k in data for k in ['claim_id', 'content']) or not data['content']:
+        return jsonify({'error': 'Claim ID and content are required'}), 400
+
+    claim_id = _parse_id(data['claim_id'])
+    if claim_id is None:
+        return jsonify({'error': 'Claim ID must be an integer'}), 400
+
+    parent_comment_id = data.get('parent_comment_id')
+    if parent_comment_id is not None:
+        parent_comment_id = _parse_id(parent_comment_id)
+        if parent_comment_id is None:
+            return jsonify({'error': 'Parent comment ID must be an integer'}), 400
+
+    result, status_code = CommentService.create_comment(
+        user_id=current_user_id,
+        claim_id=claim_id,
+        content=data['content'],
+        parent_comment_id=parent_comment_id
+    )
+    # Comment counts are part of the cached claim feeds and details
+    if status_code == 201:
+        response_cache.invalidate_claim(claim_id)
+
+    return jsonify(result), status_code
+
+
+@comments_bp.route('/claim/<int:claim_id>', methods=['GET'])
+def get_comments_for_claim(claim_id):
+    cursor = None
+    if request.args.get('cursor'):
+        cursor = _parse_id(request.args['cursor'])
+        if cursor is None:
+            return jsonify({'error': 'Invalid cursor'}), 400
+    limit = request.args.get('limit', DEFAULT_THREAD_PAGE_SIZE, type=int)
+
+    comments, next_cursor = CommentService.get_thread(claim_id, cursor=cursor, limit=limit)
+
+    return jsonify({
+        'comments': comments,
+        'count': len(comments),
+        'next_cursor': next_cursor
+    }), 200
+
+
+@comments_bp.route('/<int:comment_id>', methods=['GET'])
+def get_comment(comment_id):
+    comment = CommentService.get_subtree(comment_id)
+
+    if not comment:
+        return jsonify({'error': 'Comment not found'}), 404
+
+    return jsonify({'comment': comment}), 200
+
+
+@comments_bp.route('/<int:comment_id>', methods=['DELETE'])
+@jwt_required()
+def delete_comment(comment_id):
+    current_user_id = get_jwt_identity()
+
+    result, status_code = CommentService.delete_comment(current_user_id, comment_id)
+    if status_code == 200:
+        response_cache.invalidate_claim(result['claim_id'])
+
+    return jsonify(result), status_code
@@ -1,7 +1,13 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import delete
 from app.models.evidence import Evidence
 from app.models.claim import Claim
+from app.services.claim_service import ClaimService
+from app.services.read_replicas import read_replicas
+from app.services.response_cache import response_cache
+from app.services.search_service import SearchService
+from app.services.sql_utils import row_exists
 from app import db
 
 evidence_bp = Blueprint('evidence', __name__)
@@ -30,7 +36,10 @@ def add_evidence():
     )
 
     db.session.add(evidence)
+    ClaimService.apply_count_delta(data['claim_id'], evidence=1)
+    SearchService.index_claim(data['claim_id'])
     db.session.commit()
+    response_cache.invalidate_claim(data['claim_id'])
 
     return jsonify({
         'message': 'Evidence added successfully',
@@ -39,6 +48,8 @@ def add_evidence():
 
 
 @evidence_bp.route('/claim/<int:claim_id>', methods=['GET'])
+@response_cache.cached('claim:{claim_id}')
+@read_replicas.reads
 def get_evidence_for_claim(claim_id):
     evidence_list = Evidence.query.filter_by(claim_id=claim_id).all()
 
@@ -52,15 +63,22 @@ def get_evidence_for_claim(claim_id):
 @jwt_required()
 def delete_evidence(evidence_id):
     current_user_id = get_jwt_identity()
-    evidence = Evidence.query.get(evidence_id)
 
-    if not evidence:
-        return jsonify({'error': 'Evidence not found'}), 404
-
-    if evidence.user_id != current_user_id:
+    claim_id = db.session.execute(
+        delete(Evidence)
+        .where(Evidence.id == evidence_id, Evidence.user_id == current_user_id)
+        .returning(Evidence.claim_id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if claim_id is None:
+        db.session.rollback()
+        if not row_exists(Evidence, evidence_id):
+            return jsonify({'error': 'Evidence not found'}), 404
         return jsonify({'error': 'Not authorized to delete this evidence'}), 403
 
-    db.session.delete(evidence)
+    ClaimService.apply_count_delta(claim_id, evidence=-1)
+    SearchService.index_claim(claim_id)
     db.session.commit()
+    response_cache.invalidate_claim(claim_id)
 
     return jsonify({'message': 'Evidence deleted successfully'}), 200
\ No newline at end of file
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required
+from app.services.export_service import ExportService, EXPORT_FORMATS, EXPORT_TABLES
+
+export_bp = Blueprint('export', __name__)
+
+
+@export_bp.route('/<table_name>', methods=['GET'])
+@jwt_required()
+def export_table(table_name):
+    if table_name not in EXPORT_TABLES:
+        return jsonify({'error': f"Unknown export table, use one of: {', '.join(EXPORT_TABLES)}"}), 404
+
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': 'Format must be ndjson or csv'}), 400
+
+    updated_since = request.args.get('updated_since')
+    if updated_since:
+        try:
+            updated_since = datetime.fromisoformat(updated_since)
+        except ValueError:
+            return jsonify({'error': 'updated_since must be an ISO 8601 timestamp'}), 400
+
+    # Rows are generated while the response is sent, never collected in memory
+    chunks = ExportService.stream(table_name, export_format, updated_since or None)
+    response = Response(stream_with_context(chunks), mimetype=EXPORT_FORMATS[export_format])
+    response.headers['Content-Disposition'] = f'attachment; filename={table_name}.{export_format}'
+    return response
@@ -1,8 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.vote import Vote
 from app.models.claim import Claim
-from app.services.claim_service import ClaimService
+from app.services.read_replicas import read_replicas
+from app.services.response_cache import response_cache
+from app.services.vote_service import VoteService, MAX_BATCH_SIZE
 from app import db
 
 votes_bp = Blueprint('votes', __name__)
@@ -20,48 +21,56 @@ def cast_vote():
     if data['vote_type'] not in ['upvote', 'downvote']:
         return jsonify({'error': 'Vote type must be upvote or downvote'}), 400
 
-    # Check if claim exists
-    claim = Claim.query.get(data['claim_id'])
-    if not claim:
+    result = VoteService.cast_vote(current_user_id, data['claim_id'], data['vote_type'])
+    if result is None:
         return jsonify({'error': 'Claim not found'}), 404
+    response_cache.invalidate_claim(data['claim_id'])
 
-    # Check if user already voted
-    existing_vote = Vote.query.filter_by(
-        claim_id=data['claim_id'],
-        user_id=current_user_id
-    ).first()
+    credibility_score, status = result
+    return jsonify({
+        'message': 'Vote cast successfully',
+        'credibility_score': credibility_score,
+        'status': status
+    }), 200
 
-    if existing_vote:
-        # Update existing vote
-        existing_vote.vote_type = data['vote_type']
-    else:
-        # Create new vote
-        vote = Vote(
-            claim_id=data['claim_id'],
-            user_id=current_user_id,
-            vote_type=data['vote_type']
-        )
-        db.session.add(vote)
 
-    db.session.commit()
+@votes_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def cast_votes_batch():
+    current_user_id = get_jwt_identity()
+    data = request.get_json()
+
+    if not data or not isinstance(data.get('votes'), list) or not data['votes']:
+        return jsonify({'error': 'A non-empty list of votes is required'}), 400
 
-    # Update credibility score
-    ClaimService.update_credibility_score(data['claim_id'])
+    if len(data['votes']) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'At most {MAX_BATCH_SIZE} votes per batch'}), 400
 
-    return jsonify({'message': 'Vote cast successfully'}), 200
+    results = VoteService.cast_votes_batch(current_user_id, data['votes'])
+    failed = sum(1 for result in results if result['status'] != 200)
+
+    voted_claims = {result['claim_id'] for result in results if result['status'] == 200}
+    if voted_claims:
+        response_cache.invalidate('claims', *(f'claim:{claim_id}' for claim_id in voted_claims))
+
+    return jsonify({
+        'results': results,
+        'processed': len(results) - failed,
+        'failed': failed
+    }), 200
 
 
 @votes_bp.route('/claim/<int:claim_id>', methods=['GET'])
+@response_cache.cached('claim:{claim_id}')
+@read_replicas.reads
 def get_votes_for_claim(claim_id):
-    votes = Vote.query.filter_by(claim_id=claim_id).all()
-
-    upvotes = len([v for v in votes if v.vote_type == 'upvote'])
-    downvotes = len([v for v in votes if v.vote_type == 'downvote'])
+    counts = db.session.query(Claim.upvote_count, Claim.downvote_count).filter(Claim.id == claim_id).first()
+    upvotes, downvotes = counts if counts else (0, 0)
 
     return jsonify({
         'upvotes': upvotes,
         'downvotes': downvotes,
-        'total_votes': len(votes),
+        'total_votes': upvotes + downvotes,
         'credibility_score': upvotes - downvotes
     }), 200
 
@@ -75,18 +84,14 @@ def remove_vote():
     if not data or not data.get('claim_id'):
         return jsonify({'error': 'Claim ID is required'}), 400
 
-    vote = Vote.query.filter_by(
-        claim_id=data['claim_id'],
-        user_id=current_user_id
-    ).first()
-
-    if not vote:
+    result = VoteService.remove_vote(current_user_id, data['claim_id'])
+    if result is None:
         return jsonify({'error': 'No vote found to remove'}), 404
+    response_cache.invalidate_claim(data['claim_id'])
 
-    db.session.delete(vote)
-    db.session.commit()
-
-    # Update credibility score
-    ClaimService.update_credibility_score(data['claim_id'])
-
-    return jsonify({'message': 'Vote removed successfully'}), 200
\ No newline at end of file
+    credibility_score, status = result
+    return jsonify({
+        'message': 'Vote removed successfully',
+        'credibility_score': credibility_score,
+        'status': status
+    }), 200
\ No newline at end of file
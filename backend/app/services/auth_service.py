@@ -1,41 +1,74 @@
 from app.models.user import User
+from app.services.password_hasher import HashingBusyError, password_hasher
 from app import db
 from flask_jwt_extended import create_access_token, create_refresh_token
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+EMAIL_TAKEN = 'Email already registered'
+USERNAME_TAKEN = 'Username already taken'
+# Unique index (PostgreSQL) or column (SQLite) behind an IntegrityError on registration
+DUPLICATE_ERRORS = {
+    'ix_users_email': EMAIL_TAKEN,
+    'users.email': EMAIL_TAKEN,
+    'ix_users_username': USERNAME_TAKEN,
+    'users.username': USERNAME_TAKEN,
+}
 
 
 class AuthService:
     @staticmethod
     def register_user(username, email, password):
-        # Check if user exists
-        if User.query.filter_by(email=email).first():
-            return {'error': 'Email already registered'}, 400
-
-        if User.query.filter_by(username=username).first():
-            return {'error': 'Username already taken'}, 400
-
-        # Create new user
         user = User(username=username, email=email)
         user.set_password(password)
 
+        # A single INSERT; the unique indexes on email and username reject duplicates,
+        # including two registrations racing for the same name
         db.session.add(user)
+        try:
+            db.session.flush()
+        except IntegrityError as e:
+            db.session.rollback()
+            return AuthService._duplicate_error(e, email), 400
+        # Serialized before the commit expires it, which would cost a reload
+        user_data = user.to_dict()
         db.session.commit()
 
         # Generate tokens
-        access_token = create_access_token(identity=user.id)
-        refresh_token = create_refresh_token(identity=user.id)
+        access_token = create_access_token(identity=user_data['id'])
+        refresh_token = create_refresh_token(identity=user_data['id'])
 
         return {
             'message': 'User registered successfully',
             'access_token': access_token,
             'refresh_token': refresh_token,
-            'user': user.to_dict()
+            'user': user_data
         }, 201
 
+    @staticmethod
+    def _duplicate_error(error, email):
+        # PostgreSQL (psycopg2) names the violated index; SQLite ends its message with the column,
+        # e.g. "UNIQUE constraint failed: users.email". Never match on the message as a whole,
+        # which can contain the conflicting value.
+        diag = getattr(error.orig, 'diag', None)
+        target = getattr(diag, 'constraint_name', None) or str(error.orig).rsplit(': ', 1)[-1]
+        if target in DUPLICATE_ERRORS:
+            return {'error': DUPLICATE_ERRORS[target]}
+        if db.session.execute(select(User.id).where(User.email == email)).first():
+            return {'error': EMAIL_TAKEN}
+        return {'error': USERNAME_TAKEN}
+
     @staticmethod
     def login_user(email, password):
         user = User.query.filter_by(email=email).first()
 
         if user and user.check_password(password):
+            if user.is_active is False:
+                return {'error': 'Account is disabled'}, 403
+
+            if password_hasher.needs_rehash(user.password_hash):
+                AuthService.rehash_password(user, password)
+
             access_token = create_access_token(identity=user.id)
             refresh_token = create_refresh_token(identity=user.id)
 
@@ -45,4 +78,20 @@ class AuthService:
                 'user': user.to_dict()
             }, 200
 
-        return {'error': 'Invalid email or password'}, 401
\ No newline at end of file
+        return {'error': 'Invalid email or password'}, 401
+
+    @staticmethod
+    def rehash_password(user, password):
+        """Store the password under the configured hash method, unless it changed meanwhile."""
+        try:
+            password_hash = password_hasher.hash(password)
+        except HashingBusyError:
+            # Upgrading can wait for a quieter login
+            return
+        db.session.execute(
+            update(User)
+            .where(User.id == user.id, User.password_hash == user.password_hash)
+            .values(password_hash=password_hash, updated_at=User.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
\ No newline at end of file
@@ -1,35 +1,267 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import bindparam, case, delete, func, select, tuple_, update
+
 from app.models.claim import Claim
+from app.models.comment import Comment
+from app.models.evidence import Evidence
+from app.models.user import User
 from app.models.vote import Vote
 from app import db
 
+VERIFIED_THRESHOLD = 10
+DEBUNKED_THRESHOLD = -5
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# A piece of evidence counts for this many comments in the discussion score
+EVIDENCE_DISCUSSION_WEIGHT = 2
+
+# Sort key column for each feed order; ties are broken on Claim.id
+SORT_COLUMNS = {
+    'newest': Claim.created_at,
+    'credibility': Claim.credibility_score,
+    'most_discussed': Claim.discussion_score,
+    'trending': Claim.trending_score,
+}
+
+
+def _status_expression(score):
+    return case(
+        (score >= VERIFIED_THRESHOLD, 'verified'),
+        (score <= DEBUNKED_THRESHOLD, 'debunked'),
+        else_='pending'
+    )
+
+
+def _trending_expression(trending_score, new_votes):
+    # A removed vote takes back the point it added; the score never drops below zero
+    return case((trending_score + new_votes > 0, trending_score + new_votes), else_=0.0)
+
+
+def _encode_cursor(sort_by, sort_value, claim_id):
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_by, sort_value, claim_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor, sort_by):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_sort, sort_value, claim_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+    if cursor_sort != sort_by or not isinstance(claim_id, int):
+        raise ValueError('Cursor does not match sort order')
+
+    try:
+        if sort_by == 'newest':
+            sort_value = datetime.fromisoformat(sort_value)
+        elif isinstance(sort_value, bool) or not isinstance(sort_value, (int, float)):
+            raise TypeError(sort_value)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    return sort_value, claim_id
+
 
 class ClaimService:
     @staticmethod
-    def update_credibility_score(claim_id):
-        claim = Claim.query.get(claim_id)
-        if not claim:
+    def with_summary(query):
+        """Add the author username to a Claim query so serializing a page needs no lazy loads.
+
+        Evidence, vote and comment counts are denormalized columns on the claim itself.
+        """
+        return query.outerjoin(User, User.id == Claim.user_id).add_columns(User.username)
+
+    @staticmethod
+    def serialize(row):
+        claim, author_username = row
+        return claim.to_dict(author_username=author_username)
+
+    @staticmethod
+    def get_claim_summary(claim_id):
+        """Return a serialized claim with its author in one query, or None."""
+        row = ClaimService.with_summary(Claim.query.filter(Claim.id == claim_id)).first()
+        return ClaimService.serialize(row) if row else None
+
+    @staticmethod
+    def apply_vote_delta(claim_id, upvotes=0, downvotes=0):
+        """Adjust the vote counters and recompute score and status in one UPDATE.
+
+        New votes also raise the trending score by one, and removed votes
+        lower it by one, until the next ``RankingService.refresh_trending``
+        recomputes it with decay.
+        Runs in the caller's transaction; the caller commits. Returns the new
+        ``(credibility_score, status)`` row, or None when the claim does not exist.
+        """
+        upvote_count = Claim.upvote_count + upvotes
+        downvote_count = Claim.downvote_count + downvotes
+        credibility_score = upvote_count - downvote_count
+
+        result = db.session.execute(
+            update(Claim)
+            .where(Claim.id == claim_id)
+            .values(
+                upvote_count=upvote_count,
+                downvote_count=downvote_count,
+                credibility_score=credibility_score,
+                status=_status_expression(credibility_score),
+                trending_score=_trending_expression(Claim.trending_score, upvotes + downvotes),
+                updated_at=Claim.updated_at
+            )
+            .returning(Claim.credibility_score, Claim.status)
+            .execution_options(synchronize_session=False)
+        )
+        return result.first()
+
+    @staticmethod
+    def apply_vote_deltas(deltas):
+        """Apply ``{claim_id: (upvotes, downvotes)}`` counter changes as one executemany.
+
+        Like ``apply_vote_delta`` but recomputes score and status once per claim
+        for a whole batch of votes. Runs in the caller's transaction.
+        """
+        if not deltas:
             return
 
-        # Calculate score based on votes
-        upvotes = Vote.query.filter_by(claim_id=claim_id, vote_type='upvote').count()
-        downvotes = Vote.query.filter_by(claim_id=claim_id, vote_type='downvote').count()
+        claims = Claim.__table__
+        upvote_count = claims.c.upvote_count + bindparam('upvotes')
+        downvote_count = claims.c.downvote_count + bindparam('downvotes')
+        credibility_score = upvote_count - downvote_count
 
-        credibility_score = upvotes - downvotes
-        claim.credibility_score = credibility_score
+        db.session.execute(
+            update(claims)
+            .where(claims.c.id == bindparam('target_id'))
+            .values(
+                upvote_count=upvote_count,
+                downvote_count=downvote_count,
+                credibility_score=credibility_score,
+                status=_status_expression(credibility_score),
+                trending_score=_trending_expression(claims.c.trending_score, bindparam('new_votes')),
+                updated_at=claims.c.updated_at
+            ),
+            [
+                {'target_id': claim_id, 'upvotes': upvotes, 'downvotes': downvotes,
+                 'new_votes': upvotes + downvotes}
+                for claim_id, (upvotes, downvotes) in deltas.items()
+            ]
+        )
 
-        # Update status based on score
-        if credibility_score >= 10:
-            claim.status = 'verified'
-        elif credibility_score <= -5:
-            claim.status = 'debunked'
-        else:
-            claim.status = 'pending'
+    @staticmethod
+    def apply_count_delta(claim_id, evidence=0, comments=0):
+        """Adjust the evidence/comment counters and discussion score in the caller's transaction."""
+        result = db.session.execute(
+            update(Claim)
+            .where(Claim.id == claim_id)
+            .values(
+                evidence_count=Claim.evidence_count + evidence,
+                comment_count=Claim.comment_count + comments,
+                discussion_score=Claim.discussion_score + comments + EVIDENCE_DISCUSSION_WEIGHT * evidence,
+                updated_at=Claim.updated_at
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    @staticmethod
+    def update_owned(claim_id, user_id, title=None, description=None, category=None, moderation_status=None):
+        """Update the fields given of a claim owned by ``user_id`` in one UPDATE.
+
+        A changed description resets ``moderation_status``. Runs in the
+        caller's transaction. Returns the new ``(title, description,
+        moderation_status)`` row, or None when the claim does not exist or
+        belongs to someone else.
+        """
+        values = {}
+        if title:
+            values['title'] = title
+        if description:
+            values['description'] = description
+            values['moderation_status'] = case(
+                (Claim.description != description, moderation_status),
+                else_=Claim.moderation_status
+            )
+        if category:
+            values['category'] = category
+        if not values:
+            # Nothing to change, but the row is still matched to check ownership
+            values['updated_at'] = Claim.updated_at
+            values['changed_at'] = Claim.changed_at
+
+        result = db.session.execute(
+            update(Claim)
+            .where(Claim.id == claim_id, Claim.user_id == user_id)
+            .values(**values)
+            .returning(Claim.title, Claim.description, Claim.moderation_status)
+            .execution_options(synchronize_session=False)
+        )
+        return result.first()
+
+    @staticmethod
+    def delete_owned(claim_id, user_id):
+        """Delete a claim owned by ``user_id`` with its votes, evidence and comments.
 
+        Four DELETEs (votes, evidence, comments, then the claim), each
+        filtered on ownership in SQL, so nothing is loaded first. Runs in the
+        caller's transaction. Returns False, having deleted
+        nothing, when the claim does not exist or belongs to someone else.
+        """
+        owned = select(Claim.id).where(Claim.id == claim_id, Claim.user_id == user_id)
+        for model in (Vote, Evidence, Comment):
+            db.session.execute(
+                delete(model).where(model.claim_id.in_(owned)).execution_options(synchronize_session=False)
+            )
+        result = db.session.execute(
+            delete(Claim).where(Claim.id == claim_id, Claim.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def update_credibility_score(claim_id):
+        # Score and status are derived from the counters, no need to count votes
+        ClaimService.apply_vote_delta(claim_id)
         db.session.commit()
 
+    @staticmethod
+    def rebuild_counters():
+        """Recount every claim's counters from the child tables to repair drift."""
+        def count_of(model, *criteria):
+            return (select(func.count(model.id))
+                    .where(model.claim_id == Claim.id, *criteria)
+                    .scalar_subquery())
+
+        upvote_count = count_of(Vote, Vote.vote_type == 'upvote')
+        downvote_count = count_of(Vote, Vote.vote_type == 'downvote')
+        credibility_score = upvote_count - downvote_count
+        evidence_count = count_of(Evidence)
+        comment_count = count_of(Comment)
+
+        result = db.session.execute(
+            update(Claim)
+            .values(
+                upvote_count=upvote_count,
+                downvote_count=downvote_count,
+                evidence_count=evidence_count,
+                comment_count=comment_count,
+                discussion_score=comment_count + EVIDENCE_DISCUSSION_WEIGHT * evidence_count,
+                credibility_score=credibility_score,
+                status=_status_expression(credibility_score),
+                updated_at=Claim.updated_at
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount
+
     @staticmethod
     def get_claims_with_filters(category=None, status=None, sort_by='newest'):
-        query = Claim.query
+        query = ClaimService.with_summary(Claim.query)
 
         # Apply filters
         if category:
@@ -38,12 +270,41 @@ class ClaimService:
             query = query.filter(Claim.status == status)
 
         # Apply sorting
-        if sort_by == 'credibility':
-            query = query.order_by(Claim.credibility_score.desc())
-        elif sort_by == 'most_discussed':
-            # This would need a subquery for comment count
-            query = query.order_by(Claim.updated_at.desc())
-        else:  # newest first
-            query = query.order_by(Claim.created_at.desc())
-
-        return query.all()
\ No newline at end of file
+        sort_column = SORT_COLUMNS.get(sort_by, Claim.created_at)
+        query = query.order_by(sort_column.desc(), Claim.id.desc())
+
+        return query.all()
+
+    @staticmethod
+    def get_claims_page(category=None, status=None, sort_by='newest', cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """Fetch one feed page with a (sort key, id) seek predicate instead of OFFSET.
+
+        Returns ``(rows, next_cursor)`` where rows come from ``with_summary``;
+        ``next_cursor`` is None on the last page.
+        Raises ValueError for a malformed cursor.
+        """
+        if sort_by not in SORT_COLUMNS:
+            sort_by = 'newest'
+        sort_column = SORT_COLUMNS[sort_by]
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        query = ClaimService.with_summary(Claim.query)
+        if category:
+            query = query.filter(Claim.category == category)
+        if status:
+            query = query.filter(Claim.status == status)
+
+        if cursor:
+            sort_value, claim_id = _decode_cursor(cursor, sort_by)
+            query = query.filter(tuple_(sort_column, Claim.id) < tuple_(sort_value, claim_id))
+
+        # Fetch one extra row to learn whether another page exists
+        rows = query.order_by(sort_column.desc(), Claim.id.desc()).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1][0]
+            next_cursor = _encode_cursor(sort_by, getattr(last, sort_column.key), last.id)
+
+        return rows, next_cursor
@@ -0,0 +1,192 @@
+from sqlalchemy import delete, update
+
+from app.models.claim import Claim
+from app.models.comment import Comment, path_segment, subtree_end
+from app.models.user import User
+from app.services.claim_service import ClaimService
+from app import db
+
+DEFAULT_THREAD_PAGE_SIZE = 20
+MAX_THREAD_PAGE_SIZE = 100
+
+
+def _in_subtree(claim_id, first_path, last_path):
+    """Range predicate over the subtrees rooted at ``first_path`` .. ``last_path`` (siblings)."""
+    return (
+        (Comment.claim_id == claim_id)
+        & (Comment.path >= first_path)
+        & (Comment.path < subtree_end(last_path))
+    )
+
+
+class CommentService:
+    @staticmethod
+    def create_comment(user_id, claim_id, content, parent_comment_id=None):
+        if not db.session.query(Claim.id).filter(Claim.id == claim_id).first():
+            return {'error': 'Claim not found'}, 404
+
+        parent_path, depth = '', 0
+        if parent_comment_id is not None:
+            parent = (db.session.query(Comment.claim_id, Comment.path, Comment.depth)
+                      .filter(Comment.id == parent_comment_id)
+                      .first())
+            if not parent or parent.claim_id != claim_id:
+                return {'error': 'Parent comment not found on this claim'}, 404
+            parent_path, depth = parent.path, parent.depth + 1
+
+        comment = Comment(
+            claim_id=claim_id,
+            user_id=user_id,
+            content=content,
+            parent_comment_id=parent_comment_id,
+            depth=depth
+        )
+        db.session.add(comment)
+        # The path ends with the comment's own id, so it is set once the id is known
+        db.session.flush()
+        comment.path = parent_path + path_segment(comment.id)
+        ClaimService.apply_count_delta(claim_id, comments=1)
+        db.session.commit()
+
+        return {
+            'message': 'Comment added successfully',
+            'comment': comment.to_dict(replies=[])
+        }, 201
+
+    @staticmethod
+    def get_thread(claim_id, cursor=None, limit=DEFAULT_THREAD_PAGE_SIZE):
+        """Return a page of top-level comments with their complete reply trees.
+
+        Pages are keyed on the last top-level comment id. The page is one
+        indexed range scan over (claim_id, depth, path) and all of its replies
+        a second one over (claim_id, path), already in thread order, however
+        deep or large the thread is. Each top-level comment carries a
+        ``reply_count`` of all its descendants.
+        """
+        limit = max(1, min(limit, MAX_THREAD_PAGE_SIZE))
+
+        query = (db.session.query(Comment, User.username)
+                 .outerjoin(User, User.id == Comment.user_id)
+                 .filter(Comment.claim_id == claim_id, Comment.depth == 0))
+        if cursor:
+            query = query.filter(Comment.path > path_segment(cursor))
+        top_level = query.order_by(Comment.path).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(top_level) > limit:
+            top_level = top_level[:limit]
+            next_cursor = top_level[-1][0].id
+
+        replies = []
+        if top_level:
+            replies = (db.session.query(Comment, User.username)
+                       .outerjoin(User, User.id == Comment.user_id)
+                       .filter(_in_subtree(claim_id, top_level[0][0].path, top_level[-1][0].path),
+                               Comment.depth > 0)
+                       .order_by(Comment.path)
+                       .all())
+
+        return CommentService._assemble(top_level, replies), next_cursor
+
+    @staticmethod
+    def get_subtree(comment_id):
+        """Return one comment with all of its replies, or None."""
+        root = (db.session.query(Comment, User.username)
+                .outerjoin(User, User.id == Comment.user_id)
+                .filter(Comment.id == comment_id)
+                .first())
+        if not root:
+            return None
+
+        comment = root[0]
+        replies = (db.session.query(Comment, User.username)
+                   .outerjoin(User, User.id == Comment.user_id)
+                   .filter(_in_subtree(comment.claim_id, comment.path, comment.path),
+                           Comment.id != comment.id)
+                   .order_by(Comment.path)
+                   .all())
+
+        return CommentService._assemble([root], replies)[0]
+
+    @staticmethod
+    def delete_comment(user_id, comment_id):
+        comment = (db.session.query(Comment.user_id, Comment.claim_id, Comment.path)
+                   .filter(Comment.id == comment_id)
+                   .first())
+
+        if not comment:
+            return {'error': 'Comment not found'}, 404
+
+        if comment.user_id != user_id:
+            return {'error': 'Not authorized to delete this comment'}, 403
+
+        # Replies go with the comment, in one range delete
+        deleted = db.session.execute(
+            delete(Comment)
+            .where(_in_subtree(comment.claim_id, comment.path, comment.path))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        ClaimService.apply_count_delta(comment.claim_id, comments=-deleted)
+        db.session.commit()
+
+        return {'message': 'Comment deleted successfully', 'claim_id': comment.claim_id, 'deleted': deleted}, 200
+
+    @staticmethod
+    def rebuild_paths(claim_id=None):
+        """Recompute path and depth from parent_comment_id, e.g. after a bulk import."""
+        query = db.session.query(Comment.id, Comment.parent_comment_id).order_by(Comment.id)
+        if claim_id is not None:
+            query = query.filter(Comment.claim_id == claim_id)
+
+        parents = dict(query.all())
+        paths = {}
+
+        def resolve(comment_id):
+            # Walk up to the nearest ancestor with a known path, then fill in on the way back
+            chain = []
+            while comment_id not in paths:
+                chain.append(comment_id)
+                parent_id = parents.get(comment_id)
+                if parent_id is None:
+                    break
+                comment_id = parent_id
+            for node in reversed(chain):
+                parent_id = parents.get(node)
+                parent_path, parent_depth = paths.get(parent_id, ('', -1))
+                paths[node] = (parent_path + path_segment(node), parent_depth + 1)
+
+        for comment_id in parents:
+            resolve(comment_id)
+
+        comments = Comment.__table__
+        if paths:
+            db.session.execute(
+                update(comments)
+                .where(comments.c.id == db.bindparam('target_id'))
+                .values(path=db.bindparam('new_path'), depth=db.bindparam('new_depth')),
+                [
+                    {'target_id': comment_id, 'new_path': path, 'new_depth': depth}
+                    for comment_id, (path, depth) in paths.items()
+                ]
+            )
+        db.session.commit()
+        return len(paths)
+
+    @staticmethod
+    def _assemble(top_level, replies):
+        nodes = {}
+        roots = []
+        for comment, author_username in top_level:
+            nodes[comment.id] = comment.to_dict(author_username=author_username, replies=[])
+            nodes[comment.id]['reply_count'] = 0
+            roots.append(nodes[comment.id])
+
+        # Replies arrive in path order, so a parent is always placed before its replies
+        for comment, author_username in replies:
+            node = comment.to_dict(author_username=author_username, replies=[])
+            nodes[comment.id] = node
+            nodes[comment.parent_comment_id]['replies'].append(node)
+            root_id = int(comment.path[:comment.path.index('/')])
+            nodes[root_id]['reply_count'] += 1
+
+        return roots
@@ -0,0 +1,191 @@
+import hashlib
+import random
+import re
+import struct
+
+from sqlalchemy import delete, or_, select
+
+from app.models.claim import Claim
+from app.models.claim_signature import ClaimSignature, ClaimSignatureBand
+from app.services.claim_service import ClaimService
+from app.services.moderation_cache import normalize_text
+from app import db
+
+# 20 bands of 3 rows: claims with Jaccard similarity 0.5 become candidates
+# with probability 1 - (1 - 0.5**3)**20 = 0.93, at 0.7 with 0.9999, at 0.2 with 0.15
+NUM_BANDS = 20
+ROWS_PER_BAND = 3
+NUM_PERMUTATIONS = NUM_BANDS * ROWS_PER_BAND
+SHINGLE_SIZE = 4
+
+SIMILARITY_THRESHOLD = 0.5
+MAX_CANDIDATES = 500
+DEFAULT_SIMILAR_LIMIT = 5
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+# Fixed (a, b) pairs of the universal hashes standing in for random permutations
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERMUTATIONS)]
+_SIGNATURE_FORMAT = f'>{NUM_PERMUTATIONS}Q'
+
+
+def shingles(text):
+    """Character 4-grams of the normalized text with punctuation removed."""
+    text = re.sub(r'[^\w ]', '', normalize_text(text))
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text):
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'big')
+        for shingle in shingles(text)
+    ]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def band_buckets(signature):
+    """Signed 64-bit bucket key of every band, as stored in claim_signature_bands."""
+    buckets = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f'>{ROWS_PER_BAND}Q', *rows), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'big', signed=True))
+    return buckets
+
+
+def similarity(signature, other):
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return sum(1 for x, y in zip(signature, other) if x == y) / NUM_PERMUTATIONS
+
+
+def pack(signature):
+    return struct.pack(_SIGNATURE_FORMAT, *signature)
+
+
+def unpack(data):
+    return list(struct.unpack(_SIGNATURE_FORMAT, data))
+
+
+def claim_text(title, description):
+    return f'{title} {description}'
+
+
+class DuplicateService:
+    @staticmethod
+    def index_claim(claim_id, title, description):
+        """Store the signature and LSH bands of a claim in the caller's transaction.
+
+        Returns the signature so the caller can look up duplicates without recomputing it.
+        """
+        signature = minhash(claim_text(title, description))
+        DuplicateService.remove_claim(claim_id)
+        db.session.add(ClaimSignature(claim_id=claim_id, signature=pack(signature)))
+        db.session.execute(
+            ClaimSignatureBand.__table__.insert(),
+            [
+                {'band': band, 'bucket': bucket, 'claim_id': claim_id}
+                for band, bucket in enumerate(band_buckets(signature))
+            ]
+        )
+        return signature
+
+    @staticmethod
+    def remove_claim(claim_id):
+        db.session.execute(delete(ClaimSignatureBand).where(ClaimSignatureBand.claim_id == claim_id))
+        db.session.execute(delete(ClaimSignature).where(ClaimSignature.claim_id == claim_id))
+
+    @staticmethod
+    def find_candidates(signature, exclude_claim_id=None, threshold=SIMILARITY_THRESHOLD):
+        """Return ``[(claim_id, similarity)]`` above ``threshold``, most similar first.
+
+        Candidates come from one lookup of the (band, bucket) primary key per
+        band, so the cost depends on the number of near matches rather than on
+        the number of stored claims. Candidates are then verified against
+        their full signatures.
+        """
+        band_match = or_(*(
+            (ClaimSignatureBand.band == band) & (ClaimSignatureBand.bucket == bucket)
+            for band, bucket in enumerate(band_buckets(signature))
+        ))
+        candidate_ids = select(ClaimSignatureBand.claim_id).where(band_match).distinct().limit(MAX_CANDIDATES)
+        if exclude_claim_id is not None:
+            candidate_ids = candidate_ids.where(ClaimSignatureBand.claim_id != exclude_claim_id)
+
+        rows = db.session.execute(
+            select(ClaimSignature.claim_id, ClaimSignature.signature)
+            .where(ClaimSignature.claim_id.in_(candidate_ids))
+        ).all()
+
+        matches = [(claim_id, similarity(signature, unpack(data))) for claim_id, data in rows]
+        matches = [match for match in matches if match[1] >= threshold]
+        return sorted(matches, key=lambda match: (-match[1], match[0]))
+
+    @staticmethod
+    def find_similar(claim_id, signature=None, limit=DEFAULT_SIMILAR_LIMIT):
+        """Return serialized claims similar to ``claim_id``, each with its ``similarity``.
+
+        Returns None when the claim does not exist.
+        """
+        if signature is None:
+            data = db.session.execute(
+                select(ClaimSignature.signature).where(ClaimSignature.claim_id == claim_id)
+            ).scalar()
+            if data is not None:
+                signature = unpack(data)
+            else:
+                # Not indexed yet (created before signatures existed), compute it on the fly
+                claim = db.session.execute(
+                    select(Claim.title, Claim.description).where(Claim.id == claim_id)
+                ).first()
+                if claim is None:
+                    return None
+                signature = minhash(claim_text(claim.title, claim.description))
+
+        matches = DuplicateService.find_candidates(signature, exclude_claim_id=claim_id)[:limit]
+        if not matches:
+            return []
+
+        rows = ClaimService.with_summary(Claim.query.filter(Claim.id.in_([m[0] for m in matches]))).all()
+        claims = {row[0].id: ClaimService.serialize(row) for row in rows}
+
+        similar = []
+        for match_id, score in matches:
+            if match_id in claims:
+                similar.append(dict(claims[match_id], similarity=round(score, 3)))
+        return similar
+
+    @staticmethod
+    def rebuild(batch_size=1000):
+        """Recompute every claim's signature, e.g. after a bulk import. Returns the number of claims."""
+        db.session.execute(delete(ClaimSignatureBand))
+        db.session.execute(delete(ClaimSignature))
+
+        indexed = 0
+        last_id = 0
+        while True:
+            batch = db.session.execute(
+                select(Claim.id, Claim.title, Claim.description)
+                .where(Claim.id > last_id)
+                .order_by(Claim.id)
+                .limit(batch_size)
+            ).all()
+            if not batch:
+                break
+
+            signatures, bands = [], []
+            for claim_id, title, description in batch:
+                signature = minhash(claim_text(title, description))
+                signatures.append({'claim_id': claim_id, 'signature': pack(signature)})
+                bands.extend(
+                    {'band': band, 'bucket': bucket, 'claim_id': claim_id}
+                    for band, bucket in enumerate(band_buckets(signature))
+                )
+            db.session.execute(ClaimSignature.__table__.insert(), signatures)
+            db.session.execute(ClaimSignatureBand.__table__.insert(), bands)
+            db.session.commit()
+
+            indexed += len(batch)
+            last_id = batch[-1][0]
+        return indexed
@@ -0,0 +1,172 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    """Stops calling an unhealthy backend until ``reset_timeout`` has passed.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    every call fails fast. Once the timeout expires one trial call is let
+    through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return 'half-open'
+            return 'open'
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class LatencyStats:
+    """Thread-safe call counters and a cumulative latency histogram per operation."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._operations = {}
+
+    def record(self, operation, seconds, ok=True):
+        with self._lock:
+            stats = self._operations.setdefault(operation, {
+                'count': 0, 'errors': 0, 'total_seconds': 0.0, 'max_seconds': 0.0,
+                'buckets': [0] * len(self.buckets)
+            })
+            stats['count'] += 1
+            stats['errors'] += 0 if ok else 1
+            stats['total_seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    stats['buckets'][index] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                operation: dict(stats, buckets=list(stats['buckets']))
+                for operation, stats in self._operations.items()
+            }
+
+
+class PooledHTTPClient:
+    """A keep-alive JSON client for one backend, shared by every thread.
+
+    Connections are pooled per host and every request has connect and read
+    timeouts. The calls are POSTs that must not run twice, so urllib3 retries
+    (with backoff) only connect errors, where nothing was sent, and 429/503
+    responses, where the backend asked for a retry. At most
+    ``max_concurrency`` requests are in flight. A circuit breaker fails fast
+    while the backend is down; only 5xx responses, timeouts and connection
+    errors count against it, not 4xx responses, bad bodies or waiting for a
+    free slot.
+    """
+
+    def __init__(self, base_url, headers=None, connect_timeout=3.05, read_timeout=10.0,
+                 max_connections=10, max_concurrency=8, retries=2, backoff=0.5,
+                 breaker=None, stats=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.breaker = breaker or CircuitBreaker()
+        self.stats = stats or LatencyStats()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            other=0,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 503),
+            allowed_methods=frozenset(['POST']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def post_json(self, path, payload, operation=None):
+        operation = operation or path
+        # Wait at most one read timeout for a free slot; a busy client says nothing about the backend
+        if not self._slots.acquire(timeout=self.timeout[1]):
+            raise TimeoutError(f'No free connection slot for {self.base_url}')
+
+        response = None
+        start = time.perf_counter()
+        try:
+            if not self.breaker.allow():
+                raise CircuitOpenError(f'Circuit open for {self.base_url}')
+            try:
+                response = self.session.post(f'{self.base_url}{path}', json=payload, timeout=self.timeout)
+                response.raise_for_status()
+                body = response.json()
+            except Exception as e:
+                if _backend_failed(e, response):
+                    self.breaker.record_failure()
+                else:
+                    # The backend answered (e.g. 401 for a bad key), so it is up
+                    self.breaker.record_success()
+                self.stats.record(operation, time.perf_counter() - start, ok=False)
+                raise
+        finally:
+            self._slots.release()
+
+        self.breaker.record_success()
+        self.stats.record(operation, time.perf_counter() - start)
+        return body
+
+    def close(self):
+        self.session.close()
+
+
+def _backend_failed(error, response):
+    """True for failures that mean the backend is down or overloaded: 5xx, timeouts, connection errors."""
+    if response is not None:
+        return response.status_code >= 500
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
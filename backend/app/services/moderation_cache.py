@@ -0,0 +1,184 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.moderation_cache import ModerationCacheEntry
+from app.services.sql_utils import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+# Prune the table after this many writes
+PRUNE_EVERY = 1000
+
+
+def normalize_text(text):
+    """Case-fold, NFKC-normalize and collapse whitespace so trivial edits share a key."""
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+class ModerationCache:
+    """Two-level cache of moderation/analysis results keyed on normalized-text hash.
+
+    An in-process LRU sits in front of the ``moderation_cache`` table, which
+    survives restarts and is shared by every worker. Entries expire after
+    ``ttl`` seconds. It talks to the engine directly, in its own short
+    transactions, so it can be used from background threads and never
+    commits a request's session.
+    """
+
+    def __init__(self, engine, ttl=7 * 24 * 3600, max_entries=10000, max_rows=1000000):
+        self.engine = engine
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.counters = {'memory_hits': 0, 'db_hits': 0, 'misses': 0, 'stores': 0}
+
+    @staticmethod
+    def make_key(kind, text):
+        return hashlib.sha256(f'{kind}:{normalize_text(text)}'.encode()).hexdigest()
+
+    def get(self, kind, text):
+        key = self.make_key(kind, text)
+
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._lru.move_to_end(key)
+                self.counters['memory_hits'] += 1
+                return entry[1]
+
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl)
+        try:
+            with self.engine.connect() as conn:
+                row = conn.execute(
+                    select(ModerationCacheEntry.result, ModerationCacheEntry.created_at)
+                    .where(ModerationCacheEntry.key == key, ModerationCacheEntry.created_at >= cutoff)
+                ).first()
+        except SQLAlchemyError:
+            # The cache must never take moderation down with it
+            logger.exception('Moderation cache lookup failed')
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.counters['misses'] += 1
+                return None
+            self.counters['db_hits'] += 1
+
+        result = json.loads(row.result)
+        remaining = self.ttl - (datetime.utcnow() - row.created_at).total_seconds()
+        self._remember(key, result, remaining)
+        return result
+
+    def get_many(self, kind, texts):
+        """Like ``get`` for many texts, with one table lookup for all LRU misses."""
+        keys = [self.make_key(kind, text) for text in texts]
+        results = [None] * len(texts)
+        pending = {}
+
+        now = time.monotonic()
+        with self._lock:
+            for index, key in enumerate(keys):
+                entry = self._lru.get(key)
+                if entry and entry[0] > now:
+                    self._lru.move_to_end(key)
+                    self.counters['memory_hits'] += 1
+                    results[index] = entry[1]
+                else:
+                    pending.setdefault(key, []).append(index)
+
+        if not pending:
+            return results
+
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl)
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    select(ModerationCacheEntry.key, ModerationCacheEntry.result, ModerationCacheEntry.created_at)
+                    .where(ModerationCacheEntry.key.in_(list(pending)), ModerationCacheEntry.created_at >= cutoff)
+                ).all()
+        except SQLAlchemyError:
+            logger.exception('Moderation cache lookup failed')
+            rows = []
+
+        found = 0
+        for row in rows:
+            result = json.loads(row.result)
+            remaining = self.ttl - (datetime.utcnow() - row.created_at).total_seconds()
+            self._remember(row.key, result, remaining)
+            for index in pending[row.key]:
+                results[index] = result
+                found += 1
+
+        with self._lock:
+            self.counters['db_hits'] += found
+            self.counters['misses'] += sum(len(indexes) for indexes in pending.values()) - found
+        return results
+
+    def set(self, kind, text, result):
+        key = self.make_key(kind, text)
+        payload = json.dumps(result)
+
+        stmt = dialect_insert(ModerationCacheEntry, bind=self.engine).values(
+            key=key, kind=kind, result=payload, created_at=datetime.utcnow()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ModerationCacheEntry.key],
+            set_={'result': stmt.excluded.result, 'created_at': stmt.excluded.created_at}
+        )
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(stmt)
+        except SQLAlchemyError:
+            logger.exception('Moderation cache write failed')
+
+        self._remember(key, result, self.ttl)
+        with self._lock:
+            self.counters['stores'] += 1
+            self._writes += 1
+            prune = self._writes % PRUNE_EVERY == 0
+        if prune:
+            try:
+                self.prune()
+            except SQLAlchemyError:
+                # engine.begin() has rolled the prune back; the next one tries again
+                logger.warning('Moderation cache prune failed', exc_info=True)
+
+    def prune(self):
+        """Delete expired rows and the oldest rows beyond ``max_rows``."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl)
+        with self.engine.begin() as conn:
+            conn.execute(delete(ModerationCacheEntry).where(ModerationCacheEntry.created_at < cutoff))
+
+            excess = conn.execute(select(func.count()).select_from(ModerationCacheEntry)).scalar() - self.max_rows
+            if excess > 0:
+                oldest = (select(ModerationCacheEntry.key)
+                          .order_by(ModerationCacheEntry.created_at)
+                          .limit(excess)
+                          .scalar_subquery())
+                conn.execute(delete(ModerationCacheEntry).where(ModerationCacheEntry.key.in_(oldest)))
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters, memory_entries=len(self._lru))
+        lookups = stats['memory_hits'] + stats['db_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['db_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def _remember(self, key, result, ttl):
+        with self._lock:
+            self._lru[key] = (time.monotonic() + ttl, result)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
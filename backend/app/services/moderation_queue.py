@@ -0,0 +1,90 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from flask import has_app_context
+from sqlalchemy import update
+
+from app import db
+from app.models.claim import Claim
+from app.services.moderation_service import ModerationService, overall_score
+from app.services.request_metrics import timed
+from app.services.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+
+class ModerationQueue:
+    """Moderates claims on a background thread pool, off the request path.
+
+    Claims are inserted with ``moderation_status='queued'``; a worker calls the
+    moderation backend and writes ``ai_moderation_score`` and the final status
+    back. Deadlines and retries belong to the backend's HTTP client (read
+    timeout, retry policy and circuit breaker), so a slow backend holds at
+    most ``MODERATION_WORKERS`` threads and never a request.
+    Failed claims keep a NULL score for ``flask moderation backfill``.
+    With ``MODERATION_ASYNC`` disabled the same work runs inline.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.service = None
+        self._workers = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, service=None):
+        self.app = app
+        if service is None:
+            with app.app_context():
+                service = ModerationService.from_config(app.config, engine=db.engine)
+        self.service = service
+        self.async_enabled = app.config.get('MODERATION_ASYNC', True)
+        self._workers = ThreadPoolExecutor(max_workers=app.config.get('MODERATION_WORKERS', 4),
+                                           thread_name_prefix='moderation')
+        app.extensions['moderation_queue'] = self
+
+    @property
+    def enabled(self):
+        return self.service is not None and self.service.enabled
+
+    def initial_status(self):
+        return 'queued' if self.enabled else 'skipped'
+
+    def enqueue(self, claim_id, text):
+        """Schedule moderation of a committed claim. Returns a Future in async mode."""
+        if not self.enabled:
+            return None
+        if self.async_enabled:
+            return self._workers.submit(self.process, claim_id, text)
+        self.process(claim_id, text)
+        return None
+
+    def process(self, claim_id, text):
+        # Counted against the request when moderation runs inline
+        with timed('moderation'):
+            result = self.service.moderate_text(text)
+        status = 'completed' if result.get('moderated') else 'failed'
+        if status == 'failed':
+            logger.warning('Moderation of claim %s failed: %s', claim_id, result.get('error'))
+
+        # Inline (synchronous) runs reuse the request's session so the claim it holds is updated too
+        with nullcontext() if has_app_context() else self.app.app_context():
+            db.session.execute(
+                update(Claim)
+                .where(Claim.id == claim_id)
+                .values(
+                    ai_moderation_score=overall_score(result),
+                    moderation_status=status,
+                    updated_at=Claim.updated_at
+                )
+            )
+            db.session.commit()
+        response_cache.invalidate_claim(claim_id)
+        return result
+
+    def shutdown(self, wait=True):
+        self._workers.shutdown(wait=wait)
+
+
+moderation_queue = ModerationQueue()
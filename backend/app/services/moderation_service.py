@@ -1,40 +1,201 @@
-import openai
 import os
-from typing import Dict, Any
+import time
+from typing import Dict, Any, List, Optional
+
+from app.services.http_client import CircuitBreaker, PooledHTTPClient
+from app.services.moderation_batcher import MicroBatcher
+from app.services.moderation_cache import ModerationCache
+
+OPENAI_API_BASE = 'https://api.openai.com/v1'
+
+
+class OpenAIModerationBackend:
+    """Calls the OpenAI moderation and chat completion REST APIs.
+
+    The backend owns one pooled keep-alive client for its lifetime instead of
+    going through the module-level ``openai`` functions; ``client_options``
+    are passed to PooledHTTPClient (timeouts, pool size, retries, breaker).
+    """
+
+    def __init__(self, api_key: str, base_url: str = OPENAI_API_BASE, **client_options):
+        self.client = PooledHTTPClient(
+            base_url,
+            headers={'Authorization': f'Bearer {api_key}'},
+            **client_options
+        )
+
+    def moderate_many(self, texts: List[str]) -> List[Dict[str, Any]]:
+        # The moderation endpoint accepts a list and returns results in input order
+        response = self.client.post_json('/moderations', {'input': texts}, operation='moderations')
+        return response['results']
+
+    def analyze(self, prompt: str) -> str:
+        response = self.client.post_json('/chat/completions', {
+            'model': 'gpt-3.5-turbo',
+            'messages': [{'role': 'user', 'content': prompt}],
+            'max_tokens': 150
+        }, operation='chat_completions')
+        return response['choices'][0]['message']['content'].strip()
+
+
+class FakeModerationBackend:
+    """Local stand-in for the moderation API, for development and load tests.
+
+    ``delay`` simulates a slow backend and ``flagged_terms`` marks texts
+    containing any of the terms as flagged.
+    """
+
+    def __init__(self, delay: float = 0.0, flagged_terms=()):
+        self.delay = delay
+        self.flagged_terms = [term.lower() for term in flagged_terms]
+
+    def moderate_many(self, texts: List[str]) -> List[Dict[str, Any]]:
+        # One delay per call, like one HTTP round-trip for a whole batch
+        if self.delay:
+            time.sleep(self.delay)
+        return [self._result(text) for text in texts]
+
+    def _result(self, text: str) -> Dict[str, Any]:
+        flagged = any(term in text.lower() for term in self.flagged_terms)
+        score = 0.9 if flagged else 0.01
+        return {
+            'flagged': flagged,
+            'categories': {'harassment': flagged},
+            'category_scores': {'harassment': score}
+        }
+
+    def analyze(self, prompt: str) -> str:
+        if self.delay:
+            time.sleep(self.delay)
+        return 'Category: other\nComplexity: low\nVerifiability: medium\nRisk Level: low'
 
 
 class ModerationService:
-    def __init__(self):
+    def __init__(self, backend=None, cache=None, batch_size=32, batch_window=0.005):
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
-        if self.openai_api_key:
-            openai.api_key = self.openai_api_key
+        if backend is None and self.openai_api_key:
+            backend = OpenAIModerationBackend(self.openai_api_key)
+        self.backend = backend
+        self.cache = cache
+        self.batch_size = batch_size
+
+        # Concurrent moderate_text callers are coalesced into batched backend calls
+        self._batcher = None
+        if backend is not None and batch_window:
+            self._batcher = MicroBatcher(backend.moderate_many, max_batch=batch_size, window=batch_window)
+
+    @classmethod
+    def from_config(cls, config, engine=None) -> 'ModerationService':
+        cache = None
+        if engine is not None and config.get('MODERATION_CACHE_ENABLED', True):
+            cache = ModerationCache(
+                engine,
+                ttl=config.get('MODERATION_CACHE_TTL', 7 * 24 * 3600),
+                max_entries=config.get('MODERATION_CACHE_MAX_ENTRIES', 10000),
+                max_rows=config.get('MODERATION_CACHE_MAX_ROWS', 1000000)
+            )
+
+        backend = None
+        api_key = os.getenv('OPENAI_API_KEY')
+        if config.get('MODERATION_BACKEND') == 'fake':
+            backend = FakeModerationBackend(
+                delay=config.get('MODERATION_FAKE_DELAY', 0.0),
+                flagged_terms=config.get('MODERATION_FAKE_FLAGGED_TERMS', ())
+            )
+        elif api_key:
+            backend = OpenAIModerationBackend(
+                api_key,
+                base_url=config.get('OPENAI_API_BASE', OPENAI_API_BASE),
+                connect_timeout=config.get('MODERATION_CONNECT_TIMEOUT', 3.05),
+                read_timeout=config.get('MODERATION_READ_TIMEOUT', 10.0),
+                max_connections=config.get('MODERATION_MAX_CONNECTIONS', 10),
+                max_concurrency=config.get('MODERATION_MAX_CONCURRENCY', 8),
+                retries=config.get('MODERATION_HTTP_RETRIES', 2),
+                backoff=config.get('MODERATION_RETRY_BACKOFF', 0.5),
+                breaker=CircuitBreaker(
+                    failure_threshold=config.get('MODERATION_BREAKER_THRESHOLD', 5),
+                    reset_timeout=config.get('MODERATION_BREAKER_RESET', 30.0)
+                )
+            )
+        return cls(
+            backend,
+            cache=cache,
+            batch_size=config.get('MODERATION_BATCH_SIZE', 32),
+            batch_window=config.get('MODERATION_BATCH_WINDOW_MS', 5) / 1000
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def metrics(self) -> Dict[str, Any]:
+        """Backend call latencies, circuit state and cache counters of this process."""
+        client = getattr(self.backend, 'client', None)
+        return {
+            'calls': client.stats.snapshot() if client else {},
+            'circuit': client.breaker.state if client else None,
+            'cache': self.cache.stats() if self.cache else None
+        }
 
     def moderate_text(self, text: str) -> Dict[str, Any]:
         """Analyze text using OpenAI moderation"""
-        if not self.openai_api_key:
+        if not self.enabled:
             return {'moderated': False, 'reason': 'OpenAI API key not configured'}
 
-        try:
-            response = openai.Moderation.create(input=text)
-            moderation_result = response["results"][0]
-
-            return {
-                'moderated': True,
-                'flagged': moderation_result['flagged'],
-                'categories': moderation_result['categories'],
-                'category_scores': moderation_result['category_scores'],
-                'overall_score': max(moderation_result['category_scores'].values()) if moderation_result[
-                    'category_scores'] else 0
-            }
+        cached = self.cache.get('moderation', text) if self.cache else None
+        if cached is not None:
+            return cached
 
+        try:
+            if self._batcher:
+                moderation_result = self._batcher.submit(text).result()
+            else:
+                moderation_result = self.backend.moderate_many([text])[0]
         except Exception as e:
             return {'moderated': False, 'error': str(e)}
 
+        result = _format_moderation(moderation_result)
+        # Only successful results are cached, failures are retried on the next call
+        if self.cache:
+            self.cache.set('moderation', text, result)
+        return result
+
+    def moderate_many(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Moderate many texts with one backend call per ``batch_size`` cache misses.
+
+        Used by backfill jobs; results are returned in input order.
+        """
+        if not self.enabled:
+            return [{'moderated': False, 'reason': 'OpenAI API key not configured'} for _ in texts]
+
+        results = self.cache.get_many('moderation', texts) if self.cache else [None] * len(texts)
+        misses = [index for index, result in enumerate(results) if result is None]
+
+        for start in range(0, len(misses), self.batch_size):
+            chunk = misses[start:start + self.batch_size]
+            try:
+                moderation_results = self.backend.moderate_many([texts[index] for index in chunk])
+            except Exception as e:
+                for index in chunk:
+                    results[index] = {'moderated': False, 'error': str(e)}
+                continue
+
+            for index, moderation_result in zip(chunk, moderation_results):
+                results[index] = _format_moderation(moderation_result)
+                if self.cache:
+                    self.cache.set('moderation', texts[index], results[index])
+
+        return results
+
     def analyze_claim(self, claim_text: str) -> Dict[str, Any]:
         """Analyze claim for fact-checking potential"""
-        if not self.openai_api_key:
+        if not self.enabled:
             return {'analyzed': False, 'reason': 'OpenAI API key not configured'}
 
+        cached = self.cache.get('analysis', claim_text) if self.cache else None
+        if cached is not None:
+            return cached
+
         try:
             prompt = f"""
             Analyze this claim for fact-checking: "{claim_text}"
@@ -46,14 +207,28 @@ class ModerationService:
             Risk Level: [low/medium/high]
             """
 
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=150
-            )
-
-            analysis_text = response.choices[0].message.content.strip()
-            return {'analyzed': True, 'analysis': analysis_text}
+            analysis_text = self.backend.analyze(prompt)
 
         except Exception as e:
-            return {'analyzed': False, 'error': str(e)}
\ No newline at end of file
+            return {'analyzed': False, 'error': str(e)}
+
+        result = {'analyzed': True, 'analysis': analysis_text}
+        if self.cache:
+            self.cache.set('analysis', claim_text, result)
+        return result
+
+
+def _format_moderation(moderation_result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'moderated': True,
+        'flagged': moderation_result['flagged'],
+        'categories': moderation_result['categories'],
+        'category_scores': moderation_result['category_scores'],
+        'overall_score': max(moderation_result['category_scores'].values()) if moderation_result[
+            'category_scores'] else 0
+    }
+
+
+def overall_score(moderation_result: Dict[str, Any]) -> Optional[float]:
+    """Score stored on the claim, or None when moderation did not run."""
+    return moderation_result.get('overall_score', 0) if moderation_result.get('moderated') else None
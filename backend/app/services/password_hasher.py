@@ -0,0 +1,71 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# werkzeug's method string: algorithm and cost, e.g. 'pbkdf2:sha256:600000'
+DEFAULT_METHOD = 'pbkdf2:sha256:600000'
+
+
+@lru_cache(maxsize=None)
+def expanded_method(method):
+    """The method as stored in hashes: werkzeug fills in defaults, e.g. 'scrypt' -> 'scrypt:32768:8:1'."""
+    return generate_password_hash('', method).split('$', 1)[0]
+
+
+class HashingBusyError(Exception):
+    """Raised when every hashing slot is taken, instead of queueing without bound."""
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords with the configured method on a bounded pool.
+
+    ``PASSWORD_HASH_METHOD`` is a werkzeug method string, so algorithm and
+    cost are changed in config. Hashing runs on ``PASSWORD_HASH_WORKERS``
+    threads (hashlib releases the GIL), which caps the CPU a burst of logins
+    can take from other requests in the process; at most
+    ``PASSWORD_HASH_QUEUE`` more requests wait, and further ones fail fast
+    with ``HashingBusyError``. Outside an app the hash runs inline.
+    """
+
+    def __init__(self, app=None):
+        self.method = DEFAULT_METHOD
+        self._executor = None
+        self._slots = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = expanded_method(app.config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD))
+        workers = app.config.get('PASSWORD_HASH_WORKERS', 2)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(workers + app.config.get('PASSWORD_HASH_QUEUE', 32))
+        app.extensions['password_hasher'] = self
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return bool(password_hash) and self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True when the hash was made with another algorithm or cost than configured."""
+        return password_hash.split('$', 1)[0] != self.method
+
+    def _run(self, func, *args):
+        if self._executor is None:
+            return func(*args)
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusyError('Too many password hashes in progress')
+        try:
+            return self._executor.submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+
+password_hasher = PasswordHasher()
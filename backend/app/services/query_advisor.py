@@ -0,0 +1,97 @@
+import logging
+import re
+
+from flask import has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# SQLite reports "SCAN <table>" for a full scan and "SCAN <table> USING INDEX ..."
+# when it walks an index; PostgreSQL reports "Seq Scan on <table>".
+_SQLITE_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+_POSTGRES_SCAN = re.compile(r'Seq Scan on (\w+)')
+
+
+class FullTableScanError(RuntimeError):
+    pass
+
+
+class QueryPlanAdvisor:
+    """Runs EXPLAIN on every SELECT the app issues and flags full table scans.
+
+    Meant for development and CI only: each query is planned a second time.
+    In 'raise' mode the offending query fails with FullTableScanError, in
+    'warn' mode it is logged. Every finding is kept in ``findings``.
+    """
+
+    def __init__(self, mode='warn', allow_tables=()):
+        self.mode = mode
+        self.allow_tables = set(allow_tables)
+        self.findings = []
+        self._engine = None
+
+    def attach(self, engine):
+        self._engine = engine
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def detach(self):
+        if self._engine is not None:
+            event.remove(self._engine, 'after_cursor_execute', self._after_cursor_execute)
+            self._engine = None
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith('SELECT'):
+            return
+
+        tables = self.scanned_tables(conn, statement, parameters) - self.allow_tables
+        if not tables:
+            return
+
+        finding = {
+            'endpoint': request.endpoint if has_request_context() else None,
+            'tables': sorted(tables),
+            'statement': statement
+        }
+        self.findings.append(finding)
+
+        message = f"Full table scan on {', '.join(finding['tables'])} ({finding['endpoint']}): {statement}"
+        if self.mode == 'raise':
+            raise FullTableScanError(message)
+        logger.warning(message)
+
+    @staticmethod
+    def scanned_tables(conn, statement, parameters):
+        """Return the tables the planner would read without an index."""
+        # A separate DBAPI cursor leaves the caller's result set untouched
+        dbapi_cursor = conn.connection.cursor()
+        try:
+            if conn.dialect.name == 'sqlite':
+                dbapi_cursor.execute('EXPLAIN QUERY PLAN ' + statement, parameters)
+                details = [row[3] for row in dbapi_cursor.fetchall()]
+                return {m.group(1) for m in map(_SQLITE_SCAN.match, details) if m}
+
+            if conn.dialect.name == 'postgresql':
+                # Tiny tables are always cheaper to seq scan, so ask whether an index exists at all
+                dbapi_cursor.execute('SET enable_seqscan = off')
+                try:
+                    dbapi_cursor.execute('EXPLAIN ' + statement, parameters)
+                    plan = '\n'.join(row[0] for row in dbapi_cursor.fetchall())
+                finally:
+                    dbapi_cursor.execute('RESET enable_seqscan')
+                return set(_POSTGRES_SCAN.findall(plan))
+
+            return set()
+        finally:
+            dbapi_cursor.close()
+
+
+def init_query_advisor(app, db):
+    mode = app.config.get('SQL_EXPLAIN_CHECK')
+    if not mode:
+        return None
+
+    advisor = QueryPlanAdvisor(mode=mode, allow_tables=app.config.get('SQL_EXPLAIN_ALLOW_TABLES', ()))
+    with app.app_context():
+        advisor.attach(db.engine)
+    app.extensions['query_advisor'] = advisor
+    return advisor
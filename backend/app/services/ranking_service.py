@@ -0,0 +1,58 @@
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, select, update
+
+from app.models.claim import Claim
+from app.models.vote import Vote
+from app import db
+
+DEFAULT_HALF_LIFE_HOURS = 6.0
+DEFAULT_WINDOW_HOURS = 48.0
+
+
+class RankingService:
+    @staticmethod
+    def refresh_trending(half_life_hours=DEFAULT_HALF_LIFE_HOURS, window_hours=DEFAULT_WINDOW_HOURS, now=None):
+        """Recompute every claim's trending score from the votes cast in the last ``window_hours``.
+
+        A vote counts 1 when cast and half as much every ``half_life_hours``
+        after that; votes older than the window are ignored. Only the window
+        is read (through the votes.created_at index) and only claims whose
+        score changes are written. Between refreshes ``apply_vote_delta`` adds
+        1 per new vote and takes 1 off per removed vote. Returns the number of claims with a trending score.
+        """
+        now = now or datetime.utcnow()
+        since = now - timedelta(hours=window_hours)
+        decay = math.log(2) / (half_life_hours * 3600)
+
+        scores = defaultdict(float)
+        recent_votes = db.session.execute(
+            select(Vote.claim_id, Vote.created_at)
+            .where(Vote.created_at >= since)
+            .execution_options(yield_per=10000)
+        )
+        for claim_id, created_at in recent_votes:
+            age = max(0.0, (now - created_at).total_seconds())
+            scores[claim_id] += math.exp(-decay * age)
+
+        # Claims that dropped out of the window; the (trending_score, id) index finds them
+        stale = [
+            claim_id for (claim_id,) in
+            db.session.execute(select(Claim.id).where(Claim.trending_score > 0))
+            if claim_id not in scores
+        ]
+
+        claims = Claim.__table__
+        rows = [{'target_id': claim_id, 'new_score': round(score, 6)} for claim_id, score in scores.items()]
+        rows += [{'target_id': claim_id, 'new_score': 0.0} for claim_id in stale]
+        if rows:
+            db.session.execute(
+                update(claims)
+                .where(claims.c.id == bindparam('target_id'))
+                .values(trending_score=bindparam('new_score'), updated_at=claims.c.updated_at),
+                rows
+            )
+        db.session.commit()
+        return len(scores)
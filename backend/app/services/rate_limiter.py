@@ -0,0 +1,87 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets in process memory.
+
+    Each key may spend ``burst`` attempts at once, refilled at
+    ``per_minute``. Only the ``max_keys`` most recently used keys are kept;
+    an evicted key starts again with a full bucket.
+    """
+
+    def __init__(self, burst, per_minute, max_keys=100000):
+        self.burst = burst
+        self.rate = per_minute / 60.0
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key):
+        """Take one token. Returns 0 when allowed, else the seconds until a token is available."""
+        return self._take(key, 1)
+
+    def peek(self, key):
+        """Like ``consume`` without taking the token."""
+        return self._take(key, 0)
+
+    def _take(self, key, cost):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        if allowed:
+            return 0
+        return math.ceil((1 - tokens) / self.rate) if self.rate > 0 else 60
+
+
+class LoginThrottle:
+    """Rejects login attempts over the per-IP or per-email budget before any hashing.
+
+    Every attempt counts against the client IP, which is only the real client
+    behind a reverse proxy when TRUSTED_PROXY_COUNT is set. Only failed
+    attempts count against the email, so logging in normally never uses up
+    an account's budget. Limits are per process, so with several workers a
+    client gets up to that many times the configured budget.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.by_ip = None
+        self.by_email = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('LOGIN_RATE_LIMIT', True)
+        self.by_ip = TokenBucketLimiter(app.config.get('LOGIN_IP_BURST', 20),
+                                        app.config.get('LOGIN_IP_PER_MINUTE', 10))
+        self.by_email = TokenBucketLimiter(app.config.get('LOGIN_EMAIL_BURST', 5),
+                                           app.config.get('LOGIN_EMAIL_PER_MINUTE', 2))
+        app.extensions['login_throttle'] = self
+
+    def check(self, ip, email):
+        """Count an attempt. Returns 0 when allowed, else the seconds to wait before retrying."""
+        if not self.enabled:
+            return 0
+        return self.by_ip.consume(ip) or self.by_email.peek(_email_key(email))
+
+    def failed(self, email):
+        """Charge a failed attempt to the email's budget."""
+        if self.enabled:
+            self.by_email.consume(_email_key(email))
+
+
+def _email_key(email):
+    return email.strip().lower()
+
+
+login_throttle = LoginThrottle()
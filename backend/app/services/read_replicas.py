@@ -0,0 +1,147 @@
+import math
+import random
+from functools import wraps
+
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from sqlalchemy import create_engine, event
+from sqlalchemy.sql.dml import UpdateBase
+
+RECENT_WRITE_COOKIE = 'recent_write'
+RECENT_WRITE_HEADER = 'X-Recent-Write'
+
+
+class RoutingSession(Session):
+    """``db.session`` class that lets ``read_replicas`` pick the engine of reads."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            replica = read_replicas.engine_for(self, clause)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReadReplicaRouter:
+    """Sends the reads of ``@read_replicas.reads`` views to a read-only replica.
+
+    Replicas are configured with SQLALCHEMY_REPLICA_URIS; without any, every
+    query goes to the primary as before. Inside a marked view, SELECTs run
+    on a replica picked at random for the request, while flushes, INSERT,
+    UPDATE and DELETE always go to the primary.
+
+    Replicas lag behind the primary. So that clients see their own writes,
+    every successful request that committed a write sets a short-lived
+    ``recent_write`` cookie (REPLICA_READ_YOUR_WRITES_SECONDS), also sent as
+    an ``X-Recent-Write`` header for clients without cookies to echo back.
+    The marker is signed with SECRET_KEY and expires with the window, so
+    clients cannot forge one to bypass the replicas and the response cache.
+    While it is valid, that client's reads use the primary and skip the
+    response cache.
+    """
+
+    def __init__(self, app=None):
+        self.engines = []
+        self.sticky_seconds = 10.0
+        self._serializer = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from app.config.config import engine_options
+        from app.services.sql_utils import apply_sqlite_pragmas
+
+        self.sticky_seconds = app.config.get('REPLICA_READ_YOUR_WRITES_SECONDS', 10.0)
+        self.engines = []
+        for uri in app.config.get('SQLALCHEMY_REPLICA_URIS') or ():
+            engine = create_engine(uri, **engine_options(app.config, uri))
+            apply_sqlite_pragmas(engine, app.config)
+            self.engines.append(engine)
+
+        self._serializer = URLSafeTimedSerializer(app.config['SECRET_KEY'], salt='recent-write')
+        if self.engines and not event.contains(RoutingSession, 'after_commit', _committed):
+            event.listen(RoutingSession, 'after_flush', _pending_write)
+            event.listen(RoutingSession, 'do_orm_execute', _pending_dml)
+            event.listen(RoutingSession, 'after_commit', _committed)
+            event.listen(RoutingSession, 'after_rollback', _rolled_back)
+        if self.engines:
+            app.after_request(self._mark_writes)
+        app.extensions['read_replicas'] = self
+
+    @property
+    def enabled(self):
+        return bool(self.engines)
+
+    def reads(self, view):
+        """Decorate a GET view whose queries may be served by a replica."""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not self.enabled or self.recently_wrote():
+                return view(*args, **kwargs)
+            g._read_replica = random.choice(self.engines)
+            try:
+                return view(*args, **kwargs)
+            finally:
+                g.pop('_read_replica', None)
+        return wrapper
+
+    def recently_wrote(self):
+        """True when this client wrote within the read-your-writes window."""
+        if not self.enabled or not has_request_context():
+            return False
+        marker = request.cookies.get(RECENT_WRITE_COOKIE) or request.headers.get(RECENT_WRITE_HEADER)
+        if not marker:
+            return False
+        try:
+            self._serializer.loads(marker, max_age=self.sticky_seconds)
+        except BadSignature:
+            # Forged, tampered with or expired
+            return False
+        return True
+
+    def engine_for(self, session, clause=None):
+        """The replica engine for this statement, or None for the primary."""
+        replica = g.get('_read_replica') if has_request_context() else None
+        if replica is None or isinstance(clause, UpdateBase):
+            return None
+        # Anything pending a flush is a write and belongs on the primary
+        if session._flushing or session.new or session.dirty or session.deleted:
+            return None
+        return replica
+
+    def _mark_writes(self, response):
+        if g.pop('_committed_write', False) and response.status_code < 400:
+            marker = self._serializer.dumps(1)
+            response.set_cookie(RECENT_WRITE_COOKIE, marker, max_age=math.ceil(self.sticky_seconds),
+                                httponly=True, samesite='Lax')
+            response.headers[RECENT_WRITE_HEADER] = marker
+        return response
+
+    def dispose(self):
+        for engine in self.engines:
+            engine.dispose()
+
+
+def _pending_write(session, flush_context=None):
+    if has_request_context():
+        g._pending_write = True
+
+
+def _pending_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _pending_write(orm_execute_state.session)
+
+
+def _committed(session):
+    # Only requests that committed a write (not e.g. a login) send clients to the primary
+    if has_request_context() and g.pop('_pending_write', False):
+        g._committed_write = True
+
+
+def _rolled_back(session):
+    if has_request_context():
+        g.pop('_pending_write', None)
+
+
+read_replicas = ReadReplicaRouter()
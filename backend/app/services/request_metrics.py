@@ -0,0 +1,201 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from app.services.http_client import LATENCY_BUCKETS, LatencyStats
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the SQL statements-per-request histogram
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r'\((?:\s*(?:\?|%\(\w+\)s|%s|:\w+)\s*,)+\s*(?:\?|%\(\w+\)s|%s|:\w+)\s*\)')
+_SPACES = re.compile(r'\s+')
+
+
+def _current():
+    return g.get('_request_metrics') if has_request_context() else None
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the current request's ``<name>_seconds``, when measured."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        current = _current()
+        if current is not None:
+            current[f'{name}_seconds'] += time.perf_counter() - start
+
+
+def statement_shape(statement):
+    """The statement with literals and expanded IN lists folded, to spot repeats."""
+    shape = _LITERALS.sub('?', statement)
+    shape = _IN_LISTS.sub('(?)', shape)
+    return _SPACES.sub(' ', shape).strip()
+
+
+class RequestMetrics:
+    """Opt-in per-request timing of wall time, SQL statements and moderation calls.
+
+    Every request gets a ``Server-Timing`` header and is folded into
+    per-endpoint histograms served in Prometheus text format on
+    ``/metrics``. Statement shapes repeated more than ``n_plus_one_threshold``
+    times in one request are logged as likely N+1 queries, and requests
+    slower than ``slow_request_ms`` are logged with their slowest statement.
+    Histograms are kept per process.
+    """
+
+    def __init__(self, n_plus_one_threshold=5, slow_request_ms=500):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slow_request_ms = slow_request_ms
+        self.durations = LatencyStats()
+        self.db_durations = LatencyStats()
+        self.moderation_durations = LatencyStats()
+        self.query_counts = LatencyStats(buckets=QUERY_COUNT_BUCKETS)
+        self.n_plus_one = Counter()
+        self._lock = threading.Lock()
+
+    def attach(self, app, engines):
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule(app.config.get('REQUEST_METRICS_PATH', '/metrics'), 'metrics', self.metrics_view)
+
+    def _before_request(self):
+        g._request_metrics = {
+            'start': time.perf_counter(),
+            'queries': 0,
+            'db_seconds': 0.0,
+            'moderation_seconds': 0.0,
+            'slowest': (0.0, None),
+            'shapes': Counter(),
+        }
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if _current() is not None:
+            conn.info.setdefault('_request_metrics_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        current = _current()
+        starts = conn.info.get('_request_metrics_start')
+        if current is None or not starts:
+            return
+        seconds = time.perf_counter() - starts.pop()
+        current['queries'] += 1
+        current['db_seconds'] += seconds
+        current['shapes'][statement_shape(statement)] += 1
+        if seconds > current['slowest'][0]:
+            current['slowest'] = (seconds, statement)
+
+    def _after_request(self, response):
+        current = g.pop('_request_metrics', None)
+        if current is None or request.endpoint == 'metrics':
+            return response
+
+        seconds = time.perf_counter() - current['start']
+        endpoint = request.endpoint or 'unmatched'
+        self.durations.record(endpoint, seconds, ok=response.status_code < 500)
+        self.db_durations.record(endpoint, current['db_seconds'])
+        self.query_counts.record(endpoint, current['queries'])
+        if current['moderation_seconds']:
+            self.moderation_durations.record(endpoint, current['moderation_seconds'])
+
+        slowest_seconds, slowest_statement = current['slowest']
+        response.headers['Server-Timing'] = ', '.join([
+            f'app;dur={seconds * 1000:.2f}',
+            f'db;dur={current["db_seconds"] * 1000:.2f};desc="{current["queries"]} queries"',
+            f'db-slowest;dur={slowest_seconds * 1000:.2f}',
+            f'moderation;dur={current["moderation_seconds"] * 1000:.2f}',
+        ])
+
+        for shape, count in current['shapes'].items():
+            if count > self.n_plus_one_threshold:
+                with self._lock:
+                    self.n_plus_one[endpoint] += 1
+                logger.warning('Possible N+1 in %s: statement ran %d times: %s', endpoint, count, shape)
+        if seconds * 1000 >= self.slow_request_ms:
+            logger.warning('Slow request %s %s: %.0f ms, %d queries (%.0f ms), slowest %.0f ms: %s',
+                           request.method, request.path, seconds * 1000, current['queries'],
+                           current['db_seconds'] * 1000, slowest_seconds * 1000, slowest_statement)
+        return response
+
+    def metrics_view(self):
+        lines = []
+        for name, help_text, stats in (
+            ('http_request_duration_seconds', 'Request wall time per endpoint.', self.durations),
+            ('db_request_duration_seconds', 'Time spent in SQL statements per request.', self.db_durations),
+            ('db_statements_per_request', 'SQL statements issued per request.', self.query_counts),
+            ('moderation_request_duration_seconds', 'Time a request waited on inline moderation.',
+             self.moderation_durations),
+        ):
+            _histogram(lines, name, help_text, stats.snapshot(), stats.buckets, 'endpoint',
+                       with_errors='http_request_server_errors_total' if stats is self.durations else None)
+
+        lines += ['# HELP db_n_plus_one_requests_total Requests that repeated one statement shape too often.',
+                  '# TYPE db_n_plus_one_requests_total counter']
+        with self._lock:
+            n_plus_one = dict(self.n_plus_one)
+        lines += [f'db_n_plus_one_requests_total{{endpoint="{endpoint}"}} {count}'
+                  for endpoint, count in sorted(n_plus_one.items())]
+
+        queue = current_app.extensions.get('moderation_queue')
+        if queue is not None and queue.service is not None:
+            moderation = queue.service.metrics()
+            if moderation['calls']:
+                _histogram(lines, 'moderation_backend_duration_seconds', 'Moderation backend HTTP calls.',
+                           moderation['calls'], LATENCY_BUCKETS, 'operation',
+                           with_errors='moderation_backend_errors_total')
+            if moderation['cache']:
+                lines += ['# HELP moderation_cache_events_total Moderation cache lookups by outcome.',
+                          '# TYPE moderation_cache_events_total counter']
+                lines += [f'moderation_cache_events_total{{outcome="{key}"}} {moderation["cache"][key]}'
+                          for key in ('memory_hits', 'db_hits', 'misses')]
+
+        response_cache = current_app.extensions.get('response_cache')
+        if response_cache is not None:
+            lines += ['# HELP response_cache_events_total Response cache lookups by outcome.',
+                      '# TYPE response_cache_events_total counter']
+            lines += [f'response_cache_events_total{{outcome="{key}"}} {value}'
+                      for key, value in response_cache.counters.items()]
+
+        return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
+
+def _histogram(lines, name, help_text, snapshot, buckets, label, with_errors=None):
+    """Append a Prometheus histogram built from a ``LatencyStats.snapshot()``."""
+    lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+    for key, values in sorted(snapshot.items()):
+        for bound, count in zip(buckets, values['buckets']):
+            lines.append(f'{name}_bucket{{{label}="{key}",le="{bound}"}} {count}')
+        lines.append(f'{name}_bucket{{{label}="{key}",le="+Inf"}} {values["count"]}')
+        lines.append(f'{name}_sum{{{label}="{key}"}} {values["total_seconds"]:.6f}')
+        lines.append(f'{name}_count{{{label}="{key}"}} {values["count"]}')
+    if with_errors:
+        lines += [f'# TYPE {with_errors} counter']
+        lines += [f'{with_errors}{{{label}="{key}"}} {values["errors"]}' for key, values in sorted(snapshot.items())]
+
+
+def init_request_metrics(app, db):
+    if not app.config.get('REQUEST_METRICS'):
+        return None
+
+    metrics = RequestMetrics(
+        n_plus_one_threshold=app.config.get('REQUEST_METRICS_N_PLUS_ONE', 5),
+        slow_request_ms=app.config.get('REQUEST_METRICS_SLOW_MS', 500)
+    )
+    replicas = app.extensions.get('read_replicas')
+    with app.app_context():
+        metrics.attach(app, [db.engine, *(replicas.engines if replicas else ())])
+    app.extensions['request_metrics'] = metrics
+    return metrics
@@ -0,0 +1,227 @@
+import hashlib
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+from app.services.read_replicas import read_replicas
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCacheBackend:
+    """In-process LRU of cached responses plus a table of tag versions.
+
+    Tag versions live outside the LRU so a busy cache can never evict one
+    and bring back entries that were already invalidated.
+    """
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_versions(self, tags):
+        now = time.monotonic()
+        with self._lock:
+            versions = []
+            for tag in tags:
+                version = self._versions.get(tag)
+                versions.append(version[1] if version and version[0] > now else 0)
+            return versions
+
+    def bump(self, tags, ttl):
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = (expires_at, next(self._counter))
+            # Drop versions that outlived every entry they could refer to
+            if len(self._versions) > self.max_entries:
+                now = time.monotonic()
+                self._versions = {tag: v for tag, v in self._versions.items() if v[0] > now}
+
+
+class RedisCacheBackend:
+    """Stores responses and tag versions in Redis, shared by every worker.
+
+    ``client`` is anything with the redis-py ``get``/``set``/``mget``/
+    ``pipeline`` interface, such as the dict-backed fake in the tests.
+    """
+
+    def __init__(self, client, prefix='factcheck:'):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('RESPONSE_CACHE_BACKEND=redis needs the redis package installed')
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key):
+        value = self.client.get(f'{self.prefix}response:{key}')
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.set(f'{self.prefix}response:{key}', json.dumps(value), ex=max(1, int(ttl)))
+
+    def delete(self, key):
+        self.client.delete(f'{self.prefix}response:{key}')
+
+    def get_versions(self, tags):
+        values = self.client.mget([f'{self.prefix}tag:{tag}' for tag in tags])
+        return [int(value) if value is not None else 0 for value in values]
+
+    def bump(self, tags, ttl):
+        pipe = self.client.pipeline()
+        for tag in tags:
+            pipe.incr(f'{self.prefix}tag:{tag}')
+            pipe.expire(f'{self.prefix}tag:{tag}', max(1, int(ttl)))
+        pipe.execute()
+
+
+class ResponseCache:
+    """Caches GET responses, invalidated by tag on writes, with ETag revalidation.
+
+    A cached view declares tags such as ``'claims'`` or ``'claim:{claim_id}'``
+    (formatted with the view arguments). The cache key covers the path, the
+    sorted query args and the current version of every tag, so
+    ``invalidate(tag)`` only has to bump a version: readers move on to a new
+    key and old entries age out. Invalidate after the write commits; a
+    response rendered from older data is then stored under an old version no
+    reader looks up. Every entry also expires after ``ttl`` seconds, which
+    bounds staleness for writes that bypass ``invalidate`` or, with the memory
+    backend, happen in another process.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.ttl = 30
+        self.counters = {'hits': 0, 'misses': 0, 'not_modified': 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, backend=None):
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', 30)
+        if backend is None:
+            kind = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+            if kind == 'redis':
+                backend = RedisCacheBackend.from_url(app.config['RESPONSE_CACHE_REDIS_URL'])
+            elif kind == 'memory':
+                backend = MemoryCacheBackend(app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 2048))
+        self.backend = backend
+        app.extensions['response_cache'] = self
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    def cached(self, *tags):
+        """Decorate a GET view returning JSON; only 200 responses are stored."""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                # Clients that just wrote read their own writes from the primary, uncached
+                if not self.enabled or read_replicas.recently_wrote():
+                    return self._conditional(make_response(view(*args, **kwargs)))
+
+                tag_names = [tag.format(**kwargs) for tag in tags]
+                try:
+                    key = self._key(self.backend.get_versions(tag_names))
+                    entry = self.backend.get(key)
+                except Exception:
+                    # A cache outage degrades to uncached reads
+                    logger.exception('Response cache lookup failed')
+                    return self._conditional(make_response(view(*args, **kwargs)))
+
+                if entry is not None:
+                    self.counters['hits'] += 1
+                    response = current_app.response_class(entry['body'], mimetype=entry['mimetype'])
+                    response.headers['X-Cache'] = 'HIT'
+                    return self._conditional(response, entry['etag'])
+
+                self.counters['misses'] += 1
+                response = make_response(view(*args, **kwargs))
+                response.headers['X-Cache'] = 'MISS'
+                if response.status_code != 200:
+                    return response
+
+                etag = _etag(response.get_data())
+                try:
+                    self.backend.set(key, {
+                        'body': response.get_data(as_text=True),
+                        'mimetype': response.mimetype,
+                        'etag': etag
+                    }, self.ttl)
+                except Exception:
+                    logger.exception('Response cache store failed')
+                return self._conditional(response, etag)
+            return wrapper
+        return decorator
+
+    def invalidate(self, *tags):
+        if not self.enabled or not tags:
+            return
+        try:
+            self.backend.bump(tags, self.ttl)
+        except Exception:
+            # Entries still expire after ttl seconds
+            logger.exception('Response cache invalidation failed')
+
+    def invalidate_claim(self, claim_id):
+        """Anything shown in claim feeds or on one claim's pages changed."""
+        self.invalidate('claims', f'claim:{claim_id}')
+
+    def _key(self, versions):
+        args = sorted(request.args.items(multi=True))
+        raw = json.dumps([request.path, args, versions])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _conditional(self, response, etag=None):
+        if response.status_code != 200:
+            return response
+        response.set_etag(etag or _etag(response.get_data()))
+        # Clients may keep the body but must revalidate, which is a cheap 304
+        response.cache_control.no_cache = True
+        not_modified = response.make_conditional(request)
+        if not_modified.status_code == 304:
+            self.counters['not_modified'] += 1
+        return not_modified
+
+
+def _etag(body):
+    return hashlib.sha1(body).hexdigest()
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,198 @@
+import html
+import re
+
+from sqlalchemy import event, text
+
+from app.models.claim import Claim
+from app.services.claim_service import ClaimService, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, _decode_cursor, _encode_cursor
+from app import db
+
+MAX_QUERY_TERMS = 16
+
+# Highlight markers are private-use characters so the text can be HTML-escaped
+# after highlighting and the markers turned into <mark> tags afterwards
+_OPEN, _CLOSE = '\ue000', '\ue001'
+
+# Inverted index per dialect: an FTS5 table on SQLite (rowid = claim id) and a
+# weighted tsvector with a GIN index on PostgreSQL
+SEARCH_INDEX_DDL = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS claims_fts USING fts5("
+        "title, description, evidence, tokenize = 'porter unicode61 remove_diacritics 2')",
+    ],
+    'postgresql': [
+        "CREATE TABLE IF NOT EXISTS claim_search ("
+        "claim_id INTEGER PRIMARY KEY REFERENCES claims (id) ON DELETE CASCADE, "
+        "document TSVECTOR NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_claim_search_document ON claim_search USING GIN (document)",
+    ],
+}
+
+_EVIDENCE_TEXT = {
+    'sqlite': "(SELECT group_concat(e.content, ' ') FROM evidence e WHERE e.claim_id = c.id)",
+    'postgresql': "(SELECT string_agg(e.content, ' ') FROM evidence e WHERE e.claim_id = c.id)",
+}
+
+_INDEX_SQL = {
+    'sqlite': (
+        "INSERT INTO claims_fts (rowid, title, description, evidence) "
+        "SELECT c.id, c.title, c.description, " + _EVIDENCE_TEXT['sqlite'] + " FROM claims c"
+    ),
+    'postgresql': (
+        "INSERT INTO claim_search (claim_id, document) "
+        "SELECT c.id, "
+        "setweight(to_tsvector('english', coalesce(c.title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(c.description, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(" + _EVIDENCE_TEXT['postgresql'] + ", '')), 'C') "
+        "FROM claims c"
+    ),
+}
+
+_DELETE_SQL = {
+    'sqlite': "DELETE FROM claims_fts",
+    'postgresql': "DELETE FROM claim_search",
+}
+
+# Title matches weigh most, then the description, then evidence. Scores are
+# "higher is better" on both dialects (bm25 is negated).
+_SEARCH_SQL = {
+    'sqlite': (
+        "SELECT claim_id, score, title, snippet FROM ("
+        "SELECT rowid AS claim_id, -bm25(claims_fts, 10.0, 4.0, 1.0) AS score, "
+        "highlight(claims_fts, 0, :open, :close) AS title, "
+        "snippet(claims_fts, -1, :open, :close, '...', 24) AS snippet "
+        "FROM claims_fts WHERE claims_fts MATCH :query) "
+        "WHERE {seek} ORDER BY score DESC, claim_id DESC LIMIT :limit"
+    ),
+    'postgresql': (
+        "SELECT page.claim_id, page.score, "
+        "ts_headline('english', c.title, page.query, :title_options) AS title, "
+        "ts_headline('english', c.description, page.query, :snippet_options) AS snippet "
+        "FROM (SELECT s.claim_id, ts_rank_cd(s.document, q.query) AS score, q.query "
+        "FROM claim_search s, to_tsquery('english', :query) AS q (query) "
+        "WHERE s.document @@ q.query) AS page "
+        "JOIN claims c ON c.id = page.claim_id "
+        "WHERE {seek} ORDER BY page.score DESC, page.claim_id DESC LIMIT :limit"
+    ),
+}
+
+_SEEK_SQL = {
+    'sqlite': "(score, claim_id) < (:score, :claim_id)",
+    'postgresql': "(page.score, page.claim_id) < (:score, :claim_id)",
+}
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _create_search_index(target, connection, **kw):
+    # db.create_all() setups get the index too; migrations create it themselves
+    for statement in SEARCH_INDEX_DDL.get(connection.dialect.name, []):
+        connection.execute(text(statement))
+
+
+def _terms(query):
+    return re.findall(r'\w+', query.lower())[:MAX_QUERY_TERMS]
+
+
+def _match_expression(dialect, terms):
+    """Every term must match; the last one is a prefix so partial input finds results."""
+    if dialect == 'sqlite':
+        return ' '.join(f'"{term}"' for term in terms) + '*'
+    return ' & '.join(terms) + ':*'
+
+
+def _highlight(fragment):
+    if fragment is None:
+        return None
+    return html.escape(fragment).replace(_OPEN, '<mark>').replace(_CLOSE, '</mark>')
+
+
+class SearchService:
+    @staticmethod
+    def dialect():
+        name = db.session.get_bind().dialect.name
+        return name if name in SEARCH_INDEX_DDL else None
+
+    @staticmethod
+    def index_claim(claim_id):
+        """(Re)index one claim with its evidence, in the caller's transaction."""
+        dialect = SearchService.dialect()
+        if not dialect:
+            return
+        db.session.flush()
+        SearchService.remove_claim(claim_id)
+        db.session.execute(text(_INDEX_SQL[dialect] + ' WHERE c.id = :claim_id'), {'claim_id': claim_id})
+
+    @staticmethod
+    def remove_claim(claim_id):
+        dialect = SearchService.dialect()
+        if not dialect:
+            return
+        column = 'rowid' if dialect == 'sqlite' else 'claim_id'
+        db.session.execute(text(f'{_DELETE_SQL[dialect]} WHERE {column} = :claim_id'), {'claim_id': claim_id})
+
+    @staticmethod
+    def rebuild():
+        """Reindex every claim, e.g. after a bulk import. Returns the number of claims indexed."""
+        dialect = SearchService.dialect()
+        if not dialect:
+            raise NotImplementedError('Search is not supported on this database')
+        db.session.execute(text(_DELETE_SQL[dialect]))
+        result = db.session.execute(text(_INDEX_SQL[dialect]))
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def search(query, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """Rank claims matching every term of ``query`` in title, description or evidence.
+
+        Returns ``(results, next_cursor)``; each result is a serialized claim
+        with a ``search`` entry holding the score and HTML-escaped highlights.
+        Raises ValueError for an empty query or a malformed cursor and
+        NotImplementedError on databases without a full-text index.
+        """
+        dialect = SearchService.dialect()
+        if not dialect:
+            raise NotImplementedError('Search is not supported on this database')
+
+        terms = _terms(query or '')
+        if not terms:
+            raise ValueError('Search query is required')
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        params = {
+            'query': _match_expression(dialect, terms),
+            'open': _OPEN,
+            'close': _CLOSE,
+            'title_options': f'HighlightAll=true, StartSel={_OPEN}, StopSel={_CLOSE}',
+            'snippet_options': f'MaxWords=35, MinWords=15, StartSel={_OPEN}, StopSel={_CLOSE}',
+            'limit': limit + 1,
+        }
+        seek = 'TRUE'
+        if cursor:
+            params['score'], params['claim_id'] = _decode_cursor(cursor, 'search')
+            if not isinstance(params['score'], (int, float)):
+                raise ValueError('Invalid cursor')
+            seek = _SEEK_SQL[dialect]
+
+        hits = db.session.execute(text(_SEARCH_SQL[dialect].format(seek=seek)), params).all()
+
+        next_cursor = None
+        if len(hits) > limit:
+            hits = hits[:limit]
+            next_cursor = _encode_cursor('search', hits[-1].score, hits[-1].claim_id)
+
+        rows = ClaimService.with_summary(Claim.query.filter(Claim.id.in_([hit.claim_id for hit in hits]))).all()
+        claims = {row[0].id: ClaimService.serialize(row) for row in rows}
+
+        results = []
+        for hit in hits:
+            if hit.claim_id not in claims:
+                continue
+            result = claims[hit.claim_id]
+            result['search'] = {
+                'score': hit.score,
+                'title': _highlight(hit.title),
+                'snippet': _highlight(hit.snippet)
+            }
+            results.append(result)
+        return results, next_cursor
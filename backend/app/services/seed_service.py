@@ -0,0 +1,285 @@
+import io
+import json
+import random
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import func, select, text
+from werkzeug.security import generate_password_hash
+
+from app.models.claim import Claim
+from app.models.comment import Comment, path_segment
+from app.models.evidence import Evidence
+from app.models.user import User
+from app.models.vote import Vote
+from app.services.claim_service import (
+    ClaimService, DEBUNKED_THRESHOLD, EVIDENCE_DISCUSSION_WEIGHT, VERIFIED_THRESHOLD
+)
+from app.services.comment_service import CommentService
+from app.services.duplicate_service import DuplicateService
+from app.services.ranking_service import RankingService
+from app.services.search_service import SearchService
+from app import db
+
+SEED_PASSWORD = 'password'
+CATEGORIES = ['general', 'politics', 'health', 'science', 'news', 'technology']
+WORDS = (
+    'vaccine study climate water government report city health energy tax school '
+    'election virus food research data study claim market police river coffee '
+    'scientists doctors officials billion million percent new old secret hidden '
+    'causes prevents increases reduces bans allows proves shows says reveals'
+).split()
+
+# Tables that can be imported, parents before children
+IMPORT_TABLES = {
+    'users': User.__table__,
+    'claims': Claim.__table__,
+    'votes': Vote.__table__,
+    'evidence': Evidence.__table__,
+    'comments': Comment.__table__,
+}
+
+
+def _copy_value(value):
+    """Encode one value for PostgreSQL COPY text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def bulk_insert(table, rows):
+    """Insert many rows in the caller's transaction: COPY on PostgreSQL, executemany elsewhere."""
+    if not rows:
+        return
+    connection = db.session.connection()
+    if connection.dialect.name != 'postgresql':
+        connection.execute(table.insert(), rows)
+        return
+
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(_copy_value(row[column]) for column in columns) + '\n')
+    buffer.seek(0)
+
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+
+
+def power_law_counts(total, size, exponent, rng, cap=None):
+    """Split ``total`` over ``size`` items with Zipf-like weights, in random item order."""
+    if size <= 0:
+        return []
+    weights = [1 / (rank + 1) ** exponent for rank in range(size)]
+    scale = total / sum(weights)
+    counts = [int(weight * scale + rng.random()) for weight in weights]
+    if cap is not None:
+        counts = [min(count, cap) for count in counts]
+    rng.shuffle(counts)
+    return counts
+
+
+def _sentence(rng, low, high):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize()
+
+
+class SeedService:
+    @staticmethod
+    def next_ids():
+        return {
+            name: (db.session.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+            for name, table in IMPORT_TABLES.items()
+        }
+
+    @staticmethod
+    def generate(users=1000, claims=10000, votes=100000, evidence=20000, comments=50000,
+                 vote_exponent=1.1, comment_exponent=1.0, reply_probability=0.6, max_depth=8,
+                 days=90, batch_size=2000, seed=None, log=print):
+        """Insert a synthetic dataset and return the number of rows written per table.
+
+        Votes, evidence and comments are spread over claims with power-law
+        weights (a few claims get most of the activity). Ids are assigned
+        up front so comment paths and claim counters are computed while
+        generating, and every table is written with bulk inserts, one claim
+        batch per transaction.
+        """
+        rng = random.Random(seed)
+        ids = SeedService.next_ids()
+        now = datetime.utcnow()
+        start = now - timedelta(days=days)
+        written = dict.fromkeys(IMPORT_TABLES, 0)
+
+        # One hash for every seeded account; hashing per user would dominate the run
+        password_hash = generate_password_hash(SEED_PASSWORD)
+        user_ids = list(range(ids['users'], ids['users'] + users))
+        for offset in range(0, users, batch_size):
+            bulk_insert(User.__table__, [
+                {'id': user_id, 'username': f'user{user_id}', 'email': f'user{user_id}@example.com',
+                 'password_hash': password_hash, 'reputation': 0, 'is_active': True,
+                 'created_at': start, 'updated_at': start}
+                for user_id in user_ids[offset:offset + batch_size]
+            ])
+            written['users'] += len(user_ids[offset:offset + batch_size])
+        db.session.commit()
+        if not user_ids:
+            user_ids = [row[0] for row in db.session.execute(select(User.id).limit(10000))]
+        if not user_ids:
+            raise ValueError('Seeding claims needs at least one user')
+
+        vote_counts = power_law_counts(votes, claims, vote_exponent, rng, cap=len(user_ids))
+        evidence_counts = power_law_counts(evidence, claims, vote_exponent, rng)
+        comment_counts = power_law_counts(comments, claims, comment_exponent, rng)
+
+        claim_id, evidence_id, comment_id = ids['claims'], ids['evidence'], ids['comments']
+        for offset in range(0, claims, batch_size):
+            claim_rows, vote_rows, evidence_rows, comment_rows = [], [], [], []
+
+            for index in range(offset, min(claims, offset + batch_size)):
+                created_at = start + timedelta(seconds=rng.uniform(0, days * 86400))
+                age = (now - created_at).total_seconds()
+                upvote_share = rng.betavariate(2, 2)
+
+                upvotes = downvotes = 0
+                for voter in rng.sample(user_ids, vote_counts[index]):
+                    vote_type = 'upvote' if rng.random() < upvote_share else 'downvote'
+                    upvotes += vote_type == 'upvote'
+                    downvotes += vote_type == 'downvote'
+                    voted_at = created_at + timedelta(seconds=age * rng.random() ** 2)
+                    vote_rows.append({
+                        'claim_id': claim_id, 'user_id': voter, 'vote_type': vote_type,
+                        'created_at': voted_at, 'updated_at': voted_at
+                    })
+
+                for _ in range(evidence_counts[index]):
+                    evidence_rows.append({
+                        'id': evidence_id, 'claim_id': claim_id, 'user_id': rng.choice(user_ids),
+                        'content': _sentence(rng, 8, 30), 'type': rng.choice(('supporting', 'refuting')),
+                        'source_url': f'https://example.com/source/{evidence_id}',
+                        'created_at': created_at + timedelta(seconds=age * rng.random())
+                    })
+                    evidence_id += 1
+
+                # Replies attach to a random earlier comment of the thread
+                thread = []
+                for _ in range(comment_counts[index]):
+                    parent = rng.choice(thread) if thread and rng.random() < reply_probability else None
+                    if parent is not None and parent['depth'] >= max_depth:
+                        parent = None
+                    row = {
+                        'id': comment_id, 'claim_id': claim_id, 'user_id': rng.choice(user_ids),
+                        'content': _sentence(rng, 4, 40),
+                        'parent_comment_id': parent['id'] if parent else None,
+                        'path': (parent['path'] if parent else '') + path_segment(comment_id),
+                        'depth': parent['depth'] + 1 if parent else 0,
+                        'created_at': created_at + timedelta(seconds=age * len(thread) / comment_counts[index])
+                    }
+                    thread.append(row)
+                    comment_id += 1
+                comment_rows.extend(thread)
+
+                score = upvotes - downvotes
+                claim_rows.append({
+                    'id': claim_id, 'user_id': rng.choice(user_ids),
+                    'title': _sentence(rng, 4, 12)[:200], 'description': _sentence(rng, 15, 60),
+                    'category': rng.choice(CATEGORIES), 'credibility_score': score,
+                    'status': ('verified' if score >= VERIFIED_THRESHOLD
+                               else 'debunked' if score <= DEBUNKED_THRESHOLD else 'pending'),
+                    'moderation_status': 'skipped', 'ai_moderation_score': None,
+                    'upvote_count': upvotes, 'downvote_count': downvotes,
+                    'evidence_count': evidence_counts[index], 'comment_count': comment_counts[index],
+                    'discussion_score': comment_counts[index] + EVIDENCE_DISCUSSION_WEIGHT * evidence_counts[index],
+                    'trending_score': 0.0, 'created_at': created_at, 'updated_at': created_at,
+                    'changed_at': created_at
+                })
+                claim_id += 1
+
+            bulk_insert(Claim.__table__, claim_rows)
+            bulk_insert(Vote.__table__, vote_rows)
+            bulk_insert(Evidence.__table__, evidence_rows)
+            bulk_insert(Comment.__table__, comment_rows)
+            db.session.commit()
+
+            written['claims'] += len(claim_rows)
+            written['votes'] += len(vote_rows)
+            written['evidence'] += len(evidence_rows)
+            written['comments'] += len(comment_rows)
+            log(f"  {written['claims']}/{claims} claims, {written['votes']} votes, "
+                f"{written['evidence']} evidence, {written['comments']} comments")
+
+        return written
+
+    @staticmethod
+    def import_ndjson(table_name, lines, batch_size=5000):
+        """Bulk insert NDJSON rows (e.g. from ``flask export``) into a table. Returns the row count.
+
+        Unknown keys are ignored and ISO timestamps are parsed. Run
+        ``finalize(recount=True)`` afterwards to bring counters and derived
+        indexes in line with the imported rows.
+        """
+        table = IMPORT_TABLES[table_name]
+        datetime_columns = {
+            column.name for column in table.columns
+            if isinstance(column.type, db.DateTime)
+        }
+
+        imported = 0
+        batch = []
+        for line in lines:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            row = {column.name: record.get(column.name) for column in table.columns}
+            for name in datetime_columns:
+                if row[name]:
+                    row[name] = datetime.fromisoformat(row[name])
+            # Dumps made before claims.changed_at and votes.updated_at existed
+            for name in ('changed_at', 'updated_at'):
+                if name in row and row[name] is None:
+                    row[name] = row.get('updated_at') or row.get('created_at') or datetime.utcnow()
+            batch.append(row)
+
+            if len(batch) >= batch_size:
+                bulk_insert(table, batch)
+                db.session.commit()
+                imported += len(batch)
+                batch = []
+
+        bulk_insert(table, batch)
+        db.session.commit()
+        return imported + len(batch)
+
+    @staticmethod
+    def finalize(recount=False, signatures=True, log=print):
+        """Bring sequences, counters and derived indexes in line after bulk inserts."""
+        if db.session.get_bind().dialect.name == 'postgresql':
+            # Rows were inserted with explicit ids, move the sequences past them
+            for table in IMPORT_TABLES.values():
+                db.session.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                    f"coalesce(max(id), 0) + 1, false) FROM {table.name}"
+                ))
+            db.session.commit()
+
+        if recount:
+            log('Recounting claim counters and comment paths')
+            ClaimService.rebuild_counters()
+            CommentService.rebuild_paths()
+
+        log('Rebuilding the search index')
+        SearchService.rebuild()
+        log('Refreshing trending scores')
+        RankingService.refresh_trending(
+            half_life_hours=current_app.config['TRENDING_HALF_LIFE_HOURS'],
+            window_hours=current_app.config['TRENDING_WINDOW_HOURS']
+        )
+        if signatures:
+            log('Computing near-duplicate signatures')
+            DuplicateService.rebuild()
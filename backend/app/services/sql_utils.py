@@ -0,0 +1,58 @@
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+
+# PRAGMA applied on connect and the config key holding its value
+SQLITE_PRAGMAS = (
+    ('journal_mode', 'SQLITE_JOURNAL_MODE'),
+    ('synchronous', 'SQLITE_SYNCHRONOUS'),
+    ('busy_timeout', 'SQLITE_BUSY_TIMEOUT_MS'),
+    ('mmap_size', 'SQLITE_MMAP_SIZE'),
+)
+
+
+def dialect_insert(model, bind=None):
+    """Return an INSERT for ``model`` that supports ``on_conflict_do_*`` on the bound dialect.
+
+    Both SQLite and PostgreSQL implement ``INSERT ... ON CONFLICT``; the
+    generic ``sqlalchemy.insert`` does not expose it. Pass ``bind`` when
+    running outside an app context.
+    """
+    dialect = (bind or db.session.get_bind()).dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert(model)
+    if dialect == 'sqlite':
+        return sqlite.insert(model)
+    raise NotImplementedError(f'ON CONFLICT is not supported on {dialect}')
+
+
+def row_exists(model, row_id):
+    """True when ``model`` has a row with this id, e.g. to tell 404 from 403 after a conditional write."""
+    return db.session.execute(select(model.id).where(model.id == row_id)).first() is not None
+
+
+def init_sqlite_pragmas(app, db):
+    """Run the configured PRAGMAs on every new connection when the database is SQLite."""
+    with app.app_context():
+        return apply_sqlite_pragmas(db.engine, app.config)
+
+
+def apply_sqlite_pragmas(engine, config):
+    pragmas = [
+        (name, config[key]) for name, key in SQLITE_PRAGMAS
+        if config.get(key) not in (None, '')
+    ]
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return None
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name} = {value}')
+        finally:
+            cursor.close()
+
+    event.listen(engine, 'connect', set_pragmas)
+    return pragmas
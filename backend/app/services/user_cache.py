@@ -0,0 +1,67 @@
+from flask import jsonify
+from sqlalchemy import select
+
+from app.models.user import User
+from app.services.response_cache import MemoryCacheBackend
+from app import db
+
+
+class ActiveUserCache:
+    """Resolves JWT identities to users through a small per-process TTL cache.
+
+    Registered as the JWT ``user_lookup_loader``, so every ``jwt_required``
+    request checks that its user still exists and ``is_active``; at most
+    once per ``ttl`` seconds per user does that cost a query. Deactivating
+    a user takes effect within ``ttl`` seconds in every process, or at once
+    in the process that calls ``invalidate``. The loaded user (see
+    ``get_current_user()``) is the ``User.to_dict()`` snapshot.
+    """
+
+    def __init__(self, app=None, jwt=None):
+        self.ttl = 60
+        self.backend = MemoryCacheBackend()
+        if app is not None:
+            self.init_app(app, jwt)
+
+    def init_app(self, app, jwt):
+        self.ttl = app.config.get('USER_CACHE_TTL', 60)
+        self.backend = MemoryCacheBackend(app.config.get('USER_CACHE_MAX_ENTRIES', 10000))
+        jwt.user_lookup_loader(self._lookup)
+        jwt.user_lookup_error_loader(self._lookup_error)
+        app.extensions['user_cache'] = self
+
+    def get(self, user_id):
+        """The active user's snapshot, or None when the user is missing or inactive."""
+        entry = self.backend.get(user_id) if self.ttl > 0 else None
+        if entry is None:
+            row = db.session.execute(
+                select(User.id, User.username, User.email, User.reputation, User.is_active, User.created_at)
+                .where(User.id == user_id)
+            ).first()
+            # Missing and inactive users are cached too, so a revoked token cannot hammer the database
+            entry = {
+                'is_active': bool(row and row.is_active is not False),
+                'user': {
+                    'id': row.id,
+                    'username': row.username,
+                    'email': row.email,
+                    'reputation': row.reputation,
+                    'created_at': row.created_at.isoformat()
+                } if row else None
+            }
+            if self.ttl > 0:
+                self.backend.set(user_id, entry, self.ttl)
+        return entry['user'] if entry['is_active'] else None
+
+    def invalidate(self, user_id):
+        self.backend.delete(user_id)
+
+    def _lookup(self, jwt_header, jwt_data):
+        return self.get(jwt_data['sub'])
+
+    @staticmethod
+    def _lookup_error(jwt_header, jwt_data):
+        return jsonify({'error': 'User not found or inactive'}), 401
+
+
+user_cache = ActiveUserCache()
@@ -0,0 +1,161 @@
+from datetime import datetime
+
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+
+from app.models.claim import Claim
+from app.models.vote import Vote
+from app.services.claim_service import ClaimService
+from app.services.sql_utils import dialect_insert
+from app import db
+
+
+MAX_BATCH_SIZE = 5000
+VOTE_TYPES = ('upvote', 'downvote')
+
+# Returned by the vote upserts: an insert writes both timestamps from one value, a switch
+# moves updated_at past created_at. Compared in SQL, so no datetime round-trips the driver.
+INSERTED = (Vote.updated_at == Vote.created_at).label('inserted')
+
+
+def vote_delta(vote_type, amount):
+    return {'upvotes': amount} if vote_type == 'upvote' else {'downvotes': amount}
+
+
+class VoteService:
+    @staticmethod
+    def cast_vote(user_id, claim_id, vote_type):
+        """Insert or switch a vote and update the claim's score in one transaction.
+
+        The vote is written with a single ``INSERT ... ON CONFLICT DO UPDATE``,
+        so concurrent votes by the same user cannot race into the unique
+        constraint. Returns ``(credibility_score, status)``, or None when the
+        claim does not exist.
+        """
+        now = datetime.utcnow()
+        stmt = dialect_insert(Vote).values(
+            claim_id=claim_id,
+            user_id=user_id,
+            vote_type=vote_type,
+            created_at=now,
+            updated_at=now
+        )
+        # ON CONFLICT DO UPDATE does not apply onupdate defaults
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Vote.claim_id, Vote.user_id],
+            set_={'vote_type': stmt.excluded.vote_type, 'updated_at': stmt.excluded.updated_at},
+            where=Vote.vote_type != stmt.excluded.vote_type
+        ).returning(INSERTED)
+
+        try:
+            row = db.session.execute(stmt).first()
+        except IntegrityError:
+            # Foreign key violation: the claim does not exist
+            db.session.rollback()
+            return None
+
+        if row is None:
+            # Same vote as before, nothing changed
+            result = db.session.query(Claim.credibility_score, Claim.status).filter(Claim.id == claim_id).first()
+        elif row.inserted:
+            result = ClaimService.apply_vote_delta(claim_id, **vote_delta(vote_type, 1))
+        else:
+            # An existing vote switched sides
+            switch = 1 if vote_type == 'upvote' else -1
+            result = ClaimService.apply_vote_delta(claim_id, upvotes=switch, downvotes=-switch)
+
+        if result is None:
+            db.session.rollback()
+            return None
+
+        db.session.commit()
+        return tuple(result)
+
+    @staticmethod
+    def remove_vote(user_id, claim_id):
+        """Delete a vote and update the claim's score in one transaction.
+
+        Returns ``(credibility_score, status)``, or None when there was no vote.
+        """
+        removed = db.session.execute(
+            delete(Vote)
+            .where(Vote.claim_id == claim_id, Vote.user_id == user_id)
+            .returning(Vote.vote_type)
+            .execution_options(synchronize_session=False)
+        ).first()
+
+        if removed is None:
+            db.session.rollback()
+            return None
+
+        result = ClaimService.apply_vote_delta(claim_id, **vote_delta(removed.vote_type, -1))
+        db.session.commit()
+        return tuple(result) if result else None
+
+    @staticmethod
+    def cast_votes_batch(user_id, items):
+        """Apply a batch of ``{claim_id, vote_type}`` items for one user.
+
+        Claims are validated with one IN query, votes are written with one bulk
+        upsert, and each touched claim's score is recomputed once. As in
+        ``cast_vote``, the counter changes come from the rows the upsert
+        returns, not from an earlier read, so concurrent batches cannot drift
+        the counters. When a claim appears several times the last item wins.
+        Returns one result per item.
+        """
+        results = [None] * len(items)
+        latest = {}
+
+        for index, item in enumerate(items):
+            claim_id = item.get('claim_id') if isinstance(item, dict) else None
+            vote_type = item.get('vote_type') if isinstance(item, dict) else None
+
+            if not isinstance(claim_id, int) or isinstance(claim_id, bool) or vote_type is None:
+                results[index] = {'index': index, 'status': 400, 'error': 'Claim ID and vote type are required'}
+            elif vote_type not in VOTE_TYPES:
+                results[index] = {'index': index, 'status': 400, 'error': 'Vote type must be upvote or downvote'}
+            else:
+                latest[claim_id] = vote_type
+                results[index] = {'index': index, 'claim_id': claim_id, 'vote_type': vote_type, 'status': 200}
+
+        existing_claims = set()
+        if latest:
+            existing_claims = {
+                claim_id for (claim_id,) in
+                db.session.query(Claim.id).filter(Claim.id.in_(list(latest)))
+            }
+
+        for result in results:
+            if result['status'] == 200 and result['claim_id'] not in existing_claims:
+                result['status'] = 404
+                result['error'] = 'Claim not found'
+
+        votes = {claim_id: vote_type for claim_id, vote_type in latest.items() if claim_id in existing_claims}
+        if not votes:
+            return results
+
+        now = datetime.utcnow()
+        stmt = dialect_insert(Vote)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Vote.claim_id, Vote.user_id],
+            set_={'vote_type': stmt.excluded.vote_type, 'updated_at': stmt.excluded.updated_at},
+            where=Vote.vote_type != stmt.excluded.vote_type
+        ).returning(Vote.claim_id, Vote.vote_type, INSERTED)
+        # Unchanged votes are not returned
+        written = db.session.execute(stmt, [
+            {'claim_id': claim_id, 'user_id': user_id, 'vote_type': vote_type, 'created_at': now, 'updated_at': now}
+            for claim_id, vote_type in votes.items()
+        ]).all()
+
+        deltas = {}
+        for claim_id, vote_type, inserted in written:
+            upvote = 1 if vote_type == 'upvote' else -1
+            if inserted:
+                deltas[claim_id] = (1, 0) if upvote == 1 else (0, 1)
+            else:
+                deltas[claim_id] = (upvote, -upvote)
+
+        ClaimService.apply_vote_deltas(deltas)
+        db.session.commit()
+
+        return results
@@ -0,0 +1,341 @@
+"""Latency, throughput, query counts and allocations of the API hot paths.
+
+Generates a dataset with ``SeedService`` in a scratch SQLite database (or
+reuses one), then drives each scenario twice:
+
+* through the Flask test client, one request at a time, recording latency,
+  the number of SQL statements and the memory allocated per request
+  (``tracemalloc``, on a separate pass so it does not skew the latencies);
+* through a local threaded WSGI server over keep-alive HTTP connections
+  with ``--concurrency`` clients, recording throughput and latency.
+
+Results are written as JSON so runs on two commits can be compared:
+
+    python -m benchmarks.api --claims 10000 --output before.json
+    python -m benchmarks.api --claims 10000 --output after.json --compare before.json
+
+The response cache is off unless ``--response-cache`` is given, so reads hit
+the database. Writes change the dataset, so compare runs made with the same
+``--seed`` on a freshly generated database.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+DEFAULT_SCENARIOS = [
+    'claims_newest', 'claims_credibility', 'claims_most_discussed', 'claims_trending',
+    'claim_detail', 'evidence_list', 'vote_cast', 'claim_create', 'login',
+]
+# Not run by default: the legacy unpaginated feed returns every claim
+EXTRA_SCENARIOS = ['claims_all']
+TOKEN_USERS = 200
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def summarize(latencies):
+    ms = [1000 * value for value in latencies]
+    return {
+        'mean': round(statistics.fmean(ms), 3),
+        'p50': round(statistics.median(ms), 3),
+        'p95': round(percentile(ms, 0.95), 3),
+        'p99': round(percentile(ms, 0.99), 3),
+        'max': round(max(ms), 3),
+    }
+
+
+class Scenarios:
+    """Builds randomized requests as ``(method, path, json body, headers)``."""
+
+    def __init__(self, rng, claim_ids, user_ids, tokens, page_size):
+        self.rng = rng
+        self.page_size = page_size
+        self.claim_ids = claim_ids
+        self.user_ids = user_ids
+        self.tokens = tokens
+
+    def _auth(self):
+        return {'Authorization': f'Bearer {self.rng.choice(self.tokens)}'}
+
+    def build(self, name):
+        rng = self.rng
+        if name == 'claims_all':
+            return 'GET', '/api/claims', None, {}
+        if name.startswith('claims_'):
+            return 'GET', f"/api/claims?sort_by={name[len('claims_'):]}&limit={self.page_size}", None, {}
+        if name == 'claim_detail':
+            return 'GET', f'/api/claims/{rng.choice(self.claim_ids)}', None, {}
+        if name == 'evidence_list':
+            return 'GET', f'/api/evidence/claim/{rng.choice(self.claim_ids)}', None, {}
+        if name == 'vote_cast':
+            body = {'claim_id': rng.choice(self.claim_ids), 'vote_type': rng.choice(('upvote', 'downvote'))}
+            return 'POST', '/api/votes', body, self._auth()
+        if name == 'claim_create':
+            from app.services.seed_service import _sentence
+            body = {'title': _sentence(rng, 4, 12), 'description': _sentence(rng, 15, 60), 'category': 'general'}
+            return 'POST', '/api/claims', body, self._auth()
+        if name == 'login':
+            user_id = rng.choice(self.user_ids)
+            from app.services.seed_service import SEED_PASSWORD
+            return 'POST', '/api/auth/login', {'email': f'user{user_id}@example.com', 'password': SEED_PASSWORD}, {}
+        raise ValueError(f'Unknown scenario {name}')
+
+
+class QueryCounter:
+    """Counts the SQL statements sent through an engine, from any thread."""
+
+    def __init__(self, engine):
+        self.count = 0
+        self._lock = threading.Lock()
+        from sqlalchemy import event
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+
+    def _before_cursor_execute(self, *args):
+        with self._lock:
+            self.count += 1
+
+
+def run_client(app, scenarios, name, requests, warmup, queries):
+    client = app.test_client()
+
+    def call():
+        method, path, body, headers = scenarios.build(name)
+        return client.open(path, method=method, json=body, headers=headers)
+
+    for _ in range(warmup):
+        call()
+
+    latencies, query_counts, errors = [], [], 0
+    for _ in range(requests):
+        before = queries.count
+        start = time.perf_counter()
+        response = call()
+        latencies.append(time.perf_counter() - start)
+        query_counts.append(queries.count - before)
+        errors += response.status_code >= 400
+
+    # Allocations on a separate, shorter pass: tracemalloc slows every allocation down
+    allocated, peaks = [], []
+    tracemalloc.start()
+    for _ in range(min(requests, 50)):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        call()
+        current, peak = tracemalloc.get_traced_memory()
+        allocated.append(current - before)
+        peaks.append(peak - before)
+    tracemalloc.stop()
+
+    return {
+        'requests': requests,
+        'errors': errors,
+        'latency_ms': summarize(latencies),
+        'queries': {'mean': round(statistics.fmean(query_counts), 2), 'max': max(query_counts)},
+        'memory_kb': {
+            'retained_mean': round(statistics.fmean(allocated) / 1024, 1),
+            'peak_mean': round(statistics.fmean(peaks) / 1024, 1),
+            'peak_max': round(max(peaks) / 1024, 1),
+        },
+    }
+
+
+def start_server(app):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class KeepAliveHandler(WSGIRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_server(server, scenarios, name, requests, concurrency, queries):
+    lock = threading.Lock()
+    local = threading.local()
+
+    def call():
+        with lock:
+            method, path, body, headers = scenarios.build(name)
+        if not hasattr(local, 'conn'):
+            local.conn = http.client.HTTPConnection('127.0.0.1', server.port, timeout=60)
+        payload = json.dumps(body) if body is not None else None
+        if payload is not None:
+            headers = dict(headers, **{'Content-Type': 'application/json'})
+        start = time.perf_counter()
+        local.conn.request(method, path, body=payload, headers=headers)
+        response = local.conn.getresponse()
+        response.read()
+        return time.perf_counter() - start, response.status
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(lambda _: call(), range(min(requests, 2 * concurrency))))
+        before = queries.count
+        start = time.perf_counter()
+        results = list(pool.map(lambda _: call(), range(requests)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': sum(status >= 400 for _, status in results),
+        'throughput_rps': round(requests / elapsed, 1),
+        'latency_ms': summarize([latency for latency, _ in results]),
+        'queries': {'mean': round((queries.count - before) / requests, 2)},
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)['scenarios']
+    print(f'\nchange vs {baseline_path} (p50 / p99 latency, throughput):')
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for mode in ('client', 'server'):
+            new, old = result.get(mode), baseline[name].get(mode)
+            if not new or not old:
+                continue
+            changes = [
+                f"{key} {100 * (new['latency_ms'][key] / old['latency_ms'][key] - 1):+.0f}%"
+                for key in ('p50', 'p99') if old['latency_ms'][key]
+            ]
+            if 'throughput_rps' in new and old.get('throughput_rps'):
+                changes.append(f"rps {100 * (new['throughput_rps'] / old['throughput_rps'] - 1):+.0f}%")
+            print(f'  {name:<24} {mode:<7} ' + ', '.join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--claims', type=int, default=10000)
+    parser.add_argument('--votes', type=int, default=100000)
+    parser.add_argument('--evidence', type=int, default=20000)
+    parser.add_argument('--comments', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=1, help='Seed of the dataset and of the request mix.')
+    parser.add_argument('--database', help='SQLite file to use (default: a temporary file).')
+    parser.add_argument('--reuse', action='store_true', help='Benchmark --database as is instead of seeding it.')
+    parser.add_argument('--scenarios', default=','.join(DEFAULT_SCENARIOS),
+                        help=f"Comma-separated scenarios to run, from {', '.join(DEFAULT_SCENARIOS + EXTRA_SCENARIOS)}.")
+    parser.add_argument('--page-size', type=int, default=20, help='Feed page size (the limit parameter).')
+    parser.add_argument('--requests', type=int, default=500, help='Measured requests per scenario and mode.')
+    parser.add_argument('--login-requests', type=int, default=50,
+                        help='Measured login requests; password hashing makes each one slow.')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent clients against the server.')
+    parser.add_argument('--modes', default='client,server', help='client, server or both.')
+    parser.add_argument('--response-cache', action='store_true', help='Keep the in-memory response cache on.')
+    parser.add_argument('--output', help='Write the JSON results here (default: stdout).')
+    parser.add_argument('--compare', help='Earlier JSON results to print relative changes against.')
+    args = parser.parse_args()
+
+    if args.reuse and not args.database:
+        parser.error('--reuse needs --database')
+    path = args.database or tempfile.mkstemp(suffix='.db')[1]
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    os.environ.setdefault('MODERATION_BACKEND', 'fake')
+    os.environ['RESPONSE_CACHE_BACKEND'] = 'memory' if args.response_cache else 'none'
+    # Every benchmark login comes from one IP
+    os.environ['LOGIN_RATE_LIMIT'] = 'false'
+
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import select
+
+    from app import create_app, db
+    from app.models.claim import Claim
+    from app.models.user import User
+    from app.services.seed_service import SeedService
+
+    app = create_app()
+    log = lambda message: print(message, file=sys.stderr)
+    written = None
+    with app.app_context():
+        if not args.reuse:
+            log(f'Seeding {path}')
+            db.drop_all()
+            db.create_all()
+            written = SeedService.generate(
+                users=args.users, claims=args.claims, votes=args.votes, evidence=args.evidence,
+                comments=args.comments, seed=args.seed, log=log
+            )
+            SeedService.finalize(signatures=True, log=log)
+        claim_ids = db.session.execute(select(Claim.id)).scalars().all()
+        user_ids = db.session.execute(select(User.id)).scalars().all()
+        rng = random.Random(args.seed)
+        tokens = [create_access_token(identity=user_id) for user_id in rng.sample(user_ids, min(TOKEN_USERS, len(user_ids)))]
+        queries = QueryCounter(db.engine)
+
+    scenarios = Scenarios(rng, claim_ids, user_ids, tokens, args.page_size)
+    modes = set(args.modes.split(','))
+    server = start_server(app) if 'server' in modes else None
+    results = {}
+    for name in args.scenarios.split(','):
+        requests = args.login_requests if name == 'login' else args.requests
+        results[name] = {}
+        if 'client' in modes:
+            log(f'{name}: test client')
+            results[name]['client'] = run_client(app, scenarios, name, requests, args.warmup, queries)
+        if server is not None:
+            log(f'{name}: server, {args.concurrency} clients')
+            results[name]['server'] = run_server(server, scenarios, name, requests, args.concurrency, queries)
+    if server is not None:
+        server.shutdown()
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': 'sqlite',
+            'dataset': written or 'reused',
+            'seed': args.seed,
+            'concurrency': args.concurrency,
+            'response_cache': args.response_cache,
+        },
+        'scenarios': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    if args.compare:
+        compare(results, args.compare)
+
+    if not args.database:
+        # WAL mode leaves -wal and -shm files next to the database
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == '__main__':
+    main()
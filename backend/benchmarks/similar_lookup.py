@@ -0,0 +1,128 @@
+"""Near-duplicate lookup latency as the number of stored claim signatures grows.
+
+Fills the signature tables of a scratch SQLite database in steps (default
+10k, 100k and 1M claims) and times ``DuplicateService.find_candidates`` at
+each size, for queries that have a planted near duplicate and for queries
+that match nothing. Signatures are random, which is what the bands of
+unrelated claims look like, so no claim text has to be MinHashed.
+
+    python -m benchmarks.similar_lookup --sizes 10000,100000,1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import struct
+import tempfile
+import time
+
+PLANTED_EVERY = 1000
+QUERIES = 500
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def random_signature(rng, size):
+    return list(struct.unpack(f'>{size}Q', rng.randbytes(8 * size)))
+
+
+def near_duplicate(rng, signature, keep):
+    """Copy ``signature`` keeping roughly a ``keep`` fraction of its minimums."""
+    return [value if rng.random() < keep else rng.getrandbits(61) for value in signature]
+
+
+def fill(db, duplicate_service, rng, start, stop, planted):
+    from app.models.claim_signature import ClaimSignature, ClaimSignatureBand
+
+    batch_size = 10000
+    for batch_start in range(start, stop, batch_size):
+        signatures, bands = [], []
+        for claim_id in range(batch_start + 1, min(stop, batch_start + batch_size) + 1):
+            signature = random_signature(rng, duplicate_service.NUM_PERMUTATIONS)
+            if claim_id % PLANTED_EVERY == 0:
+                planted[claim_id] = signature
+            signatures.append({'claim_id': claim_id, 'signature': duplicate_service.pack(signature)})
+            bands.extend(
+                {'band': band, 'bucket': bucket, 'claim_id': claim_id}
+                for band, bucket in enumerate(duplicate_service.band_buckets(signature))
+            )
+        db.session.execute(ClaimSignature.__table__.insert(), signatures)
+        db.session.execute(ClaimSignatureBand.__table__.insert(), bands)
+        db.session.commit()
+
+
+def measure(duplicate_service, rng, planted, keep):
+    duplicate_latencies, miss_latencies = [], []
+    found = 0
+    # Warm up statement caches and the page cache
+    for _ in range(20):
+        duplicate_service.DuplicateService.find_candidates(random_signature(rng, duplicate_service.NUM_PERMUTATIONS))
+    for claim_id in rng.sample(sorted(planted), min(QUERIES, len(planted))):
+        query = near_duplicate(rng, planted[claim_id], keep)
+        start = time.perf_counter()
+        matches = duplicate_service.DuplicateService.find_candidates(query)
+        duplicate_latencies.append(time.perf_counter() - start)
+        found += any(match_id == claim_id for match_id, _ in matches)
+
+    for _ in range(QUERIES):
+        query = random_signature(rng, duplicate_service.NUM_PERMUTATIONS)
+        start = time.perf_counter()
+        duplicate_service.DuplicateService.find_candidates(query)
+        miss_latencies.append(time.perf_counter() - start)
+
+    return duplicate_latencies, miss_latencies, found / max(1, len(duplicate_latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', default='10000,100000,1000000',
+                        help='Comma-separated numbers of stored claims to measure at.')
+    parser.add_argument('--keep', type=float, default=0.7,
+                        help='Fraction of minimums a planted near duplicate shares with its original.')
+    parser.add_argument('--database', help='SQLite file to use (default: a temporary file).')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    path = args.database or tempfile.mkstemp(suffix='.db')[1]
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    os.environ.setdefault('MODERATION_BACKEND', 'fake')
+
+    from app import create_app, db
+    from app.services import duplicate_service
+
+    app = create_app()
+    rng = random.Random(args.seed)
+    planted = {}
+    stored = 0
+
+    print(f'database: {path}')
+    print(f'{"claims":>10} {"fill s":>8} {"dup p50":>9} {"dup p95":>9} {"dup p99":>9} '
+          f'{"miss p50":>9} {"miss p99":>9} {"recall":>7}')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        for size in (int(size) for size in args.sizes.split(',')):
+            start = time.perf_counter()
+            fill(db, duplicate_service, rng, stored, size, planted)
+            fill_seconds = time.perf_counter() - start
+            stored = size
+
+            duplicates, misses, recall = measure(duplicate_service, rng, planted, args.keep)
+            ms = [1000 * value for value in (
+                statistics.median(duplicates), percentile(duplicates, 0.95), percentile(duplicates, 0.99),
+                statistics.median(misses), percentile(misses, 0.99)
+            )]
+            print(f'{size:>10} {fill_seconds:>8.1f} ' + ' '.join(f'{value:>8.2f}ms' for value in ms)
+                  + f' {recall:>7.1%}')
+
+    if not args.database:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""Concurrent vote writes against one SQLite file from several processes.
+
+Seeds a small dataset, then starts ``--processes`` worker processes (like
+gunicorn workers), each with ``--threads`` threads casting votes on a few
+hot claims through the Flask test client, mixed with feed reads. Reports
+throughput, latency and every failed request. With the connect-time
+pragmas (WAL, busy_timeout) no vote should fail; ``--legacy`` reruns with
+SQLite's defaults (rollback journal, pysqlite's 5 s timeout) for comparison.
+
+    python -m benchmarks.vote_contention --processes 4 --threads 8
+    python -m benchmarks.vote_contention --processes 4 --threads 8 --legacy
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import Counter
+
+LEGACY_SQLITE = {
+    'SQLITE_JOURNAL_MODE': 'DELETE',
+    'SQLITE_SYNCHRONOUS': 'FULL',
+    'SQLITE_BUSY_TIMEOUT_MS': '5000',
+    'SQLITE_MMAP_SIZE': '0',
+}
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def worker(worker_id, args, user_ids, claim_ids, results):
+    import threading
+
+    from flask_jwt_extended import create_access_token
+
+    from app import create_app
+
+    app = create_app()
+    rng = random.Random(args.seed + worker_id)
+    with app.app_context():
+        tokens = [create_access_token(identity=user_id) for user_id in user_ids]
+    # A few hot claims take most votes, which is where writers collide
+    hot_claims = claim_ids[:args.hot_claims]
+    barrier_start = time.time() + 1.0
+    lock = threading.Lock()
+    latencies, statuses, errors = [], Counter(), Counter()
+
+    def run(thread_id):
+        client = app.test_client()
+        thread_rng = random.Random(rng.random())
+        time.sleep(max(0.0, barrier_start - time.time()))
+        for _ in range(args.requests):
+            if thread_rng.random() < args.read_ratio:
+                method, path, body, headers = 'GET', '/api/claims?limit=20', None, {}
+            else:
+                method, path, headers = 'POST', '/api/votes', {
+                    'Authorization': f'Bearer {thread_rng.choice(tokens)}'
+                }
+                body = {'claim_id': thread_rng.choice(hot_claims),
+                        'vote_type': thread_rng.choice(('upvote', 'downvote'))}
+            start = time.perf_counter()
+            try:
+                response = client.open(path, method=method, json=body, headers=headers)
+                status, error = response.status_code, None
+                if status >= 500:
+                    error = response.get_data(as_text=True)[:200]
+            except Exception as e:
+                status, error = 'exception', str(e).split('\n')[0][:200]
+            elapsed = time.perf_counter() - start
+            with lock:
+                if method == 'POST':
+                    latencies.append(elapsed)
+                statuses[f'{method} {status}'] += 1
+                if error:
+                    errors[error] += 1
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put({'latencies': latencies, 'statuses': dict(statuses), 'errors': dict(errors)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8, help='Threads per process.')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per thread.')
+    parser.add_argument('--read-ratio', type=float, default=0.3, help='Share of requests that read the feed.')
+    parser.add_argument('--hot-claims', type=int, default=20)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--claims', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--legacy', action='store_true', help="Use SQLite's default journal and locking settings.")
+    parser.add_argument('--database', help='SQLite file to use (default: a temporary file).')
+    args = parser.parse_args()
+
+    path = args.database or tempfile.mkstemp(suffix='.db')[1]
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    os.environ.setdefault('MODERATION_BACKEND', 'fake')
+    os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+    if args.legacy:
+        os.environ.update(LEGACY_SQLITE)
+
+    from sqlalchemy import select
+
+    from app import create_app, db
+    from app.models.claim import Claim
+    from app.models.user import User
+    from app.services.seed_service import SeedService
+
+    app = create_app()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        SeedService.generate(users=args.users, claims=args.claims, votes=args.claims * 5,
+                             evidence=0, comments=0, seed=args.seed, log=lambda message: None)
+        claim_ids = db.session.execute(select(Claim.id).order_by(Claim.id)).scalars().all()
+        user_ids = db.session.execute(select(User.id)).scalars().all()
+        journal_mode = db.session.execute(db.text('PRAGMA journal_mode')).scalar()
+        db.session.remove()
+        db.engine.dispose()
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    start = time.perf_counter()
+    processes = [
+        context.Process(target=worker, args=(index, args, user_ids, claim_ids, results))
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start - 1.0
+
+    latencies = [latency for result in collected for latency in result['latencies']]
+    statuses, errors = Counter(), Counter()
+    for result in collected:
+        statuses.update(result['statuses'])
+        errors.update(result['errors'])
+
+    report = {
+        'journal_mode': journal_mode,
+        'legacy': args.legacy,
+        'processes': args.processes,
+        'threads_per_process': args.threads,
+        'requests': sum(statuses.values()),
+        'throughput_rps': round(sum(statuses.values()) / elapsed, 1),
+        'vote_latency_ms': {
+            'p50': round(1000 * statistics.median(latencies), 2),
+            'p95': round(1000 * percentile(latencies, 0.95), 2),
+            'p99': round(1000 * percentile(latencies, 0.99), 2),
+            'max': round(1000 * max(latencies), 2),
+        } if latencies else None,
+        'statuses': dict(sorted(statuses.items())),
+        'database_locked_errors': sum(count for error, count in errors.items() if 'database is locked' in error),
+        'errors': dict(errors.most_common(10)),
+    }
+    print(json.dumps(report, indent=2))
+
+    if not args.database:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""Gunicorn settings for ``gunicorn -c gunicorn.conf.py wsgi:app``.
+
+Each worker is a separate process with its own connection pool (DB_POOL_SIZE,
+keep it at least GUNICORN_THREADS), moderation thread pool and in-memory
+response cache. The app is not preloaded: the moderation thread pools are
+started in create_app and threads do not survive a fork.
+
+SQLite serializes writers across all workers; WAL and SQLITE_BUSY_TIMEOUT_MS
+make them queue for the write lock instead of failing. Use PostgreSQL when
+writes need to scale past one writer.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# Threads overlap the time requests spend waiting on the database
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then so slow leaks cannot build up
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+preload_app = False
+accesslog = '-'
+errorlog = '-'
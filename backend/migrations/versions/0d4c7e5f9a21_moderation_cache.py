@@ -0,0 +1,35 @@
+"""Add moderation_cache table
+
+Revision ID: 0d4c7e5f9a21
+Revises: e91f6a2b8c37
+Create Date: 2026-10-18 15:02:44.180533
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0d4c7e5f9a21'
+down_revision = 'e91f6a2b8c37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('moderation_cache',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('result', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('key')
+    )
+    with op.batch_alter_table('moderation_cache', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_moderation_cache_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('moderation_cache', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_moderation_cache_created_at'))
+
+    op.drop_table('moderation_cache')
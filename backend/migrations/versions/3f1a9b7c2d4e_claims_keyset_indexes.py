@@ -0,0 +1,30 @@
+"""Add composite indexes for keyset pagination of claims
+
+Revision ID: 3f1a9b7c2d4e
+Revises: 9c295370286a
+Create Date: 2026-10-18 10:12:03.418220
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1a9b7c2d4e'
+down_revision = '9c295370286a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('claims', schema=None) as batch_op:
+        batch_op.create_index('ix_claims_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_claims_credibility_score_id', ['credibility_score', 'id'], unique=False)
+        batch_op.create_index('ix_claims_updated_at_id', ['updated_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('claims', schema=None) as batch_op:
+        batch_op.drop_index('ix_claims_updated_at_id')
+        batch_op.drop_index('ix_claims_credibility_score_id')
+        batch_op.drop_index('ix_claims_created_at_id')
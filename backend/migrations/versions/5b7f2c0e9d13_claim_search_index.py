@@ -0,0 +1,56 @@
+"""Add full-text search index over claims and evidence
+
+Revision ID: 5b7f2c0e9d13
+Revises: a3e8d1f47b60
+Create Date: 2026-10-18 17:40:26.918044
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7f2c0e9d13'
+down_revision = 'a3e8d1f47b60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE claims_fts USING fts5("
+            "title, description, evidence, tokenize = 'porter unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "INSERT INTO claims_fts (rowid, title, description, evidence) "
+            "SELECT c.id, c.title, c.description, "
+            "(SELECT group_concat(e.content, ' ') FROM evidence e WHERE e.claim_id = c.id) "
+            "FROM claims c"
+        )
+    elif dialect == 'postgresql':
+        op.execute(
+            "CREATE TABLE claim_search ("
+            "claim_id INTEGER PRIMARY KEY REFERENCES claims (id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"
+        )
+        op.execute(
+            "INSERT INTO claim_search (claim_id, document) "
+            "SELECT c.id, "
+            "setweight(to_tsvector('english', coalesce(c.title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(c.description, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce("
+            "(SELECT string_agg(e.content, ' ') FROM evidence e WHERE e.claim_id = c.id), '')), 'C') "
+            "FROM claims c"
+        )
+        # Built after the backfill, which is faster than maintaining it row by row
+        op.execute("CREATE INDEX ix_claim_search_document ON claim_search USING GIN (document)")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE claims_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP TABLE claim_search")
@@ -0,0 +1,43 @@
+"""Add denormalized vote, evidence and comment counters to claims
+
+Revision ID: 7b2e4c91a0d5
+Revises: 3f1a9b7c2d4e
+Create Date: 2026-10-18 11:40:27.093114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e4c91a0d5'
+down_revision = '3f1a9b7c2d4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('claims', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('upvote_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('downvote_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('evidence_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the existing rows
+    op.execute("""
+        UPDATE claims SET
+            upvote_count = (SELECT COUNT(*) FROM votes
+                            WHERE votes.claim_id = claims.id AND votes.vote_type = 'upvote'),
+            downvote_count = (SELECT COUNT(*) FROM votes
+                              WHERE votes.claim_id = claims.id AND votes.vote_type = 'downvote'),
+            evidence_count = (SELECT COUNT(*) FROM evidence WHERE evidence.claim_id = claims.id),
+            comment_count = (SELECT COUNT(*) FROM comments WHERE comments.claim_id = claims.id)
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('claims', schema=None) as batch_op:
+        batch_op.drop_column('comment_count')
+        batch_op.drop_column('evidence_count')
+        batch_op.drop_column('downvote_count')
+        batch_op.drop_column('upvote_count')
@@ -0,0 +1,43 @@
+"""Add claim_signatures and claim_signature_bands tables
+
+Revision ID: 8e1d6a3f5c27
+Revises: 5b7f2c0e9d13
+Create Date: 2026-10-18 18:52:13.570419
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e1d6a3f5c27'
+down_revision = '5b7f2c0e9d13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing claims are indexed with `flask claims rebuild-signatures`
+    op.create_table('claim_signatures',
+    sa.Column('claim_id', sa.Integer(), nullable=False),
+    sa.Column('signature', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['claim_id'], ['claims.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('claim_id')
+    )
+    op.create_table('claim_signature_bands',
+    sa.Column('band', sa.SmallInteger(), nullable=False),
+    sa.Column('bucket', sa.BigInteger(), nullable=False),
+    sa.Column('claim_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['claim_id'], ['claims.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('band', 'bucket', 'claim_id')
+    )
+    with op.batch_alter_table('claim_signature_bands', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_claim_signature_bands_claim_id'), ['claim_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('claim_signature_bands', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_claim_signature_bands_claim_id'))
+
+    op.drop_table('claim_signature_bands')
+    op.drop_table('claim_signatures')
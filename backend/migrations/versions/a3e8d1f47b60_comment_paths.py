@@ -0,0 +1,73 @@
+"""Add materialized path and depth to comments
+
+Revision ID: a3e8d1f47b60
+Revises: 0d4c7e5f9a21
+Create Date: 2026-10-18 16:21:09.413802
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3e8d1f47b60'
+down_revision = '0d4c7e5f9a21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('path', sa.Text().with_variant(postgresql.TEXT(collation='C'), 'postgresql'), nullable=True))
+        batch_op.add_column(sa.Column('depth', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from parent links; parents are resolved before their replies
+    comments = sa.table('comments',
+        sa.column('id', sa.Integer),
+        sa.column('parent_comment_id', sa.Integer),
+        sa.column('path', sa.Text),
+        sa.column('depth', sa.Integer)
+    )
+    bind = op.get_bind()
+    parents = dict(bind.execute(
+        sa.select(comments.c.id, comments.c.parent_comment_id).order_by(comments.c.id)
+    ).all())
+    paths = {}
+
+    def resolve(comment_id):
+        chain = []
+        while comment_id not in paths:
+            chain.append(comment_id)
+            comment_id = parents.get(comment_id)
+            if comment_id is None:
+                break
+        for node in reversed(chain):
+            parent_path, parent_depth = paths.get(parents.get(node), ('', -1))
+            paths[node] = (parent_path + f'{node:010d}/', parent_depth + 1)
+
+    for comment_id in parents:
+        resolve(comment_id)
+
+    if paths:
+        bind.execute(
+            comments.update()
+            .where(comments.c.id == sa.bindparam('target_id'))
+            .values(path=sa.bindparam('new_path'), depth=sa.bindparam('new_depth')),
+            [
+                {'target_id': comment_id, 'new_path': path, 'new_depth': depth}
+                for comment_id, (path, depth) in paths.items()
+            ]
+        )
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index('ix_comments_claim_id_path', ['claim_id', 'path'], unique=False)
+        batch_op.create_index('ix_comments_claim_id_depth_path', ['claim_id', 'depth', 'path'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_comments_claim_id_depth_path')
+        batch_op.drop_index('ix_comments_claim_id_path')
+        batch_op.drop_column('depth')
+        batch_op.drop_column('path')
@@ -0,0 +1,26 @@
+"""Index evidence.created_at for incremental exports
+
+Revision ID: b6d03e8a1f94
+Revises: f2a9c4d7e613
+Create Date: 2026-10-18 21:03:55.841270
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d03e8a1f94'
+down_revision = 'f2a9c4d7e613'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('evidence', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_evidence_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('evidence', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_evidence_created_at'))
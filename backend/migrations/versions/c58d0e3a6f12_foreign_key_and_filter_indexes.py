@@ -0,0 +1,55 @@
+"""Add foreign key and feed filter indexes
+
+Revision ID: c58d0e3a6f12
+Revises: 7b2e4c91a0d5
+Create Date: 2026-10-18 13:05:51.662408
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c58d0e3a6f12'
+down_revision = '7b2e4c91a0d5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('claims', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_claims_user_id'), ['user_id'], unique=False)
+        batch_op.create_index('ix_claims_category_created_at_id', ['category', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_claims_status_created_at_id', ['status', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_comments_claim_id'), ['claim_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_comments_user_id'), ['user_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_comments_parent_comment_id'), ['parent_comment_id'], unique=False)
+
+    with op.batch_alter_table('evidence', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_evidence_claim_id'), ['claim_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_evidence_user_id'), ['user_id'], unique=False)
+
+    # votes.claim_id is already the leading column of unique_user_claim_vote
+    with op.batch_alter_table('votes', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_votes_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('votes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_votes_user_id'))
+
+    with op.batch_alter_table('evidence', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_evidence_user_id'))
+        batch_op.drop_index(batch_op.f('ix_evidence_claim_id'))
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_comments_parent_comment_id'))
+        batch_op.drop_index(batch_op.f('ix_comments_user_id'))
+        batch_op.drop_index(batch_op.f('ix_comments_claim_id'))
+
+    with op.batch_alter_table('claims', schema=None) as batch_op:
+        batch_op.drop_index('ix_claims_status_created_at_id')
+        batch_op.drop_index('ix_claims_category_created_at_id')
+        batch_op.drop_index(batch_op.f('ix_claims_user_id'))
@@ -0,0 +1,43 @@
+"""Track every write to claims and votes for incremental exports
+
+Revision ID: d4a7c2e9b150
+Revises: b6d03e8a1f94
+Create Date: 2026-10-19 10:12:41.508317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a7c2e9b150'
+down_revision = 'b6d03e8a1f94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('claims', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('changed_at', sa.DateTime(), nullable=True))
+    with op.batch_alter_table('votes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # Earlier counter, moderation and ranking writes were not recorded; start from the last edit
+    op.execute("UPDATE claims SET changed_at = COALESCE(updated_at, created_at, CURRENT_TIMESTAMP)")
+    op.execute("UPDATE votes SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)")
+
+    with op.batch_alter_table('claims', schema=None) as batch_op:
+        batch_op.alter_column('changed_at', existing_type=sa.DateTime(), nullable=False)
+        batch_op.create_index('ix_claims_changed_at_id', ['changed_at', 'id'], unique=False)
+    with op.batch_alter_table('votes', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+        batch_op.create_index('ix_votes_updated_at_id', ['updated_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('votes', schema=None) as batch_op:
+        batch_op.drop_index('ix_votes_updated_at_id')
+        batch_op.drop_column('updated_at')
+    with op.batch_alter_table('claims', schema=None) as batch_op:
+        batch_op.drop_index('ix_claims_changed_at_id')
+        batch_op.drop_column('changed_at')
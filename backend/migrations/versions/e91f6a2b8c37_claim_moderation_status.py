@@ -0,0 +1,30 @@
+"""Add moderation_status to claims for background moderation
+
+Revision ID: e91f6a2b8c37
+Revises: c58d0e3a6f12
+Create Date: 2026-10-18 14:21:09.514872
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e91f6a2b8c37'
+down_revision = 'c58d0e3a6f12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('claims', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('moderation_status', sa.String(length=20), nullable=True))
+
+    # Existing claims were moderated inline, or skipped when no API key was set
+    op.execute("UPDATE claims SET moderation_status = 'completed' WHERE ai_moderation_score IS NOT NULL")
+    op.execute("UPDATE claims SET moderation_status = 'skipped' WHERE ai_moderation_score IS NULL")
+
+
+def downgrade():
+    with op.batch_alter_table('claims', schema=None) as batch_op:
+        batch_op.drop_column('moderation_status')
@@ -0,0 +1,43 @@
+"""Add precomputed discussion and trending rankings to claims
+
+Revision ID: f2a9c4d7e613
+Revises: 8e1d6a3f5c27
+Create Date: 2026-10-18 20:14:37.206518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a9c4d7e613'
+down_revision = '8e1d6a3f5c27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('claims', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('discussion_score', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('trending_score', sa.Float(), server_default='0', nullable=False))
+
+    # Backfill from the counters; trending scores come from `flask rankings refresh`
+    op.execute("UPDATE claims SET discussion_score = comment_count + 2 * evidence_count")
+
+    with op.batch_alter_table('claims', schema=None) as batch_op:
+        batch_op.create_index('ix_claims_discussion_score_id', ['discussion_score', 'id'], unique=False)
+        batch_op.create_index('ix_claims_trending_score_id', ['trending_score', 'id'], unique=False)
+
+    with op.batch_alter_table('votes', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_votes_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('votes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_votes_created_at'))
+
+    with op.batch_alter_table('claims', schema=None) as batch_op:
+        batch_op.drop_index('ix_claims_trending_score_id')
+        batch_op.drop_index('ix_claims_discussion_score_id')
+        batch_op.drop_column('trending_score')
+        batch_op.drop_column('discussion_score')
@@ -0,0 +1,74 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from flask_migrate import upgrade
+from sqlalchemy import event
+
+from app import create_app, db
+from app.services.seed_service import SeedService
+
+
+@pytest.fixture
+def app_config():
+    """Config overrides for the app fixture; override this fixture in a test module to change them."""
+    return {}
+
+
+@pytest.fixture
+def app(app_config):
+    app = create_app('testing', app_config)
+    with app.app_context():
+        # The migrations, not create_all, so the tests run against the real schema and indexes
+        upgrade()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def seed(app):
+    """Generate a small dataset; call again to append more rows."""
+    def generate(**counts):
+        options = dict(users=10, claims=50, votes=300, evidence=100, comments=200, seed=1)
+        options.update(counts)
+        written = SeedService.generate(log=lambda message: None, **options)
+        SeedService.finalize(signatures=False, log=lambda message: None)
+        return written
+    return generate
+
+
+@pytest.fixture
+def auth_headers(app):
+    def headers(user_id=1):
+        return {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+    return headers
+
+
+class StatementLog:
+    """Records the SQL statements sent through an engine while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+
+    def __len__(self):
+        return len(self.statements)
+
+
+@pytest.fixture
+def statements(app):
+    return lambda: StatementLog(db.engine)
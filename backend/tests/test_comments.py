@@ -0,0 +1,48 @@
+import pytest
+
+from app.models.claim import Claim
+from app.models.user import User
+from app import db
+
+
+@pytest.fixture
+def claim(app):
+    db.session.add(User(username='author', email='author@example.com'))
+    db.session.flush()
+    claim = Claim(title='A claim', description='A claim description', user_id=1)
+    db.session.add(claim)
+    db.session.commit()
+    return claim.id
+
+
+def test_claim_and_parent_ids_are_coerced_or_rejected(client, auth_headers, claim):
+    top = client.post('/api/comments', json={'claim_id': str(claim), 'content': 'Top'}, headers=auth_headers())
+    assert top.status_code == 201, top.get_json()
+    parent_id = top.get_json()['comment']['id']
+
+    reply = client.post('/api/comments', headers=auth_headers(),
+                        json={'claim_id': str(claim), 'parent_comment_id': str(parent_id), 'content': 'Reply'})
+    assert reply.status_code == 201, reply.get_json()
+    assert reply.get_json()['comment']['parent_comment_id'] == parent_id
+
+    for bad in ({'claim_id': 'one'}, {'claim_id': True}, {'claim_id': 1.5},
+                {'claim_id': claim, 'parent_comment_id': 'x'}):
+        response = client.post('/api/comments', json=dict(bad, content='Bad'), headers=auth_headers())
+        assert response.status_code == 400, bad
+
+
+def test_thread_pages_and_rejects_invalid_cursors(client, auth_headers, claim):
+    for i in range(3):
+        client.post('/api/comments', json={'claim_id': claim, 'content': f'Comment {i}'}, headers=auth_headers())
+
+    first = client.get(f'/api/comments/claim/{claim}?limit=2').get_json()
+    assert first['count'] == 2
+    rest = client.get(f"/api/comments/claim/{claim}?limit=2&cursor={first['next_cursor']}").get_json()
+    assert rest['count'] == 1
+    assert rest['next_cursor'] is None
+    assert {c['id'] for c in first['comments']}.isdisjoint(c['id'] for c in rest['comments'])
+
+    for cursor in ('abc', '-1', '1.5'):
+        response = client.get(f'/api/comments/claim/{claim}?cursor={cursor}')
+        assert response.status_code == 400
+        assert response.get_json() == {'error': 'Invalid cursor'}
@@ -0,0 +1,90 @@
+import pytest
+from sqlalchemy import func, select, update
+
+from app.models.claim import Claim
+from app.models.comment import Comment
+from app.models.evidence import Evidence
+from app.models.user import User
+from app.models.vote import Vote
+from app import db
+
+COUNTERS = ('upvote_count', 'downvote_count', 'evidence_count', 'comment_count', 'credibility_score')
+
+
+@pytest.fixture
+def claims(app):
+    db.session.add_all(User(username=f'user{i}', email=f'user{i}@example.com') for i in range(3))
+    db.session.flush()
+    db.session.add_all(Claim(title=f'Claim {i}', description='A claim description', user_id=1) for i in range(2))
+    db.session.commit()
+    return db.session.scalars(select(Claim.id).order_by(Claim.id)).all()
+
+
+def counters():
+    db.session.expire_all()
+    return {claim.id: tuple(getattr(claim, name) for name in COUNTERS) for claim in db.session.scalars(select(Claim))}
+
+
+def recounted():
+    def count(model, claim_id, *criteria):
+        return db.session.scalar(select(func.count()).select_from(model).where(model.claim_id == claim_id, *criteria))
+
+    result = {}
+    for claim_id in db.session.scalars(select(Claim.id)):
+        upvotes = count(Vote, claim_id, Vote.vote_type == 'upvote')
+        downvotes = count(Vote, claim_id, Vote.vote_type == 'downvote')
+        result[claim_id] = (upvotes, downvotes, count(Evidence, claim_id), count(Comment, claim_id), upvotes - downvotes)
+    return result
+
+
+def test_counters_follow_writes_without_touching_updated_at(client, auth_headers, claims):
+    first, second = claims
+    before = {claim.id: (claim.updated_at, claim.changed_at) for claim in db.session.scalars(select(Claim))}
+
+    def post(url, json, user_id=1, method='post'):
+        response = getattr(client, method)(url, json=json, headers=auth_headers(user_id))
+        assert response.status_code in (200, 201), response.get_json()
+        return response.get_json()
+
+    for user_id in (1, 2, 3):
+        post('/api/votes', {'claim_id': first, 'vote_type': 'upvote'}, user_id)
+    post('/api/votes', {'claim_id': first, 'vote_type': 'downvote'}, 2)
+    post('/api/votes', {'claim_id': first}, 3, method='delete')
+    post('/api/votes/batch', {'votes': [{'claim_id': second, 'vote_type': 'downvote'}]}, 1)
+
+    evidence = [post('/api/evidence', {'claim_id': claim_id, 'content': 'A source', 'type': 'supporting'})
+                for claim_id in (first, first, second)]
+    client.delete(f"/api/evidence/{evidence[0]['evidence']['id']}", headers=auth_headers())
+
+    top = post('/api/comments', {'claim_id': first, 'content': 'Top'})['comment']
+    post('/api/comments', {'claim_id': first, 'parent_comment_id': top['id'], 'content': 'Reply'})
+    post('/api/comments', {'claim_id': second, 'content': 'Other'})
+    client.delete(f"/api/comments/{top['id']}", headers=auth_headers())
+
+    assert counters() == recounted()
+    assert counters()[first] == (1, 1, 1, 0, 0)
+    for claim in db.session.scalars(select(Claim)):
+        updated_at, changed_at = before[claim.id]
+        # Votes, evidence and comments are not edits of the claim, but exports must see them
+        assert claim.updated_at == updated_at
+        assert claim.changed_at > changed_at
+
+
+def test_rebuild_counters_repairs_drift(app, client, auth_headers, claims):
+    first, second = claims
+    for user_id in (1, 2):
+        client.post('/api/votes', json={'claim_id': first, 'vote_type': 'upvote'}, headers=auth_headers(user_id))
+    client.post('/api/comments', json={'claim_id': second, 'content': 'A comment'}, headers=auth_headers())
+    expected = recounted()
+    updated_at = dict(db.session.execute(select(Claim.id, Claim.updated_at)).all())
+
+    db.session.execute(update(Claim).values(upvote_count=7, downvote_count=3, evidence_count=2,
+                                            comment_count=0, credibility_score=4, updated_at=Claim.updated_at))
+    db.session.commit()
+    assert counters() != expected
+
+    result = app.test_cli_runner().invoke(args=['claims', 'rebuild-counters'])
+    assert result.exit_code == 0, result.output
+    assert 'Rebuilt counters for 2 claims' in result.output
+    assert counters() == expected
+    assert dict(db.session.execute(select(Claim.id, Claim.updated_at)).all()) == updated_at
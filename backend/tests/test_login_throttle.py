@@ -0,0 +1,43 @@
+import pytest
+
+
+@pytest.fixture
+def app_config():
+    return {
+        'LOGIN_RATE_LIMIT': True,
+        'LOGIN_IP_BURST': 4,
+        'LOGIN_IP_PER_MINUTE': 0.001,
+        'LOGIN_EMAIL_BURST': 2,
+        'LOGIN_EMAIL_PER_MINUTE': 0.001,
+        'TRUSTED_PROXY_COUNT': 1,
+    }
+
+
+@pytest.fixture
+def account(client):
+    credentials = {'email': 'user@example.com', 'password': 'correct horse'}
+    response = client.post('/api/auth/register', json=dict(credentials, username='user'))
+    assert response.status_code == 201, response.get_json()
+    return credentials
+
+
+def login(client, credentials, ip, **changes):
+    return client.post('/api/auth/login', json=dict(credentials, **changes),
+                       headers={'X-Forwarded-For': ip}).status_code
+
+
+def test_only_failed_attempts_use_up_the_email_budget(client, account):
+    # Each login from its own address, so only the email budget applies
+    assert [login(client, account, f'10.0.0.{i}') for i in range(4)] == [200] * 4
+
+    assert login(client, account, '10.0.1.1', password='wrong') == 401
+    assert login(client, account, '10.0.1.2', email='USER@example.com ', password='wrong') == 401
+    assert login(client, account, '10.0.1.3') == 429
+
+
+def test_ip_budget_follows_the_forwarded_client_address(client, account):
+    assert [login(client, account, '10.0.0.1') for _ in range(5)] == [200] * 4 + [429]
+    # Another client behind the same proxy is not affected
+    assert login(client, account, '10.0.0.2') == 200
+    # The proxy appends the real peer, so a client-supplied entry in front of it is ignored
+    assert login(client, account, '1.2.3.4, 10.0.0.1') == 429
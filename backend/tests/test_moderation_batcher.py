@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+from app.commands.moderation import stub_application
+from app.services.moderation_service import FakeModerationBackend, ModerationService, OpenAIModerationBackend
+
+CALLERS = 8
+
+
+@pytest.fixture
+def stub_server():
+    """The `flask moderation stub-server` app on a free port; yields its base URL and request log."""
+    log = []
+    server = make_server('127.0.0.1', 0, stub_application(FakeModerationBackend(flagged_terms=['scam']), log.append),
+                         threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/v1', log
+    server.shutdown()
+    thread.join()
+
+
+def test_concurrent_texts_go_out_as_one_batch(stub_server):
+    base_url, log = stub_server
+    # A full batch is sent at once; the window only bounds the wait if a caller were missing
+    service = ModerationService(OpenAIModerationBackend('test-key', base_url=base_url),
+                                batch_size=CALLERS, batch_window=5)
+    texts = [f'Claim {i}' + (' is a scam' if i % 3 == 0 else '') for i in range(CALLERS)]
+    results = [None] * CALLERS
+    start = threading.Barrier(CALLERS)
+
+    def moderate(index):
+        start.wait()
+        results[index] = service.moderate_text(texts[index])
+
+    threads = [threading.Thread(target=moderate, args=(index,)) for index in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert log == [f'moderations: batch of {CALLERS}']
+    for text, result in zip(texts, results):
+        assert result['moderated'], result
+        assert result['flagged'] == ('scam' in text), text
+        assert result['overall_score'] == (0.9 if 'scam' in text else 0.01)
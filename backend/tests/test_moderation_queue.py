@@ -0,0 +1,49 @@
+import time
+
+import pytest
+
+from app.models.user import User
+from app import db
+
+FAKE_DELAY = 2.0
+
+
+@pytest.fixture
+def app_config(tmp_path):
+    # A file database, since the moderation workers write from their own threads
+    return {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'moderation.db'}",
+        'MODERATION_ASYNC': True,
+        'MODERATION_FAKE_DELAY': FAKE_DELAY,
+    }
+
+
+def wait_for_moderation(client, claim_id, timeout):
+    deadline = time.monotonic() + timeout
+    while True:
+        claim = client.get(f'/api/claims/{claim_id}').get_json()['claim']
+        if claim['moderation_status'] != 'queued' or time.monotonic() > deadline:
+            return claim
+        time.sleep(0.05)
+
+
+def test_claims_are_created_without_waiting_for_a_slow_backend(client, auth_headers):
+    db.session.add(User(username='author', email='author@example.com'))
+    db.session.commit()
+
+    claim_ids, latencies = [], []
+    for i in range(5):
+        start = time.monotonic()
+        response = client.post('/api/claims', headers=auth_headers(),
+                               json={'title': f'Claim {i}', 'description': f'Claim {i} description'})
+        latencies.append(time.monotonic() - start)
+        assert response.status_code == 201, response.get_json()
+        body = response.get_json()
+        assert body['moderation']['status'] == 'queued'
+        claim_ids.append(body['claim']['id'])
+    assert max(latencies) < FAKE_DELAY / 2, latencies
+
+    for claim_id in claim_ids:
+        claim = wait_for_moderation(client, claim_id, timeout=FAKE_DELAY + 10)
+        assert claim['moderation_status'] == 'completed'
+        assert claim['ai_moderation_score'] is not None
@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import select, update
+
+from app.models.claim import Claim
+from app.models.evidence import Evidence
+from app.models.user import User
+from app.models.vote import Vote
+from app import db
+
+
+@pytest.fixture
+def claim_id(app):
+    db.session.add_all(User(username=f'user{i}', email=f'user{i}@example.com') for i in range(2))
+    db.session.flush()
+    claim = Claim(title='A claim', description='A claim description', user_id=1)
+    db.session.add(claim)
+    db.session.commit()
+    return claim.id
+
+
+def test_claim_writes_tell_missing_from_not_owned(client, auth_headers, claim_id):
+    owner, other = auth_headers(1), auth_headers(2)
+    client.post('/api/votes', json={'claim_id': claim_id, 'vote_type': 'upvote'}, headers=other)
+    client.post('/api/evidence', json={'claim_id': claim_id, 'content': 'A source', 'type': 'supporting'},
+                headers=other)
+
+    assert client.put('/api/claims/9999', json={'title': 'New'}, headers=owner).status_code == 404
+    assert client.put(f'/api/claims/{claim_id}', json={'title': 'New'}, headers=other).status_code == 403
+    assert client.delete('/api/claims/9999', headers=owner).status_code == 404
+    assert client.delete(f'/api/claims/{claim_id}', headers=other).status_code == 403
+    assert db.session.scalar(select(Claim.title).where(Claim.id == claim_id)) == 'A claim'
+
+    response = client.put(f'/api/claims/{claim_id}', json={'title': 'New'}, headers=owner)
+    assert response.status_code == 200
+    assert response.get_json()['claim']['title'] == 'New'
+    # An empty edit still checks ownership
+    assert client.put(f'/api/claims/{claim_id}', json={}, headers=other).status_code == 403
+    assert client.put(f'/api/claims/{claim_id}', json={}, headers=owner).status_code == 200
+
+    assert client.delete(f'/api/claims/{claim_id}', headers=owner).status_code == 200
+    for model in (Claim, Vote, Evidence):
+        assert db.session.scalars(select(model)).all() == [], model.__name__
+    assert client.delete(f'/api/claims/{claim_id}', headers=owner).status_code == 404
+
+
+def test_evidence_delete_tells_missing_from_not_owned(client, auth_headers, claim_id):
+    response = client.post('/api/evidence', json={'claim_id': claim_id, 'content': 'A source', 'type': 'supporting'},
+                           headers=auth_headers(1))
+    evidence_id = response.get_json()['evidence']['id']
+
+    assert client.delete('/api/evidence/9999', headers=auth_headers(1)).status_code == 404
+    assert client.delete(f'/api/evidence/{evidence_id}', headers=auth_headers(2)).status_code == 403
+    assert client.delete(f'/api/evidence/{evidence_id}', headers=auth_headers(1)).status_code == 200
+    assert client.delete(f'/api/evidence/{evidence_id}', headers=auth_headers(1)).status_code == 404
+
+
+def deactivate(user_id):
+    db.session.execute(update(User).where(User.id == user_id).values(is_active=False))
+    db.session.commit()
+
+
+def test_deactivated_user_is_rejected_once_the_cache_entry_goes(app, client, auth_headers, claim_id):
+    headers = auth_headers(2)
+    assert client.get('/api/auth/profile', headers=headers).status_code == 200
+
+    deactivate(2)
+    # Still cached: without an invalidate the change takes up to USER_CACHE_TTL seconds
+    assert client.get('/api/auth/profile', headers=headers).status_code == 200
+
+    app.extensions['user_cache'].invalidate(2)
+    response = client.post('/api/votes', json={'claim_id': claim_id, 'vote_type': 'upvote'}, headers=headers)
+    assert response.status_code == 401
+    assert client.get('/api/auth/profile', headers=headers).status_code == 401
+    assert client.get('/api/auth/profile', headers=auth_headers(9999)).status_code == 401
+
+
+@pytest.mark.parametrize('app_config', [{'USER_CACHE_TTL': 0}])
+def test_deactivated_user_is_rejected_at_once_without_cache(client, auth_headers, claim_id):
+    assert client.get('/api/auth/profile', headers=auth_headers(2)).status_code == 200
+    deactivate(2)
+    assert client.get('/api/auth/profile', headers=auth_headers(2)).status_code == 401
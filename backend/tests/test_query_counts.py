@@ -0,0 +1,84 @@
+from app.models.claim import Claim
+from app.models.comment import Comment
+from app.models.evidence import Evidence
+from app.models.user import User
+from app.models.vote import Vote
+from app.services.claim_service import SORT_COLUMNS
+from app import db
+
+
+def create_users(count, start=0):
+    users = [User(username=f'user{i}', email=f'user{i}@example.com') for i in range(start, start + count)]
+    db.session.add_all(users)
+    db.session.commit()
+    return users
+
+
+def create_claims(author, count):
+    claims = [Claim(title=f'Claim {i}', description=f'Claim {i} description', user_id=author.id, category='science')
+              for i in range(count)]
+    db.session.add_all(claims)
+    db.session.commit()
+    return claims
+
+
+def add_activity(claim, users):
+    """One vote, one piece of evidence and one comment on ``claim`` from each user."""
+    for user in users:
+        db.session.add_all([
+            Vote(claim_id=claim.id, user_id=user.id, vote_type='upvote'),
+            Evidence(claim_id=claim.id, user_id=user.id, content='A source', type='supporting'),
+            Comment(claim_id=claim.id, user_id=user.id, content='A comment'),
+        ])
+    db.session.commit()
+
+
+def count_statements(client, statements, url):
+    with statements() as log:
+        response = client.get(url)
+    assert response.status_code == 200, response.get_json()
+    return len(log), response.get_json()
+
+
+def test_feed_page_query_count_does_not_grow_with_page_size(client, statements):
+    users = create_users(5)
+    claims = create_claims(users[0], 60)
+    for claim in claims[::3]:
+        add_activity(claim, users)
+
+    counts = {}
+    for limit in (1, 10, 50):
+        counts[limit], body = count_statements(client, statements, f'/api/claims?limit={limit}')
+        assert body['count'] == limit
+    assert len(set(counts.values())) == 1, counts
+
+    # Every sort order serializes the page in the same way
+    for sort_by in SORT_COLUMNS:
+        count, _ = count_statements(client, statements, f'/api/claims?limit=50&sort_by={sort_by}')
+        assert count == counts[50], sort_by
+
+
+def test_unpaginated_feed_query_count_does_not_grow_with_claims(client, statements):
+    users = create_users(5)
+    for claim in create_claims(users[0], 10):
+        add_activity(claim, users)
+    before, body = count_statements(client, statements, '/api/claims')
+    assert body['count'] == 10
+
+    for claim in create_claims(users[1], 90):
+        add_activity(claim, users)
+    after, body = count_statements(client, statements, '/api/claims')
+    assert body['count'] == 100
+    assert after == before
+
+
+def test_claim_detail_query_count_does_not_grow_with_related_rows(client, statements):
+    users = create_users(30)
+    quietest, busiest = create_claims(users[0], 2)
+    add_activity(busiest, users)
+
+    quiet_count, body = count_statements(client, statements, f'/api/claims/{quietest.id}')
+    assert body['claim']['id'] == quietest.id
+    busy_count, body = count_statements(client, statements, f'/api/claims/{busiest.id}')
+    assert body['claim']['id'] == busiest.id
+    assert busy_count == quiet_count
@@ -0,0 +1,18 @@
+from app.commands.indexes import explain_get_endpoints
+from app.services.query_advisor import QueryPlanAdvisor
+
+
+def test_get_endpoints_do_not_scan_full_tables(app, seed, auth_headers):
+    seed()
+    advisor = QueryPlanAdvisor(mode='warn', allow_tables=app.config.get('SQL_EXPLAIN_ALLOW_TABLES', ()))
+
+    results = list(explain_get_endpoints(app, advisor, auth_headers()))
+
+    scans = [f"{', '.join(finding['tables'])} in {finding['endpoint']}: {finding['statement']}"
+             for finding in advisor.findings]
+    assert not scans, '\n'.join(scans)
+
+    # The authenticated pass gets past jwt_required, so those queries were planned too
+    assert {endpoint for endpoint, url, status in results if status == 401}
+    assert not [(endpoint, url) for endpoint, url, status in results[1::2] if status == 401]
+    assert not [(endpoint, url, status) for endpoint, url, status in results if status >= 500]
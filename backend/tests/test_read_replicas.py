@@ -0,0 +1,69 @@
+import sqlite3
+
+import pytest
+
+from app.models.claim import Claim
+from app.models.user import User
+from app.services.read_replicas import RECENT_WRITE_COOKIE, RECENT_WRITE_HEADER, read_replicas
+from app import db
+
+
+@pytest.fixture
+def app_config(tmp_path):
+    return {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'primary.db'}",
+        'SQLALCHEMY_REPLICA_URIS': [f"sqlite:///{tmp_path / 'replica.db'}"],
+    }
+
+
+@pytest.fixture
+def claim(app, tmp_path):
+    """A claim on the primary, copied to the replica under another title so reads show their source."""
+    db.session.add_all([User(username='author', email='author@example.com'),
+                        User(username='voter', email='voter@example.com')])
+    db.session.flush()
+    claim = Claim(title='Primary title', description='A claim description', user_id=1)
+    db.session.add(claim)
+    db.session.commit()
+
+    # The backup API, since a plain file copy would miss what is still in the primary's WAL
+    with sqlite3.connect(tmp_path / 'primary.db') as primary, sqlite3.connect(tmp_path / 'replica.db') as replica:
+        primary.backup(replica)
+        replica.execute('UPDATE claims SET title = ?', ('Replica title',))
+
+    # Test requests share the fixture's app context; give each its own session and identity
+    # map, as in production, so rows loaded from one database do not shadow the other's
+    claim_id = claim.id
+    db.session.remove()
+    app.teardown_request(lambda exc: db.session.remove())
+    yield claim_id
+    read_replicas.dispose()
+
+
+def test_reads_use_the_replica_until_the_client_writes(client, app, auth_headers, claim):
+    url = f'/api/claims/{claim}'
+    assert client.get(url).get_json()['claim']['title'] == 'Replica title'
+
+    response = client.post('/api/votes', json={'claim_id': claim, 'vote_type': 'upvote'}, headers=auth_headers(2))
+    assert response.status_code == 200
+    marker = response.headers[RECENT_WRITE_HEADER]
+    assert client.get_cookie(RECENT_WRITE_COOKIE).value == marker
+
+    # The voter's own reads go to the primary and include the vote
+    body = client.get(url).get_json()['claim']
+    assert body['title'] == 'Primary title'
+    assert body['credibility_score'] == 1
+
+    # A client without the marker, or with a forged one, still reads the lagging replica
+    other = app.test_client()
+    assert other.get(url).get_json()['claim']['credibility_score'] == 0
+    forged = other.get(url, headers={RECENT_WRITE_HEADER: marker[:-2] + 'xx'}).get_json()['claim']
+    assert forged['title'] == 'Replica title'
+    assert other.get(url, headers={RECENT_WRITE_HEADER: marker}).get_json()['claim']['title'] == 'Primary title'
+
+
+def test_failed_writes_do_not_mark_the_client(client, auth_headers, claim):
+    response = client.post('/api/votes', json={'claim_id': claim + 1, 'vote_type': 'upvote'}, headers=auth_headers(2))
+    assert response.status_code == 404
+    assert RECENT_WRITE_HEADER not in response.headers
+    assert client.get(f'/api/claims/{claim}').get_json()['claim']['title'] == 'Replica title'
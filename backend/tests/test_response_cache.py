@@ -0,0 +1,109 @@
+import time
+
+import pytest
+
+from app.models.claim import Claim
+from app.models.user import User
+from app.services.response_cache import RedisCacheBackend, response_cache
+from app import db
+
+
+class FakeRedis:
+    """The part of the redis-py client RedisCacheBackend uses, kept in a dict."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (value.encode() if isinstance(value, str) else value,
+                          time.monotonic() + ex if ex else None)
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def incr(self, key):
+        value = int(self.get(key) or 0) + 1
+        self.data[key] = (str(value).encode(), self.data.get(key, (None, None))[1])
+        return value
+
+    def expire(self, key, seconds):
+        if key in self.data:
+            self.data[key] = (self.data[key][0], time.monotonic() + seconds)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+@pytest.fixture
+def redis_cache(app):
+    backend = RedisCacheBackend(FakeRedis())
+    response_cache.init_app(app, backend=backend)
+    return backend
+
+
+@pytest.fixture
+def claim(app):
+    db.session.add_all([User(username='author', email='author@example.com'),
+                        User(username='voter', email='voter@example.com')])
+    db.session.flush()
+    claim = Claim(title='A claim', description='A claim description', user_id=1)
+    db.session.add(claim)
+    db.session.commit()
+    return claim.id
+
+
+def test_vote_invalidates_cached_claim_and_feed(client, auth_headers, redis_cache, claim):
+    urls = (f'/api/claims/{claim}', '/api/claims')
+    for url in urls:
+        assert client.get(url).headers['X-Cache'] == 'MISS'
+    for url in urls:
+        assert client.get(url).headers['X-Cache'] == 'HIT'
+    assert any(key.startswith('factcheck:response:') for key in redis_cache.client.data)
+
+    response = client.post('/api/votes', json={'claim_id': claim, 'vote_type': 'upvote'}, headers=auth_headers(2))
+    assert response.status_code == 200
+
+    detail = client.get(urls[0])
+    assert detail.headers['X-Cache'] == 'MISS'
+    assert detail.get_json()['claim']['credibility_score'] == 1
+    feed = client.get(urls[1])
+    assert feed.headers['X-Cache'] == 'MISS'
+    assert feed.get_json()['claims'][0]['credibility_score'] == 1
+
+
+def test_if_none_match_revalidates_until_the_claim_changes(client, auth_headers, redis_cache, claim):
+    url = f'/api/claims/{claim}'
+    etag = client.get(url).headers['ETag']
+
+    cached = client.get(url, headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.headers['X-Cache'] == 'HIT'
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    client.post('/api/votes', json={'claim_id': claim, 'vote_type': 'downvote'}, headers=auth_headers(2))
+    changed = client.get(url, headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert changed.get_json()['claim']['credibility_score'] == -1
@@ -0,0 +1,70 @@
+import pytest
+
+from app.models.user import User
+from app import db
+
+
+@pytest.fixture
+def post(app, client, auth_headers):
+    db.session.add(User(username='author', email='author@example.com'))
+    db.session.commit()
+
+    def post(url, json, method='post'):
+        response = getattr(client, method)(url, json=json, headers=auth_headers())
+        assert response.status_code in (200, 201), response.get_json()
+        return response.get_json()
+    return post
+
+
+def search(client, query, **params):
+    response = client.get('/api/claims/search', query_string=dict(params, q=query))
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def found(client, query):
+    return [claim['id'] for claim in search(client, query)['claims']]
+
+
+def test_results_rank_title_matches_first_and_highlight_escaped_text(client, post):
+    in_description = post('/api/claims', {'title': 'Tap water', 'description': 'Fluoride <b>harms</b> teeth'})['claim']
+    in_title = post('/api/claims', {'title': 'Fluoride in water', 'description': 'It is added to tap water'})['claim']
+    post('/api/claims', {'title': 'Unrelated', 'description': 'Nothing to see here'})
+
+    body = search(client, 'fluor')
+    assert [claim['id'] for claim in body['claims']] == [in_title['id'], in_description['id']]
+    assert body['claims'][0]['search']['title'] == '<mark>Fluoride</mark> in water'
+    assert body['claims'][1]['search']['snippet'] == '<mark>Fluoride</mark> &lt;b&gt;harms&lt;/b&gt; teeth'
+
+    assert client.get('/api/claims/search?q=').status_code == 400
+    assert client.get('/api/claims/search?q=water&cursor=nonsense').status_code == 400
+
+
+def test_cursor_pages_through_every_match_once(client, post):
+    ids = {post('/api/claims', {'title': f'Vaccine claim {i}', 'description': 'About vaccines'})['claim']['id']
+           for i in range(5)}
+
+    seen, cursor = [], None
+    while True:
+        body = search(client, 'vaccine', limit=2, **({'cursor': cursor} if cursor else {}))
+        seen += [claim['id'] for claim in body['claims']]
+        cursor = body['next_cursor']
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(ids)
+
+
+def test_edits_and_evidence_are_reindexed(client, post):
+    claim_id = post('/api/claims', {'title': 'The moon landing', 'description': 'It was staged'})['claim']['id']
+    assert found(client, 'telescope') == []
+
+    evidence = post('/api/evidence', {'claim_id': claim_id, 'content': 'Telescope photos of the site',
+                                      'type': 'refuting'})['evidence']
+    assert found(client, 'telescope') == [claim_id]
+
+    post(f"/api/evidence/{evidence['id']}", None, method='delete')
+    assert found(client, 'telescope') == []
+
+    post(f'/api/claims/{claim_id}', {'title': 'The Apollo landing'}, method='put')
+    assert found(client, 'apollo') == [claim_id]
+    assert found(client, 'moon') == []
@@ -0,0 +1,73 @@
+from sqlalchemy import func, select
+
+from app.models.claim import Claim
+from app.models.user import User
+from app.models.vote import Vote
+from app import db
+
+
+def create_claims(count):
+    db.session.add_all(Claim(title=f'Claim {i}', description='A claim description', user_id=1) for i in range(count))
+    db.session.commit()
+    return db.session.scalars(select(Claim.id).order_by(Claim.id.desc()).limit(count)).all()[::-1]
+
+
+def cast_batch(client, headers, items):
+    response = client.post('/api/votes/batch', json={'votes': items}, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_batch_reports_each_item_and_keeps_counters_exact(app, client, auth_headers):
+    db.session.add_all(User(username=f'voter{i}', email=f'voter{i}@example.com') for i in range(2))
+    db.session.commit()
+    first, second, third = create_claims(3)
+    # Earlier votes by the batch's user, so the batch mixes inserts, switches and no-ops
+    cast_batch(client, auth_headers(1), [{'claim_id': first, 'vote_type': 'downvote'},
+                                         {'claim_id': second, 'vote_type': 'upvote'}])
+    cast_batch(client, auth_headers(2), [{'claim_id': second, 'vote_type': 'upvote'}])
+
+    body = cast_batch(client, auth_headers(1), [
+        {'claim_id': first, 'vote_type': 'downvote'},
+        {'claim_id': first, 'vote_type': 'upvote'},
+        {'claim_id': second, 'vote_type': 'upvote'},
+        {'claim_id': third, 'vote_type': 'downvote'},
+        {'claim_id': 9999, 'vote_type': 'upvote'},
+        {'claim_id': str(third), 'vote_type': 'upvote'},
+        {'claim_id': third, 'vote_type': 'sideways'},
+        'not an item',
+    ])
+
+    assert [result['status'] for result in body['results']] == [200, 200, 200, 200, 404, 400, 400, 400]
+    assert [result['index'] for result in body['results']] == list(range(8))
+    assert body['processed'] == 4 and body['failed'] == 4
+
+    # The last item for the first claim wins
+    votes = dict(db.session.execute(select(Vote.claim_id, Vote.vote_type).where(Vote.user_id == 1)).all())
+    assert votes == {first: 'upvote', second: 'upvote', third: 'downvote'}
+
+    db.session.expire_all()
+    for claim in db.session.scalars(select(Claim)):
+        upvotes, downvotes = (
+            db.session.scalar(select(func.count()).where(Vote.claim_id == claim.id, Vote.vote_type == vote_type))
+            for vote_type in ('upvote', 'downvote')
+        )
+        assert (claim.upvote_count, claim.downvote_count) == (upvotes, downvotes), claim.id
+        assert claim.credibility_score == upvotes - downvotes
+
+
+def test_batch_statement_count_does_not_grow_with_batch_size(app, client, auth_headers, statements):
+    db.session.add(User(username='voter', email='voter@example.com'))
+    db.session.commit()
+    headers = auth_headers(1)
+    # The first request also loads the user into the user cache
+    cast_batch(client, headers, [{'claim_id': create_claims(1)[0], 'vote_type': 'upvote'}])
+
+    counts = {}
+    for size in (1, 10, 100):
+        claim_ids = create_claims(size)
+        with statements() as log:
+            body = cast_batch(client, headers, [{'claim_id': claim_id, 'vote_type': 'upvote'} for claim_id in claim_ids])
+        assert body['processed'] == size
+        counts[size] = len(log)
+    assert len(set(counts.values())) == 1, counts
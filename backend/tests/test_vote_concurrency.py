@@ -0,0 +1,67 @@
+import random
+import threading
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.claim import Claim
+from app.models.user import User
+from app.models.vote import Vote
+from app.services.vote_service import VOTE_TYPES
+from app import db
+
+USERS = 4
+CLAIMS = 3
+THREADS_PER_USER = 3
+VOTES_PER_THREAD = 15
+
+
+@pytest.fixture
+def app_config(tmp_path):
+    # A file database, so every thread has its own connection and SQLite's write lock is contended
+    return {'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'votes.db'}"}
+
+
+def test_concurrent_first_votes_and_switches_keep_counters_exact(app, auth_headers):
+    db.session.add_all(User(username=f'voter{i}', email=f'voter{i}@example.com') for i in range(USERS))
+    db.session.flush()
+    db.session.add_all(Claim(title=f'Claim {i}', description='A claim description', user_id=1) for i in range(CLAIMS))
+    db.session.commit()
+    claim_ids = db.session.scalars(select(Claim.id)).all()
+    headers = {user_id: auth_headers(user_id) for user_id in range(1, USERS + 1)}
+
+    statuses = []
+    start = threading.Barrier(USERS * THREADS_PER_USER)
+
+    def vote(user_id, seed):
+        # Several threads per user, so first votes on the same claim race and switches interleave
+        rng = random.Random(seed)
+        client = app.test_client()
+        start.wait()
+        for _ in range(VOTES_PER_THREAD):
+            if rng.random() < 0.3:
+                items = [{'claim_id': claim_id, 'vote_type': rng.choice(VOTE_TYPES)} for claim_id in claim_ids]
+                response = client.post('/api/votes/batch', json={'votes': items}, headers=headers[user_id])
+            else:
+                response = client.post('/api/votes', headers=headers[user_id],
+                                       json={'claim_id': rng.choice(claim_ids), 'vote_type': rng.choice(VOTE_TYPES)})
+            statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=vote, args=(user_id, user_id * 100 + n))
+               for user_id in range(1, USERS + 1) for n in range(THREADS_PER_USER)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # An IntegrityError from the unique constraint would surface as a 404 or a 500
+    assert statuses.count(200) == len(statuses) == USERS * THREADS_PER_USER * VOTES_PER_THREAD
+
+    db.session.expire_all()
+    tallies = {(claim_id, vote_type): count for claim_id, vote_type, count in db.session.execute(
+        select(Vote.claim_id, Vote.vote_type, func.count()).group_by(Vote.claim_id, Vote.vote_type)
+    )}
+    for claim in db.session.scalars(select(Claim)):
+        assert claim.upvote_count == tallies.get((claim.id, 'upvote'), 0)
+        assert claim.downvote_count == tallies.get((claim.id, 'downvote'), 0)
+        assert claim.credibility_score == claim.upvote_count - claim.downvote_count
@@ -0,0 +1,12 @@
+"""Production entry point.
+
+    FLASK_ENV=production gunicorn -c gunicorn.conf.py wsgi:app
+
+Runs the production profile unless FLASK_ENV selects another one. See
+gunicorn.conf.py for the worker model and its settings.
+"""
+import os
+
+from app import create_app
+
+app = create_app(os.environ.get('FLASK_ENV', 'production'))